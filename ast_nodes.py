@@ -0,0 +1,347 @@
+"""
+Archivo: ast_nodes.py
+
+Nodos tipados del árbol de sintaxis abstracta (AST).
+
+Cada clase de nodo declara __slots__, por lo que sus instancias no tienen
+__dict__. Las sentencias y las operaciones binarias guardan su extensión en el
+código fuente: (line, col) es la posición de su primer token y (end_line,
+end_col) la posición justo después del último, con los paréntesis que rodean a
+un operando incluidos en la extensión de la operación que lo usa. Las hojas
+(Literal y Name) no guardan posición, así que son valores inmutables y el
+parser comparte un único nodo entre todas las apariciones de un mismo literal o
+variable; la posición de una hoja es la de la operación o sentencia que la
+contiene. El AST es por tanto un grafo acíclico en las hojas, y ninguna fase
+debe modificar un nodo ni suponer que id() de una hoja identifica una sola
+aparición.
+
+Los nodos no ocupan menos memoria que la forma de tuplas: una BinaryOp con su
+extensión ocupa 88 bytes frente a los 64 de la tupla (op, izq, der), y las
+hojas añaden su propio objeto (ver benchmarks/bench_ast.py). Lo que se gana es
+el despacho por clase y las posiciones.
+
+Las fases posteriores despachan con tablas indexadas por la clase del nodo
+(type(node) → función), en lugar de comparar etiquetas de texto.
+
+`to_tuple` convierte un nodo a la forma de tuplas que producía el parser
+original, por ejemplo ('DECLARATION', 'int', 'a', 2). `to_data` y `from_data`
+convierten un AST a datos simples (listas, diccionarios, cadenas y números,
+serializables con json) y de vuelta, sin perder las posiciones ni las hojas
+compartidas.
+"""
+
+
+class Node:
+    """Clase base de todos los nodos."""
+    __slots__ = ()
+    fields = ()  # Atributos propios del nodo, en orden
+
+    def __repr__(self):
+        return _bottom_up(self, _repr_node)
+
+    def shown_fields(self):
+        """Atributos que muestra repr()."""
+        return self.fields
+
+
+class Located(Node):
+    """Clase base de los nodos con extensión en el código fuente (line, col, end_line, end_col)."""
+    __slots__ = ('line', 'col', 'end_line', 'end_col')
+
+
+class Statement(Located):
+    """Clase base de las sentencias."""
+    __slots__ = ()
+
+
+# ========================
+# Sentencias
+# ========================
+
+class Declaration(Statement):
+    """Declaración de variable: int a; o int a = expr;"""
+    __slots__ = ('var_type', 'name', 'value')
+    fields = __slots__
+
+    def __init__(self, var_type, name, value=None, line=None, col=None, end_line=None, end_col=None):
+        self.var_type = var_type
+        self.name = name
+        self.value = value  # Expresión inicial (None si no se inicializa)
+        self.line = line
+        self.col = col
+        self.end_line = end_line
+        self.end_col = end_col
+
+    def shown_fields(self):
+        return self.fields if self.value is not None else ('var_type', 'name')
+
+
+class Assignment(Statement):
+    """Asignación simple: a = expr;"""
+    __slots__ = ('name', 'value')
+    fields = __slots__
+
+    def __init__(self, name, value, line=None, col=None, end_line=None, end_col=None):
+        self.name = name
+        self.value = value
+        self.line = line
+        self.col = col
+        self.end_line = end_line
+        self.end_col = end_col
+
+
+class If(Statement):
+    """Condicional: if (cond) { cuerpo }"""
+    __slots__ = ('condition', 'body')
+    fields = __slots__
+
+    def __init__(self, condition, body, line=None, col=None, end_line=None, end_col=None):
+        self.condition = condition
+        self.body = body  # Lista de sentencias
+        self.line = line
+        self.col = col
+        self.end_line = end_line
+        self.end_col = end_col
+
+
+class FunctionDeclaration(Statement):
+    """Declaración de función con parámetros [(tipo, nombre)] y tipo de retorno."""
+    __slots__ = ('name', 'params', 'return_type', 'body')
+    fields = __slots__
+
+    def __init__(self, name, params, return_type, body, line=None, col=None, end_line=None, end_col=None):
+        self.name = name
+        self.params = params
+        self.return_type = return_type
+        self.body = body
+        self.line = line
+        self.col = col
+        self.end_line = end_line
+        self.end_col = end_col
+
+
+class FunctionCall(Statement):
+    """Llamada a función usada como sentencia."""
+    __slots__ = ('name', 'args')
+    fields = __slots__
+
+    def __init__(self, name, args, line=None, col=None, end_line=None, end_col=None):
+        self.name = name
+        self.args = args
+        self.line = line
+        self.col = col
+        self.end_line = end_line
+        self.end_col = end_col
+
+
+# ========================
+# Expresiones
+# ========================
+
+class BinaryOp(Located):
+    """Operación binaria aritmética o de comparación."""
+    __slots__ = ('op', 'left', 'right')
+    fields = __slots__
+
+    def __init__(self, op, left, right, line=None, col=None, end_line=None, end_col=None):
+        self.op = op
+        self.left = left
+        self.right = right
+        self.line = line
+        self.col = col
+        self.end_line = end_line
+        self.end_col = end_col
+
+
+class Literal(Node):
+    """
+    Literal con su tipo ya resuelto por el parser ('int', 'float', 'string', 'char' o 'bool').
+    Las cadenas y caracteres conservan sus comillas, como en los tokens.
+    """
+    __slots__ = ('value', 'type')
+    fields = ('value',)
+
+    def __init__(self, value, type):
+        self.value = value
+        self.type = type
+
+
+class Name(Node):
+    """Uso de una variable dentro de una expresión."""
+    __slots__ = ('id',)
+    fields = __slots__
+
+    def __init__(self, id):
+        self.id = id
+
+
+# ========================
+# Recorridos y conversión
+# ========================
+
+def children(node):
+    """Retorna los nodos hijos directos de un nodo."""
+    kind = type(node)
+    if kind is BinaryOp:
+        return (node.left, node.right)
+    if kind is Declaration:
+        return () if node.value is None else (node.value,)
+    if kind is Assignment:
+        return (node.value,)
+    if kind is If:
+        return (node.condition, *node.body)
+    if kind is FunctionDeclaration:
+        return tuple(node.body)
+    if kind is FunctionCall:
+        return tuple(node.args)
+    return ()
+
+
+def walk(nodes):
+    """
+    Recorre en preorden todos los nodos alcanzables desde `nodes` (un nodo o una
+    lista de nodos) usando una pila explícita.
+    """
+    stack = list(reversed(nodes)) if isinstance(nodes, list) else [nodes]
+    while stack:
+        node = stack.pop()
+        yield node
+        stack.extend(reversed(children(node)))
+
+
+def _bottom_up(root, convert):
+    """
+    Convierte un nodo de abajo arriba usando una pila explícita: convert(node, done)
+    se llama después de convertir sus hijos y recibe en `done` el resultado de
+    cada uno (id del hijo → resultado). Las hojas compartidas se convierten una vez.
+    Todas las funciones de este módulo que convierten un AST completo recorren
+    así o con walk(), de modo que la profundidad solo está limitada por la memoria.
+    """
+    done = {}
+    stack = [(root, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if id(node) in done:
+            continue
+        if expanded:
+            done[id(node)] = convert(node, done)
+            for child in children(node):
+                if type(child) not in (Literal, Name):
+                    del done[id(child)]  # Solo las hojas se comparten: el resto ya no se necesita
+        else:
+            stack.append((node, True))
+            stack.extend((child, False) for child in children(node))
+    return done[id(root)]
+
+
+def _repr_node(node, done):
+    def show(value):
+        if isinstance(value, Node):
+            return done[id(value)]
+        if isinstance(value, list):
+            return '[' + ', '.join(map(show, value)) + ']'
+        return repr(value)
+    args = ', '.join(show(getattr(node, field)) for field in node.shown_fields())
+    return f"{type(node).__name__}({args})"
+
+
+def to_tuple(node):
+    """Convierte un nodo (o una lista de nodos) a la forma de tuplas del parser original."""
+    if isinstance(node, list):
+        return [to_tuple(n) for n in node]
+    return _bottom_up(node, lambda n, done: _TUPLE_CONVERTERS[type(n)](n, lambda child: done[id(child)]))
+
+
+# Conversores de cada clase: (nodo, t) → tupla, donde t(hijo) es la tupla del hijo
+_TUPLE_CONVERTERS = {
+    Declaration: lambda n, t: ('DECLARATION', n.var_type, n.name)
+    if n.value is None else ('DECLARATION', n.var_type, n.name, t(n.value)),
+    Assignment: lambda n, t: ('ASSIGNMENT', n.name, t(n.value)),
+    If: lambda n, t: ('IF', t(n.condition), [t(s) for s in n.body]),
+    FunctionDeclaration: lambda n, t: ('FUNCTION_DECLARATION', n.name, n.params, n.return_type,
+                                       [t(s) for s in n.body]),
+    FunctionCall: lambda n, t: ('FUNCTION_CALL', n.name, [t(a) for a in n.args]),
+    BinaryOp: lambda n, t: (n.op, t(n.left), t(n.right)),
+    Literal: lambda n, t: n.value,
+    Name: lambda n, t: n.id,
+}
+
+
+def _all_slots(cls):
+    """Atributos de una clase de nodo, incluidos los heredados, en orden."""
+    return tuple(slot for klass in reversed(cls.__mro__) for slot in getattr(klass, '__slots__', ()))
+
+
+# Clases que from_data puede reconstruir: nombre → (clase, atributos)
+_NODE_CLASSES = {cls.__name__: (cls, _all_slots(cls))
+                 for cls in (Declaration, Assignment, If, FunctionDeclaration, FunctionCall,
+                             BinaryOp, Literal, Name)}
+
+
+def to_data(value):
+    """
+    Convierte un nodo, una lista de nodos o un valor de un atributo a datos simples:
+    {"nodes": [...], "root": valor}. Cada nodo es una fila [clase, atributos...]
+    de la tabla "nodes", que va de las hojas a la raíz, y las referencias a otro
+    nodo son {"ref": fila}; las tuplas (por ejemplo, los parámetros de una
+    función) son {"tuple": [...]}. Así la profundidad de los datos no depende de
+    la del AST, y cada hoja compartida se guarda una vez.
+    """
+    # En preorden invertido, cada nodo aparece después de todos sus descendientes
+    order = list(walk(value)) if isinstance(value, (Node, list)) else []
+    rows = {}  # id del nodo → fila
+    table = []
+
+    def encode(item):
+        if isinstance(item, Node):
+            return {"ref": rows[id(item)]}
+        if isinstance(item, list):
+            return [encode(element) for element in item]
+        if isinstance(item, tuple):
+            return {"tuple": [encode(element) for element in item]}
+        return item
+
+    for node in reversed(order):
+        if id(node) not in rows:
+            name = type(node).__name__
+            table.append([name] + [encode(getattr(node, slot, None)) for slot in _NODE_CLASSES[name][1]])
+            rows[id(node)] = len(table) - 1
+    return {"nodes": table, "root": encode(value)}
+
+
+def from_data(data):
+    """
+    Reconstruye lo que produjo to_data. Solo crea nodos de las clases de este
+    módulo, y cada fila solo puede referirse a filas anteriores; cualquier otra
+    estructura lanza ValueError.
+    """
+    if not isinstance(data, dict) or not isinstance(data.get("nodes"), list):
+        raise ValueError(f"AST no válido: {data!r}")
+    nodes = []
+
+    def decode(item):
+        if isinstance(item, list):
+            return [decode(element) for element in item]
+        if isinstance(item, dict):
+            if "tuple" in item and isinstance(item["tuple"], list):
+                return tuple(decode(element) for element in item["tuple"])
+            row = item.get("ref")
+            if type(row) is not int or not 0 <= row < len(nodes):
+                raise ValueError(f"Referencia no válida en el AST: {item!r}")
+            return nodes[row]
+        if item is None or isinstance(item, (str, int, float)):
+            return item
+        raise ValueError(f"Valor no válido en el AST: {item!r}")
+
+    for row in data["nodes"]:
+        try:
+            cls, slots = _NODE_CLASSES[row[0]]
+        except (KeyError, TypeError, IndexError):
+            raise ValueError(f"Nodo del AST no válido: {row!r}") from None
+        if len(row) != len(slots) + 1:
+            raise ValueError(f"Atributos no válidos para {row[0]}: {row[1:]!r}")
+        node = cls.__new__(cls)
+        for slot, item in zip(slots, row[1:]):
+            setattr(node, slot, decode(item))
+        nodes.append(node)
+    return decode(data.get("root"))
@@ -0,0 +1,7 @@
+"""
+Paquete de benchmarks del compilador.
+
+Cada módulo se ejecuta desde la raíz del repositorio, por ejemplo:
+
+    python -m benchmarks.bench_lexer
+"""
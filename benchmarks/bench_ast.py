@@ -0,0 +1,125 @@
+"""
+Benchmark del AST tipado: compara los nodos con __slots__ de ast_nodes con la
+forma de tuplas del parser original (obtenida con `to_tuple`).
+
+Mide, para cada forma:
+- la memoria retenida por el árbol (tracemalloc) y los bytes por nodo;
+- el tiempo de un recorrido completo que calcula el tipo de cada expresión,
+  despachando por clase (nodos) o por etiqueta e isinstance (tuplas).
+
+Los nodos ocupan más memoria que las tuplas (unos 55-58 bytes por nodo frente a
+36-38 con el programa de flat_program): una BinaryOp guarda además su extensión
+(88 bytes frente a los 64 de la tupla) y los literales y variables son objetos
+propios, aunque compartidos. La ventaja de los nodos es el recorrido, no la memoria.
+
+Uso:
+    python -m benchmarks.bench_ast [--sizes 10000 50000]
+"""
+import argparse
+import tracemalloc
+
+from ast_nodes import Declaration, Assignment, If, BinaryOp, Literal, Name, to_tuple, walk
+from lexer import lexer
+from parser import parser
+from benchmarks.common import flat_program, best_time
+
+
+def retained(func, *args):
+    """Retorna (resultado, bytes retenidos por el resultado) de `func(*args)`."""
+    tracemalloc.start()
+    try:
+        result = func(*args)
+        return result, tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+
+# ---- Recorrido sobre nodos tipados: despacho por tabla indexada por clase ----
+
+def _node_type(expr, env):
+    return _NODE_TYPERS[type(expr)](expr, env)
+
+
+_NODE_TYPERS = {
+    Literal: lambda e, env: e.type,
+    Name: lambda e, env: env.get(e.id, "int"),
+    BinaryOp: lambda e, env: "bool" if e.op in ("<", ">", "==", "!=")
+    else max(_node_type(e.left, env), _node_type(e.right, env)),
+}
+
+
+def _node_stmts(stmts, env):
+    for stmt in stmts:
+        kind = type(stmt)
+        if kind is Declaration:
+            env[stmt.name] = stmt.var_type
+            if stmt.value is not None:
+                _node_type(stmt.value, env)
+        elif kind is Assignment:
+            _node_type(stmt.value, env)
+        elif kind is If:
+            _node_type(stmt.condition, env)
+            _node_stmts(stmt.body, env)
+
+
+def traverse_nodes(ast):
+    _node_stmts(ast, {})
+
+
+# ---- Recorrido sobre tuplas: despacho por etiqueta de texto e isinstance ----
+
+def _tuple_type(expr, env):
+    if isinstance(expr, int):
+        return "int"
+    elif isinstance(expr, float):
+        return "float"
+    elif isinstance(expr, str):
+        if expr.startswith('"'):
+            return "string"
+        elif expr.startswith("'"):
+            return "char"
+        return env.get(expr, "int")
+    op, left, right = expr
+    if op in ("<", ">", "==", "!="):
+        return "bool"
+    return max(_tuple_type(left, env), _tuple_type(right, env))
+
+
+def _tuple_stmts(stmts, env):
+    for stmt in stmts:
+        kind = stmt[0]
+        if kind == "DECLARATION":
+            env[stmt[2]] = stmt[1]
+            if len(stmt) == 4:
+                _tuple_type(stmt[3], env)
+        elif kind == "ASSIGNMENT":
+            _tuple_type(stmt[2], env)
+        elif kind == "IF":
+            _tuple_type(stmt[1], env)
+            _tuple_stmts(stmt[2], env)
+
+
+def traverse_tuples(ast):
+    _tuple_stmts(ast, {})
+
+
+def main():
+    args = argparse.ArgumentParser(description="Benchmark del AST tipado frente a tuplas")
+    args.add_argument("--sizes", type=int, nargs="+", default=[10000, 50000],
+                      help="Número de líneas de cada programa generado")
+    opts = args.parse_args()
+
+    print(f"{'líneas':>8} {'nodos':>8} {'forma':>7} {'memoria (KiB)':>14} {'bytes/nodo':>11} {'recorrido (s)':>14}")
+    for size in opts.sizes:
+        tokens = lexer(flat_program(size))
+        nodes, node_bytes = retained(parser, tokens)
+        count = sum(1 for _ in walk(nodes))
+        tuples, tuple_bytes = retained(to_tuple, nodes)
+        for name, ast, nbytes, traverse in (("nodos", nodes, node_bytes, traverse_nodes),
+                                            ("tuplas", tuples, tuple_bytes, traverse_tuples)):
+            elapsed = best_time(traverse, ast)
+            print(f"{size:>8} {count:>8} {name:>7} {nbytes / 1024:>14.0f} {nbytes / count:>11.1f} {elapsed:>14.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Benchmark del formato binario: compara, para programas generados, el tamaño
+y el tiempo de carga del código objeto como texto (una instrucción por línea,
+que hay que volver a ensamblar) y como binario (bincode.load con mmap).
+
+Uso:
+    python -m benchmarks.bench_bincode [--sizes 10000 100000 400000]
+"""
+import argparse
+import os
+import tempfile
+
+import bincode
+from intermediate import IntermediateCodeGenerator
+from lexer import lexer
+from objectcode import ObjectCodeGenerator
+from parser import parser
+from vm import assemble, VirtualMachine
+from benchmarks.common import flat_program, best_time
+
+
+def load_text(path):
+    with open(path, encoding="utf-8") as f:
+        return assemble(f.read().splitlines())
+
+
+def load_binary(path):
+    program = bincode.load(path)
+    program.close()
+
+
+def main():
+    args = argparse.ArgumentParser(description="Benchmark del formato binario del código objeto")
+    args.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 400000],
+                      help="Número de líneas de cada programa generado")
+    opts = args.parse_args()
+
+    print(f"{'líneas':>8} {'instrucciones':>14} {'texto (KiB)':>12} {'binario (KiB)':>14} "
+          f"{'carga texto (s)':>16} {'carga binario (s)':>18}")
+    with tempfile.TemporaryDirectory() as directory:
+        text_path = os.path.join(directory, "programa.txt")
+        binary_path = os.path.join(directory, "programa.bin")
+        for size in opts.sizes:
+            quads = IntermediateCodeGenerator().generate(parser(lexer(flat_program(size))))
+            instructions = ObjectCodeGenerator().generate(quads)
+            with open(text_path, "w", encoding="utf-8") as f:
+                f.write("\n".join(instructions))
+            bincode.dump(assemble(instructions), binary_path)
+
+            # Ambas formas deben ejecutar el mismo programa
+            with bincode.load(binary_path) as program:
+                assert VirtualMachine(program).run() == VirtualMachine(load_text(text_path)).run()
+
+            print(f"{size:>8} {len(instructions):>14} {os.path.getsize(text_path) / 1024:>12.0f} "
+                  f"{os.path.getsize(binary_path) / 1024:>14.0f} {best_time(load_text, text_path):>16.4f} "
+                  f"{best_time(load_binary, binary_path):>18.6f}")
+
+
+if __name__ == "__main__":
+    main()
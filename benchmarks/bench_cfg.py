@@ -0,0 +1,60 @@
+"""
+Benchmark del grafo de flujo de control sobre programas con condicionales
+anidados: mide la construcción de bloques básicos, el cálculo de dominadores
+y la linealización, y estima el orden de crecimiento de cada fase.
+
+Uso:
+    python -m benchmarks.bench_cfg [--sizes 10000 40000 160000] [--depth 8]
+"""
+import argparse
+import gc
+
+from cfg import build_cfg
+from intermediate import IntermediateCodeGenerator
+from lexer import lexer
+from parser import parser
+from benchmarks.common import nested_if_program, best_time, scaling_exponent
+
+
+def dominators(quads):
+    return build_cfg(quads).immediate_dominators()
+
+
+def linearize(quads):
+    return build_cfg(quads).linearize(only_reachable=True)
+
+
+def main():
+    args = argparse.ArgumentParser(description="Benchmark del grafo de flujo de control")
+    args.add_argument("--sizes", type=int, nargs="+", default=[10000, 40000, 160000],
+                      help="Número de líneas de cada programa generado")
+    args.add_argument("--depth", type=int, default=8, help="Niveles de anidamiento de cada grupo de if")
+    opts = args.parse_args()
+
+    phases = (("construcción", build_cfg), ("dominadores", dominators), ("linealización", linearize))
+    times = {name: [] for name, _ in phases}
+    print(f"{'líneas':>8} {'cuádruplas':>11} {'bloques':>8} " + " ".join(f"{name + ' (s)':>18}" for name, _ in phases))
+    for size in opts.sizes:
+        quads = IntermediateCodeGenerator().generate(parser(lexer(nested_if_program(size, opts.depth))))
+        graph = build_cfg(quads)
+        assert graph.linearize() == quads
+        row = []
+        for name, phase in phases:
+            # Como timeit: sin el recolector cíclico, que recorre los enlaces entre
+            # bloques en cada pasada y distorsiona la medida con el tamaño del grafo
+            gc.disable()
+            try:
+                elapsed = best_time(phase, quads)
+            finally:
+                gc.enable()
+            times[name].append(elapsed)
+            row.append(f"{elapsed:>18.4f}")
+        print(f"{size:>8} {len(quads):>11} {len(graph):>8} " + " ".join(row))
+
+    if len(opts.sizes) > 1:
+        for name, _ in phases:
+            print(f"Exponente de crecimiento ({name}): {scaling_exponent(opts.sizes, times[name]):.2f}")
+
+
+if __name__ == "__main__":
+    main()
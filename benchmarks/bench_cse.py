@@ -0,0 +1,48 @@
+"""
+Benchmark de la eliminación de subexpresiones comunes (numeración de valores
+local en IntermediateCodeGenerator) sobre código con muchas expresiones repetidas.
+
+Para cada tamaño compara la generación sin y con cse=True:
+- cuádruplas y temporales generados, y expresiones reutilizadas;
+- tiempo de generación de cuádruplas;
+- cuádruplas e instrucciones objeto tras el pipeline completo de -O.
+
+Uso:
+    python -m benchmarks.bench_cse [--sizes 1000 10000 50000]
+"""
+import argparse
+
+from intermediate import IntermediateCodeGenerator
+from lexer import lexer
+from objectcode import ObjectCodeGenerator
+from optimizer import QuadOptimizer, count_temps
+from parser import parser
+from benchmarks.common import expression_program, best_time
+
+
+def generate(ast, cse):
+    return IntermediateCodeGenerator(cse=cse).generate(ast)
+
+
+def main():
+    args = argparse.ArgumentParser(description="Benchmark de la eliminación de subexpresiones comunes")
+    args.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000],
+                      help="Número de líneas de cada programa generado")
+    opts = args.parse_args()
+
+    print(f"{'líneas':>8} {'cse':>4} {'cuádruplas':>11} {'temporales':>11} {'reutilizadas':>13} "
+          f"{'generación (s)':>15} {'cuádruplas -O':>14} {'instrucciones -O':>17}")
+    for size in opts.sizes:
+        ast = parser(lexer(expression_program(size)))
+        for cse in (False, True):
+            generator = IntermediateCodeGenerator(cse=cse)
+            quads = generator.generate(ast)
+            elapsed = best_time(generate, ast, cse)
+            optimized = QuadOptimizer().optimize(quads)
+            instructions = ObjectCodeGenerator().generate(optimized)
+            print(f"{size:>8} {'sí' if cse else 'no':>4} {len(quads):>11} {count_temps(quads):>11} "
+                  f"{generator.cse_hits:>13} {elapsed:>15.4f} {len(optimized):>14} {len(instructions):>17}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+"""
+Benchmark del analizador léxico: mide el tiempo de `lexer` para programas de
+tamaño creciente y estima el orden de crecimiento (debe ser ≈ 1, lineal).
+
+Uso:
+    python -m benchmarks.bench_lexer [--sizes 1000 10000 100000]
+"""
+import argparse
+
+from lexer import lexer
+from benchmarks.common import flat_program, best_time, scaling_exponent
+
+
+def main():
+    args = argparse.ArgumentParser(description="Benchmark del analizador léxico")
+    args.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000],
+                      help="Número de líneas de cada programa generado")
+    args.add_argument("--repeat", type=int, default=3, help="Repeticiones por tamaño")
+    opts = args.parse_args()
+
+    times = []
+    print(f"{'líneas':>10} {'tokens':>10} {'tiempo (s)':>12} {'µs/línea':>10}")
+    for size in opts.sizes:
+        source = flat_program(size)
+        elapsed = best_time(lexer, source, repeat=opts.repeat)
+        times.append(elapsed)
+        print(f"{size:>10} {len(lexer(source)):>10} {elapsed:>12.4f} {elapsed / size * 1e6:>10.2f}")
+
+    if len(opts.sizes) > 1:
+        print(f"\nExponente de crecimiento estimado: {scaling_exponent(opts.sizes, times):.2f} (1.00 = lineal)")
+
+
+if __name__ == "__main__":
+    main()
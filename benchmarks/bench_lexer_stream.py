@@ -0,0 +1,60 @@
+"""
+Benchmark de memoria del analizador léxico por flujo: compara el pico de memoria
+(tracemalloc) de `lexer` sobre el texto completo con el de `lexer_file`, que lee
+el archivo mapeado en memoria por bloques y consume los tokens uno a uno.
+
+Uso:
+    python -m benchmarks.bench_lexer_stream [--sizes 10000 100000]
+"""
+import argparse
+import os
+import tempfile
+import tracemalloc
+
+from lexer import lexer, lexer_file
+from benchmarks.common import flat_program
+
+
+def peak_memory(func):
+    """Ejecuta `func()` y retorna el pico de memoria asignada en bytes."""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def lex_whole_file(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return len(lexer(f.read()))
+
+
+def lex_streaming(path):
+    count = 0
+    for _ in lexer_file(path):
+        count += 1
+    return count
+
+
+def main():
+    args = argparse.ArgumentParser(description="Benchmark de memoria del analizador léxico por flujo")
+    args.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000],
+                      help="Número de líneas de cada programa generado")
+    opts = args.parse_args()
+
+    print(f"{'líneas':>10} {'archivo (KiB)':>14} {'completo (KiB)':>15} {'flujo (KiB)':>12}")
+    for size in opts.sizes:
+        with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False, encoding="utf-8") as f:
+            f.write(flat_program(size))
+            path = f.name
+        try:
+            whole = peak_memory(lambda: lex_whole_file(path))
+            stream = peak_memory(lambda: lex_streaming(path))
+            print(f"{size:>10} {os.path.getsize(path) / 1024:>14.0f} {whole / 1024:>15.0f} {stream / 1024:>12.0f}")
+        finally:
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
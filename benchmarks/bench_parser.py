@@ -0,0 +1,36 @@
+"""
+Benchmark del analizador sintáctico: mide el tiempo de `parser` (sin incluir el
+análisis léxico) para programas de tamaño creciente y estima el orden de
+crecimiento (debe ser ≈ 1, lineal).
+
+Uso:
+    python -m benchmarks.bench_parser [--sizes 1000 10000 50000]
+"""
+import argparse
+
+from lexer import lexer
+from parser import parser
+from benchmarks.common import flat_program, best_time, scaling_exponent
+
+
+def main():
+    args = argparse.ArgumentParser(description="Benchmark del analizador sintáctico")
+    args.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000],
+                      help="Número de líneas de cada programa generado")
+    args.add_argument("--repeat", type=int, default=3, help="Repeticiones por tamaño")
+    opts = args.parse_args()
+
+    times = []
+    print(f"{'líneas':>10} {'tokens':>10} {'tiempo (s)':>12} {'µs/token':>10}")
+    for size in opts.sizes:
+        tokens = lexer(flat_program(size))
+        elapsed = best_time(parser, tokens, repeat=opts.repeat)
+        times.append(elapsed)
+        print(f"{size:>10} {len(tokens):>10} {elapsed:>12.4f} {elapsed / len(tokens) * 1e6:>10.2f}")
+
+    if len(opts.sizes) > 1:
+        print(f"\nExponente de crecimiento estimado: {scaling_exponent(opts.sizes, times):.2f} (1.00 = lineal)")
+
+
+if __name__ == "__main__":
+    main()
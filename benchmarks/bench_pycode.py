@@ -0,0 +1,44 @@
+"""
+Benchmark del backend de Python: ejecuta programas generados en la máquina
+virtual (instrucción por instrucción) y traducidos a Python con pycodegen
+(compilados una vez con compile()), y compara el coste de preparación
+(ensamblado o traducción + compilación) y el de ejecución.
+
+Uso:
+    python -m benchmarks.bench_pycode [--sizes 10000 100000] [-O]
+"""
+import argparse
+
+from compilador import compilar_programa
+from pycodegen import CompiledProgram
+from vm import VirtualMachine, assemble
+from benchmarks.common import flat_program, nested_if_program, expression_program, best_time
+
+
+def main():
+    args = argparse.ArgumentParser(description="Benchmark de la ejecución en Python frente a la máquina virtual")
+    args.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000],
+                      help="Número de líneas de cada programa generado")
+    args.add_argument("-O", dest="optimize", action="store_true", help="Compilar los programas con -O")
+    opts = args.parse_args()
+
+    generators = (("plano", flat_program), ("if anidados", nested_if_program), ("expresiones", expression_program))
+    print(f"{'programa':>12} {'líneas':>8} {'ensamblado (s)':>15} {'VM (s)':>10} "
+          f"{'traducción (s)':>15} {'Python (s)':>11} {'aceleración':>12}")
+    for size in opts.sizes:
+        for name, generate in generators:
+            resultado = compilar_programa(generate(size), optimizar=opts.optimize, mirilla=opts.optimize)
+            program = assemble(resultado.instrucciones)
+            compiled = CompiledProgram(resultado.cuadruplas)
+            assert compiled.run() == VirtualMachine(program).run()
+
+            assemble_time = best_time(assemble, resultado.instrucciones)
+            vm_time = best_time(lambda: VirtualMachine(program).run())
+            translate_time = best_time(CompiledProgram, resultado.cuadruplas, repeat=1)
+            python_time = best_time(compiled.run)
+            print(f"{name:>12} {size:>8} {assemble_time:>15.4f} {vm_time:>10.4f} {translate_time:>15.4f} "
+                  f"{python_time:>11.4f} {vm_time / python_time:>11.1f}x")
+
+
+if __name__ == "__main__":
+    main()
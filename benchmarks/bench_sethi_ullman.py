@@ -0,0 +1,62 @@
+"""
+Benchmark del orden de evaluación de Sethi-Ullman en IntermediateCodeGenerator.
+
+Compara la evaluación siempre por la izquierda con la que empieza por el
+operando más pesado, midiendo:
+- temporales distintos tras la reutilización de temporales (máximo de valores vivos);
+- instrucciones de código objeto del acumulador;
+- tiempo de generación de cuádruplas.
+
+Se mide sobre los programas de txt_pruebas con expresiones (como
+prueba4_parentesis) y sobre aritmética anidada generada.
+
+Uso:
+    python -m benchmarks.bench_sethi_ullman [--lines 2000] [--depths 4 12 40]
+"""
+import argparse
+import os
+
+from intermediate import IntermediateCodeGenerator
+from lexer import lexer
+from objectcode import ObjectCodeGenerator
+from optimizer import count_temps, reuse_temps
+from parser import parser
+from peephole import PeepholeOptimizer
+from benchmarks.common import deep_arithmetic_program, best_time
+
+PRUEBAS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "txt_pruebas")
+
+
+def generate(ast, sethi_ullman):
+    return IntermediateCodeGenerator(sethi_ullman=sethi_ullman).generate(ast)
+
+
+def measure(name, source):
+    ast = parser(lexer(source))
+    for sethi_ullman in (False, True):
+        quads = reuse_temps(generate(ast, sethi_ullman))
+        instructions = PeepholeOptimizer().optimize(ObjectCodeGenerator(track_accumulator=True).generate(quads))
+        elapsed = best_time(generate, ast, sethi_ullman)
+        print(f"{name:>26} {'sí' if sethi_ullman else 'no':>13} {count_temps(quads):>11} "
+              f"{len(instructions):>14} {elapsed:>15.4f}")
+
+
+def main():
+    args = argparse.ArgumentParser(description="Benchmark del orden de evaluación de Sethi-Ullman")
+    args.add_argument("--lines", type=int, default=2000, help="Declaraciones de cada programa generado")
+    args.add_argument("--depths", type=int, nargs="+", default=[4, 12, 40],
+                      help="Niveles de anidamiento de las expresiones generadas")
+    opts = args.parse_args()
+
+    print(f"{'programa':>26} {'Sethi-Ullman':>13} {'temporales':>11} {'instrucciones':>14} {'generación (s)':>15}")
+    for archivo in sorted(os.listdir(PRUEBAS)):
+        if "error" in archivo:
+            continue
+        with open(os.path.join(PRUEBAS, archivo), encoding="utf-8") as f:
+            measure(os.path.splitext(archivo)[0], f.read())
+    for depth in opts.depths:
+        measure(f"anidada prof. {depth}", deep_arithmetic_program(opts.lines, depth))
+
+
+if __name__ == "__main__":
+    main()
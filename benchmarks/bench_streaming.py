@@ -0,0 +1,69 @@
+"""
+Benchmark del modo por flujo: compara `compilar` con `compilar_flujo` sobre un
+archivo generado, midiendo el tiempo hasta la primera instrucción de código
+objeto, el tiempo total y el pico de memoria (tracemalloc).
+
+Uso:
+    python -m benchmarks.bench_streaming [--sizes 10000 50000]
+"""
+import argparse
+import contextlib
+import os
+import tempfile
+import time
+import tracemalloc
+
+from compilador import compilar, compilar_flujo
+from lexer import lexer_file
+from benchmarks.common import flat_program
+
+
+class Sumidero:
+    """Salida que descarta el texto y registra cuándo se escribió la primera instrucción."""
+
+    def __init__(self):
+        self.inicio = time.perf_counter()
+        self.primera = None
+
+    def write(self, texto):
+        if self.primera is None and "LOAD" in texto:
+            self.primera = time.perf_counter() - self.inicio
+        return len(texto)
+
+    def flush(self):
+        pass
+
+
+def medir(funcion, path):
+    sumidero = Sumidero()
+    tracemalloc.start()
+    try:
+        with contextlib.redirect_stdout(sumidero):
+            funcion(lexer_file(path))
+        pico = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return sumidero.primera, time.perf_counter() - sumidero.inicio, pico
+
+
+def main():
+    args = argparse.ArgumentParser(description="Benchmark del modo de compilación por flujo")
+    args.add_argument("--sizes", type=int, nargs="+", default=[10000, 50000],
+                      help="Número de líneas de cada programa generado")
+    opts = args.parse_args()
+
+    print(f"{'líneas':>8} {'modo':>9} {'1ª instr (s)':>13} {'total (s)':>10} {'pico (MiB)':>11}")
+    for size in opts.sizes:
+        with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False, encoding="utf-8") as f:
+            f.write(flat_program(size))
+            path = f.name
+        try:
+            for nombre, funcion in (("completo", compilar), ("flujo", compilar_flujo)):
+                primera, total, pico = medir(funcion, path)
+                print(f"{size:>8} {nombre:>9} {primera:>13.4f} {total:>10.3f} {pico / 2**20:>11.1f}")
+        finally:
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Suite de escalabilidad: compila programas generados (benchmarks.generator) de
+cada forma a tamaños crecientes, mide cada fase con profiler.PhaseProfiler y
+estima el exponente de crecimiento de cada fase (t ≈ c·n^k).
+
+Los exponentes se comparan con una línea base guardada (baseline.json en este
+paquete): una fase se marca como REGRESIÓN si su exponente supera el de la línea
+base en más de --tolerance, y como superlineal si supera 1 + --tolerance aunque
+la línea base ya lo fuera. El programa termina con código 1 si hay regresiones.
+La línea base incluida se midió con --sizes 1000 10000 100000; con programas
+más pequeños los tiempos de las fases rápidas son ruido y el exponente no es fiable.
+
+Uso:
+    python -m benchmarks.bench_suite [--sizes 1000 10000 100000 1000000] [--shapes flat nested]
+    python -m benchmarks.bench_suite --sizes 1000 10000 100000 --save-baseline
+"""
+import argparse
+import json
+import os
+import sys
+
+from compilador import compilar_programa
+from profiler import PhaseProfiler
+from benchmarks.common import scaling_exponent
+from benchmarks.generator import SHAPES, generate_program
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+
+def measure(source, optimize, repeat, trace_memory):
+    """
+    Compila `source` `repeat` veces y retorna, por fase, el mejor tiempo real y
+    el mayor pico de memoria.
+    """
+    best = {}
+    for _ in range(repeat):
+        profiler = PhaseProfiler(trace_memory=trace_memory)
+        compilar_programa(source, optimizar=optimize, mirilla=optimize, perfil=profiler)
+        for record in profiler.records.values():
+            wall, peak = best.get(record.name, (float("inf"), 0))
+            best[record.name] = (min(wall, record.wall), max(peak, record.peak_memory))
+    return best
+
+
+def run_shape(shape, sizes, opts):
+    """Mide una forma en todos los tamaños; retorna {fase: exponente}."""
+    print(f"\n[{shape}]")
+    print(f"{'líneas':>9} {'fase':<14} {'tiempo (s)':>11} {'µs/línea':>9} {'pico (MiB)':>11}")
+    times = {}
+    for size in sizes:
+        source = generate_program(shape, size, opts.seed)
+        phases = measure(source, opts.optimize, opts.repeat, opts.memory)
+        for name, (wall, peak) in phases.items():
+            times.setdefault(name, []).append(wall)
+            peak_text = f"{peak / 2**20:>11.1f}" if opts.memory else f"{'-':>11}"
+            print(f"{size:>9} {name:<14} {wall:>11.4f} {wall / size * 1e6:>9.2f} {peak_text}")
+    # Los tiempos por debajo de la resolución del reloj no permiten estimar el exponente
+    return {name: round(scaling_exponent(sizes, [max(t, 1e-7) for t in series]), 3)
+            for name, series in times.items()}
+
+
+def compare(results, baseline, tolerance):
+    """
+    Imprime los exponentes frente a la línea base y retorna la lista de
+    regresiones (forma, fase, exponente, exponente de la línea base).
+    """
+    regressions = []
+    print(f"\n{'forma':<8} {'fase':<14} {'exponente':>10} {'línea base':>11}  estado")
+    for shape, phases in results.items():
+        for name, exponent in phases.items():
+            reference = baseline.get(shape, {}).get(name)
+            if reference is not None and exponent > reference + tolerance:
+                status = "REGRESIÓN"
+                regressions.append((shape, name, exponent, reference))
+            elif exponent > 1 + tolerance:
+                status = "superlineal"
+            else:
+                status = "ok"
+            reference_text = f"{reference:>11.2f}" if reference is not None else f"{'-':>11}"
+            print(f"{shape:<8} {name:<14} {exponent:>10.2f} {reference_text}  {status}")
+    return regressions
+
+
+def main():
+    args = argparse.ArgumentParser(description="Suite de escalabilidad con programas generados")
+    args.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000, 1000000],
+                      help="Número de líneas de cada programa generado")
+    args.add_argument("--shapes", nargs="+", choices=SHAPES, default=list(SHAPES),
+                      help="Formas de programa a medir")
+    args.add_argument("--seed", type=int, default=0, help="Semilla del generador")
+    args.add_argument("--repeat", type=int, default=1, help="Repeticiones por tamaño (se toma la mejor)")
+    args.add_argument("-O", dest="optimize", action="store_true", help="Incluir la optimización y la mirilla")
+    args.add_argument("--memory", action="store_true",
+                      help="Medir el pico de memoria de cada fase (tracemalloc, mucho más lento)")
+    args.add_argument("--tolerance", type=float, default=0.15,
+                      help="Margen sobre el exponente de la línea base antes de marcar una regresión")
+    args.add_argument("--baseline", default=BASELINE_PATH, help="Archivo JSON de la línea base")
+    args.add_argument("--save-baseline", action="store_true",
+                      help="Guardar los exponentes medidos como nueva línea base")
+    opts = args.parse_args()
+    if len(opts.sizes) < 2:
+        args.error("se necesitan al menos dos tamaños para estimar el crecimiento")
+
+    results = {shape: run_shape(shape, opts.sizes, opts) for shape in opts.shapes}
+    key = "optimized" if opts.optimize else "default"
+
+    try:
+        with open(opts.baseline, "r", encoding="utf-8") as f:
+            stored = json.load(f)
+    except FileNotFoundError:
+        stored = {}
+    regressions = compare(results, stored.get(key, {}), opts.tolerance)
+
+    if opts.save_baseline:
+        stored.setdefault(key, {}).update(results)
+        with open(opts.baseline, "w", encoding="utf-8") as f:
+            json.dump(stored, f, ensure_ascii=False, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"\nLínea base guardada en {opts.baseline}")
+    elif regressions:
+        print(f"\n{len(regressions)} fase(s) crecen más rápido que en la línea base")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Benchmark de las máquinas destino: compara el número de instrucciones del
+código objeto de acumulador (objectcode.py, con mirilla cuando se optimiza)
+y del de registros (regcode.py) para los programas de txt_pruebas/ y para
+programas generados, con y sin -O.
+
+Uso:
+    python -m benchmarks.bench_targets [--registros 4 8] [--lines 2000]
+"""
+import argparse
+import glob
+import os
+
+from compilador import compilar_programa
+from regcode import RegisterCodeGenerator
+from benchmarks.common import flat_program, nested_if_program, expression_program, deep_arithmetic_program
+
+
+def count(instructions):
+    """Instrucciones que se ejecutan (sin contar las etiquetas)."""
+    return sum(1 for instr in instructions if not instr.startswith('LABEL'))
+
+
+def programs(lines):
+    base = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    for path in sorted(glob.glob(os.path.join(base, "txt_pruebas", "*.txt"))):
+        if "error" in os.path.basename(path):
+            continue
+        with open(path, encoding="utf-8") as f:
+            yield os.path.basename(path), f.read()
+    yield f"plano ({lines})", flat_program(lines)
+    yield f"if anidados ({lines})", nested_if_program(lines)
+    yield f"expresiones ({lines})", expression_program(lines)
+    yield f"aritmética profunda ({lines // 10})", deep_arithmetic_program(lines // 10)
+
+
+def main():
+    args = argparse.ArgumentParser(description="Benchmark de instrucciones: acumulador frente a registros")
+    args.add_argument("--registros", type=int, nargs="+", default=[4, 8],
+                      help="Número de registros de la máquina de registros")
+    args.add_argument("--lines", type=int, default=2000, help="Líneas de los programas generados")
+    opts = args.parse_args()
+
+    columns = "".join(f"{f'reg({n})':>10} {'derr.':>6}" for n in opts.registros)
+    print(f"{'programa':<32} {'-O':>3} {'acumulador':>11}{columns}")
+    for name, code in programs(opts.lines):
+        for optimizar in (False, True):
+            resultado = compilar_programa(code, optimizar=optimizar, mirilla=optimizar)
+            row = f"{name:<32} {'sí' if optimizar else 'no':>3} {count(resultado.instrucciones):>11}"
+            for n in opts.registros:
+                generator = RegisterCodeGenerator(n)
+                instructions = generator.generate(resultado.cuadruplas)
+                row += f"{count(instructions):>10} {len(generator.spilled):>6}"
+            print(row)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Benchmark de memoria del almacén compacto de tokens: compara los bytes por token
+de la lista de tuplas de `lexer` con los del TokenStore de `lexer_compact`
+(medidos con tracemalloc, sin contar el código fuente), además del tiempo de
+análisis léxico y sintáctico con cada representación.
+
+Uso:
+    python -m benchmarks.bench_tokenstore [--sizes 10000 100000]
+"""
+import argparse
+import tracemalloc
+
+from lexer import lexer
+from parser import parser
+from tokenstore import lexer_compact
+from benchmarks.common import flat_program, best_time
+
+
+def allocated(func, source):
+    """Retorna (resultado, bytes retenidos por el resultado) de `func(source)`."""
+    tracemalloc.start()
+    try:
+        result = func(source)
+        return result, tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    args = argparse.ArgumentParser(description="Benchmark del almacén compacto de tokens")
+    args.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000],
+                      help="Número de líneas de cada programa generado")
+    opts = args.parse_args()
+
+    print(f"{'líneas':>8} {'tokens':>9} {'forma':>8} {'bytes/token':>12} {'léxico (s)':>11} {'sintaxis (s)':>13}")
+    for size in opts.sizes:
+        source = flat_program(size)
+        for name, func in (("tuplas", lexer), ("columnas", lexer_compact)):
+            tokens, nbytes = allocated(func, source)
+            lex_time = best_time(func, source)
+            parse_time = best_time(parser, tokens)
+            print(f"{size:>8} {len(tokens):>9} {name:>8} {nbytes / len(tokens):>12.1f} "
+                  f"{lex_time:>11.3f} {parse_time:>13.3f}")
+            del tokens
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Utilidades compartidas por los benchmarks: generación de programas de prueba,
+medición de tiempos y estimación del orden de crecimiento.
+"""
+import math
+import time
+
+
+def flat_program(lines):
+    """
+    Genera un programa válido de `lines` líneas con declaraciones, asignaciones
+    aritméticas y condicionales simples, repartidos de forma regular.
+    """
+    out = []
+    for i in range(lines):
+        kind = i % 4
+        if kind == 0 or i < 2:
+            out.append(f"int v{i} = {i} + 1; // declaración")
+        elif kind == 1:
+            out.append(f"v{i - 1} = v{i - 1} * 2 - (v{i - 5 if i >= 5 else 0} + 3);")
+        elif kind == 2:
+            out.append(f"float f{i} = 3.25;")
+        else:
+            out.append(f"if (v{i - 3} < 10) {{ v{i - 3} = v{i - 3} + 1; }}")
+    return "\n".join(out) + "\n"
+
+
+def nested_if_program(lines, depth=8):
+    """
+    Genera un programa válido de aproximadamente `lines` líneas formado por
+    grupos de condicionales anidados `depth` niveles, cada uno con una asignación.
+    """
+    out = ["int x = 0;", "int y = 1;"]
+    group = 0
+    while len(out) < lines:
+        for level in range(depth):
+            out.append("    " * level + f"if (x < {group + level}) {{")
+            out.append("    " * (level + 1) + f"y = y + {level};")
+        for level in reversed(range(depth)):
+            out.append("    " * level + "}")
+        group += 1
+    return "\n".join(out) + "\n"
+
+
+def expression_program(lines, variables=6):
+    """
+    Genera un programa válido de `lines` líneas con expresiones aritméticas que
+    repiten subexpresiones (x*y + x*y, a + b en varias sentencias...) y
+    reasignaciones periódicas que invalidan los valores ya calculados.
+    """
+    names = [f"v{i}" for i in range(variables)]
+    out = [f"int {name} = {i + 2};" for i, name in enumerate(names)]
+    for i in range(max(lines - variables, 0)):
+        a, b, c = names[i % variables], names[(i + 1) % variables], names[(i + 2) % variables]
+        if i % 5 == 4:
+            out.append(f"{c} = {a} / 4 + {b} / 4 + {i % 7};")
+        else:
+            out.append(f"int r{i} = ({a} * {b} + {b} * {a}) - ({a} + {c}) * ({a} + {c}) + {a} * {b} / 2;")
+    return "\n".join(out) + "\n"
+
+
+def deep_arithmetic_program(lines, depth=12):
+    """
+    Genera `lines` declaraciones con expresiones aritméticas anidadas `depth`
+    niveles hacia la derecha, con literales en los operandos izquierdos:
+    int e0 = 1 + (a * (2 - (b + (3 * ...)))); el peor caso para evaluar
+    siempre primero el operando izquierdo.
+    """
+    ops = ["+", "*", "-", "+"]
+    out = ["int a = 3;", "int b = 5;"]
+    for i in range(lines):
+        expr = "a" if i % 2 else "b"
+        for level in range(depth):
+            left = "a" if level % 3 == 2 else str(level % 9 + 1)
+            expr = f"{left} {ops[level % 4]} ({expr})"
+        out.append(f"int e{i} = {expr};")
+    return "\n".join(out) + "\n"
+
+
+def best_time(func, *args, repeat=3):
+    """Ejecuta `func(*args)` `repeat` veces y retorna el mejor tiempo en segundos."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def scaling_exponent(sizes, times):
+    """
+    Estima el exponente k de t ≈ c·n^k con una regresión lineal en escala log-log.
+    Un valor cercano a 1 indica crecimiento lineal.
+    """
+    xs = [math.log(n) for n in sizes]
+    ys = [math.log(t) for t in times]
+    mx = sum(xs) / len(xs)
+    my = sum(ys) / len(ys)
+    num = sum((x - mx) * (y - my) for x, y in zip(xs, ys))
+    den = sum((x - mx) ** 2 for x in xs)
+    return num / den if den else 0.0
@@ -0,0 +1,181 @@
+"""
+Generador reproducible de programas válidos para los benchmarks.
+
+A diferencia de los generadores de common.py, que repiten un patrón fijo, este
+elige variables, operadores y literales con un random.Random sembrado: la
+misma semilla produce siempre el mismo programa, y semillas distintas dan
+programas distintos con la misma forma.
+
+Formas disponibles (ver SHAPES):
+- flat:   lista larga de declaraciones y asignaciones de nivel superior.
+- nested: grupos de condicionales anidados `depth` niveles.
+- wide:   expresiones aritméticas con `width` operandos sin paréntesis.
+- deep:   expresiones aritméticas anidadas `depth` niveles entre paréntesis.
+- mixed:  bloques de las cuatro formas anteriores elegidos al azar.
+
+Cada forma genera exactamente el número de líneas pedido, y todos los
+programas pasan el análisis semántico: las variables se declaran antes de
+usarse, las operaciones no mezclan int y float y nunca se divide entre cero.
+
+Uso:
+    python -m benchmarks.generator nested 1000 --seed 7 --depth 20 > programa.txt
+"""
+import argparse
+import inspect
+import random
+import sys
+
+ARITHMETIC = ("+", "-", "*", "/")
+COMPARISONS = ("<", ">", "==", "!=")  # El parser no acepta <= ni >=
+
+
+class ProgramGenerator:
+    """Genera programas de una forma y un tamaño dados a partir de una semilla."""
+
+    def __init__(self, seed=0):
+        self.rng = random.Random(seed)
+        self.int_vars = []
+        self.float_vars = []
+
+    # ========================
+    # Piezas
+    # ========================
+
+    def _declare(self, var_type):
+        """Nombre nuevo para una variable de `var_type`, registrada en su lista."""
+        names = self.int_vars if var_type == "int" else self.float_vars
+        name = f"{'i' if var_type == 'int' else 'f'}{len(names)}"
+        names.append(name)
+        return name
+
+    def _operand(self, var_type):
+        """Variable ya declarada o literal de `var_type` (las operaciones no mezclan int y float)."""
+        rng = self.rng
+        pool = self.int_vars if var_type == "int" else self.float_vars
+        if pool and rng.random() < 0.7:
+            return rng.choice(pool)
+        if var_type == "float":
+            return f"{rng.randint(0, 99)}.{rng.randint(1, 99)}"
+        return str(rng.randint(1, 99))
+
+    def _term(self, var_type, left):
+        """` op operando`, con un literal distinto de cero como divisor."""
+        op = self.rng.choice(ARITHMETIC)
+        if op == "/":
+            right = str(self.rng.randint(1, 9)) + (".0" if var_type == "float" else "")
+        else:
+            right = self._operand(var_type)
+        return f"{left} {op} {right}"
+
+    def _wide_expression(self, var_type, width):
+        expr = self._operand(var_type)
+        for _ in range(width - 1):
+            expr = self._term(var_type, expr)
+        return expr
+
+    def _deep_expression(self, var_type, depth):
+        expr = self._operand(var_type)
+        for _ in range(depth):
+            op = self.rng.choice(ARITHMETIC[:3])
+            if self.rng.random() < 0.5:
+                expr = f"{self._operand(var_type)} {op} ({expr})"
+            else:
+                expr = f"({expr}) {op} {self._operand(var_type)}"
+        return expr
+
+    def _condition(self):
+        return f"{self._operand('int')} {self.rng.choice(COMPARISONS)} {self._operand('int')}"
+
+    def _statement(self, expression):
+        """Declaración nueva (al principio, o al azar) o asignación a una variable existente."""
+        var_type = "float" if self.rng.random() < 0.25 else "int"
+        pool = self.int_vars if var_type == "int" else self.float_vars
+        value = expression(var_type)
+        if len(pool) < 4 or self.rng.random() < 0.3:
+            return f"{var_type} {self._declare(var_type)} = {value};"
+        return f"{self.rng.choice(pool)} = {value};"
+
+    def _prologue(self):
+        """Primeras declaraciones, para que las demás sentencias tengan variables que usar."""
+        out = [f"int {self._declare('int')} = {self.rng.randint(1, 99)};" for _ in range(2)]
+        out.append(f"float {self._declare('float')} = {self.rng.randint(0, 99)}.5;")
+        return out
+
+    # ========================
+    # Formas
+    # ========================
+    # Cada forma añade líneas a `out` hasta llegar a `lines`; la última sentencia
+    # puede dejarlo un poco por encima, y generate recorta el exceso.
+
+    def flat(self, out, lines, width=4):
+        while len(out) < lines:
+            out.append(self._statement(lambda t: self._wide_expression(t, self.rng.randint(1, width))))
+
+    def wide(self, out, lines, width=32):
+        while len(out) < lines:
+            out.append(self._statement(lambda t: self._wide_expression(t, width)))
+
+    def deep(self, out, lines, depth=16):
+        while len(out) < lines:
+            out.append(self._statement(lambda t: self._deep_expression(t, depth)))
+
+    def nested(self, out, lines, depth=8):
+        while len(out) < lines:
+            # Cada nivel ocupa tres líneas (if, asignación, cierre); el grupo se recorta al espacio restante
+            levels = min(depth, (lines - len(out)) // 3)
+            if levels == 0:
+                out.append(self._statement(lambda t: self._wide_expression(t, 2)))
+                continue
+            for level in range(levels):
+                indent = "    " * level
+                out.append(f"{indent}if ({self._condition()}) {{")
+                target = self.rng.choice(self.int_vars)
+                out.append(f"{indent}    {target} = {self._wide_expression('int', 3)};")
+            for level in reversed(range(levels)):
+                out.append("    " * level + "}")
+
+    def mixed(self, out, lines, depth=8, width=16):
+        shapes = (lambda end: self.flat(out, end), lambda end: self.wide(out, end, width),
+                  lambda end: self.deep(out, end, depth), lambda end: self.nested(out, end, depth))
+        while len(out) < lines:
+            self.rng.choice(shapes)(min(len(out) + self.rng.randint(10, 200), lines))
+
+    def generate(self, shape, lines, **params):
+        """
+        Código fuente de `lines` líneas con la forma `shape` (ver SHAPES). `params`
+        ajusta la forma (depth, width); los que la forma no usa se ignoran.
+        """
+        if shape not in SHAPES:
+            raise ValueError(f"Forma desconocida: '{shape}' (disponibles: {', '.join(SHAPES)})")
+        build = getattr(self, shape)
+        accepted = inspect.signature(build).parameters
+        self.int_vars = []
+        self.float_vars = []
+        out = self._prologue()
+        build(out, lines, **{k: v for k, v in params.items() if k in accepted})
+        return "\n".join(out[:lines]) + "\n"
+
+
+SHAPES = ("flat", "nested", "wide", "deep", "mixed")
+
+
+def generate_program(shape, lines, seed=0, **params):
+    """Atajo: ProgramGenerator(seed).generate(shape, lines, **params)."""
+    return ProgramGenerator(seed).generate(shape, lines, **params)
+
+
+def main():
+    args = argparse.ArgumentParser(description="Generador de programas válidos para benchmarks")
+    args.add_argument("shape", choices=SHAPES, help="Forma del programa")
+    args.add_argument("lines", type=int, help="Número de líneas")
+    args.add_argument("--seed", type=int, default=0, help="Semilla del generador")
+    args.add_argument("--depth", type=int, default=None, help="Profundidad (nested, deep, mixed)")
+    args.add_argument("--width", type=int, default=None, help="Operandos por expresión (flat, wide, mixed)")
+    opts = args.parse_args()
+
+    params = {k: v for k, v in (("depth", opts.depth), ("width", opts.width)) if v is not None}
+    sys.stdout.write(generate_program(opts.shape, opts.lines, opts.seed, **params))
+
+
+if __name__ == "__main__":
+    main()
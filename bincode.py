@@ -0,0 +1,183 @@
+"""
+Archivo: bincode.py
+
+Formato binario del código objeto ensamblado (vm.Program).
+
+Estructura del archivo (enteros en little-endian):
+
+    cabecera        MAGIC, versión del formato (u16), reservado (u16) y seis u32:
+                    instrucciones, símbolos, constantes, y desplazamientos de
+                    la tabla de operandos, de símbolos y de constantes
+    códigos         un u8 por instrucción (vm.OPCODES)
+    relleno         hasta múltiplo de 4
+    operandos       un u32 por instrucción: slot de memoria o índice de la instrucción destino
+    símbolos        nombres de las variables en UTF-8, separados por '\\n'
+    constantes      por constante: tipo (b'i', b'f' o b's'), longitud (u32) y texto UTF-8
+
+`load` mapea el archivo en memoria (mmap) y expone los códigos y operandos
+como vistas (memoryview) sobre el propio mapa, sin copiarlos; solo se decodifican
+las tablas de símbolos y constantes. En una máquina big-endian los operandos
+se copian y se invierten los bytes.
+"""
+import mmap
+import struct
+import sys
+from array import array
+
+from vm import Program
+
+MAGIC = b"CC3\x00"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sHH6I")
+
+# Tipo de array de 4 bytes sin signo para los operandos
+_U32 = 'I' if array('I').itemsize == 4 else 'L'
+_NATIVE_LITTLE = sys.byteorder == 'little'
+
+_CONSTANT_TAGS = {int: b'i', float: b'f', str: b's'}
+_CONSTANT_TYPES = {b'i': int, b'f': float, b's': str}
+
+
+class BinaryFormatError(Exception):
+    """El archivo no es un programa binario válido de este compilador."""
+
+
+def _padding(size):
+    return -size % 4
+
+
+def dumps(program):
+    """Serializa un vm.Program y retorna los bytes del archivo."""
+    count = len(program.opcodes)
+    opcodes = bytes(program.opcodes)
+    operands = array(_U32, program.operands)
+    if not _NATIVE_LITTLE:
+        operands.byteswap()
+    symbols = "\n".join(program.symbols).encode("utf-8")
+    constants = bytearray()
+    for value in program.constants:
+        tag = _CONSTANT_TAGS.get(type(value))
+        if tag is None:
+            raise BinaryFormatError(f"Constante no soportada en el formato binario: {value!r}")
+        text = repr(value).encode("utf-8") if tag == b'f' else str(value).encode("utf-8")
+        constants += tag + struct.pack("<I", len(text)) + text
+
+    operands_offset = HEADER.size + count + _padding(HEADER.size + count)
+    symbols_offset = operands_offset + 4 * count
+    constants_offset = symbols_offset + len(symbols)
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, 0, count, len(program.symbols), len(program.constants),
+                         operands_offset, symbols_offset, constants_offset)
+    return b"".join((header, opcodes, bytes(_padding(HEADER.size + count)), operands.tobytes(),
+                     symbols, bytes(constants)))
+
+
+def dump(program, path):
+    """Escribe un vm.Program en `path`; retorna el número de bytes escritos."""
+    data = dumps(program)
+    with open(path, "wb") as f:
+        f.write(data)
+    return len(data)
+
+
+def is_binary(path):
+    """Verifica si `path` empieza con la firma de un programa binario."""
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+class MappedProgram(Program):
+    """
+    vm.Program cuyos códigos y operandos son vistas sobre un archivo mapeado
+    en memoria. Hay que cerrarlo (o usarlo con `with`) para liberar el mapa.
+    """
+
+    def __init__(self, mapping, view, opcodes, operands, symbols, constants):
+        super().__init__(opcodes, operands, symbols, constants)
+        self._mapping = mapping
+        self._view = view
+
+    def close(self):
+        """Libera las vistas y el mapa del archivo."""
+        if self._mapping is None:
+            return
+        for view in (self.opcodes, self.operands, self._view):
+            if isinstance(view, memoryview):
+                view.release()
+        self._mapping.close()
+        self._mapping = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _parse(buffer):
+    """
+    Decodifica la cabecera y las tablas de `buffer` (bytes, mmap o memoryview).
+    Retorna (vista, códigos, operandos, símbolos, constantes); códigos y operandos son
+    vistas sobre `buffer` cuando el orden de bytes lo permite.
+    """
+    if len(buffer) < HEADER.size:
+        raise BinaryFormatError("Archivo binario truncado: falta la cabecera.")
+    magic, version, _, count, n_symbols, n_constants, operands_offset, symbols_offset, constants_offset = \
+        HEADER.unpack_from(buffer)
+    if magic != MAGIC:
+        raise BinaryFormatError("El archivo no es un programa binario del compilador.")
+    if version != FORMAT_VERSION:
+        raise BinaryFormatError(f"Versión del formato binario no soportada: {version}.")
+    if constants_offset > len(buffer) or symbols_offset != operands_offset + 4 * count:
+        raise BinaryFormatError("Archivo binario truncado o corrupto.")
+
+    view = memoryview(buffer)
+    opcodes = view[HEADER.size:HEADER.size + count]
+    operands = view[operands_offset:symbols_offset]
+    if _NATIVE_LITTLE:
+        operands = operands.cast(_U32)
+    else:
+        operands = array(_U32, operands.tobytes())
+        operands.byteswap()
+
+    try:
+        symbols_text = bytes(view[symbols_offset:constants_offset]).decode("utf-8")
+        symbols = symbols_text.split("\n") if n_symbols else []
+
+        constants = []
+        position = constants_offset
+        for _ in range(n_constants):
+            tag = bytes(view[position:position + 1])
+            (length,) = struct.unpack_from("<I", view, position + 1)
+            text = bytes(view[position + 5:position + 5 + length]).decode("utf-8")
+            constants.append(_CONSTANT_TYPES[tag](text))
+            position += 5 + length
+    except (KeyError, ValueError, struct.error):
+        for v in (opcodes, operands, view):
+            if isinstance(v, memoryview):
+                v.release()
+        raise BinaryFormatError("Archivo binario corrupto: tablas de símbolos o constantes inválidas.") from None
+    return view, opcodes, operands, symbols, constants
+
+
+def loads(data):
+    """Decodifica un programa desde bytes; retorna un vm.Program."""
+    _, opcodes, operands, symbols, constants = _parse(data)
+    return Program(opcodes, operands, symbols, constants)
+
+
+def load(path):
+    """
+    Mapea `path` en memoria y retorna un MappedProgram que lee los códigos y
+    operandos directamente del mapa, sin copiarlos.
+    """
+    with open(path, "rb") as f:
+        mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        view, opcodes, operands, symbols, constants = _parse(mapping)
+    except Exception:
+        mapping.close()
+        raise
+    return MappedProgram(mapping, view, opcodes, operands, symbols, constants)
@@ -0,0 +1,226 @@
+"""
+Archivo: cache.py
+
+Caché en disco de compilaciones, direccionada por contenido.
+
+Cada entrada se identifica con el hash SHA-256 del código fuente junto con la
+versión del compilador, y guarda el resultado de todas las fases (tokens, AST,
+cuádruplas, código objeto y advertencias) serializado como JSON y comprimido
+con zlib. Un acierto permite omitir todas las fases de la compilación.
+
+Las entradas solo contienen datos (el AST se guarda con ast_nodes.to_data), de
+modo que leer una entrada de un directorio compartido, como la caché de un
+servidor de CI, nunca ejecuta código: una entrada que no tiene la forma
+esperada se descarta como dañada.
+
+El tamaño total de la caché está acotado: al superarlo se eliminan las entradas
+usadas hace más tiempo (LRU, según la fecha de modificación, que se actualiza
+en cada acierto).
+"""
+import hashlib
+import json
+import os
+import tempfile
+import zlib
+
+from ast_nodes import to_data, from_data
+
+# Versión del compilador. La clave de la caché también incluye una huella del
+# código de las fases, así que modificar el compilador invalida las entradas antiguas.
+COMPILER_VERSION = "5.0"
+
+# Módulos cuyo código forma parte de la huella de versión
+COMPILER_MODULES = ("lexer.py", "parser.py", "ast_nodes.py", "semantic.py", "intermediate.py", "cfg.py",
+                    "optimizer.py", "objectcode.py", "peephole.py", "regcode.py", "typedcode.py",
+                    "pycodegen.py", "tokenstore.py", "compilador.py", "cache.py")
+
+# Tamaño máximo por defecto de la caché (bytes)
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Extensión de los archivos de entrada de la caché
+ENTRY_SUFFIX = ".cc3"
+
+
+def compiler_version():
+    """
+    Retorna la versión efectiva del compilador: COMPILER_VERSION más una huella
+    del código fuente de sus módulos.
+    """
+    digest = hashlib.sha256(COMPILER_VERSION.encode())
+    base = os.path.dirname(os.path.abspath(__file__))
+    for module in COMPILER_MODULES:
+        try:
+            with open(os.path.join(base, module), "rb") as f:
+                digest.update(f.read())
+        except OSError:
+            digest.update(module.encode())
+    return f"{COMPILER_VERSION}+{digest.hexdigest()[:16]}"
+
+
+def _decode_entry(data):
+    """
+    Reconstruye una entrada escrita por CompilationCache.put: tokens y
+    cuádruplas vuelven a ser tuplas y el AST, nodos. Lanza una excepción si los
+    datos no tienen la forma esperada.
+    """
+    entry = json.loads(zlib.decompress(data).decode("utf-8"))
+    return {
+        "tokens": [tuple(token) for token in entry["tokens"]],
+        "ast": from_data(entry["ast"]),
+        "cuadruplas": [tuple(quad) for quad in entry["cuadruplas"]],
+        "instrucciones": [str(instr) for instr in entry["instrucciones"]],
+        "advertencias": [str(warning) for warning in entry["advertencias"]],
+        "informe": entry["informe"],
+    }
+
+
+class CompilationCache:
+    """
+    Caché de compilaciones en un directorio, con desalojo LRU por tamaño.
+    Es segura entre procesos: cada entrada se escribe en un archivo temporal
+    que luego se renombra de forma atómica.
+    """
+
+    def __init__(self, directory, max_bytes=DEFAULT_MAX_BYTES, version=None):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.version = version or compiler_version()
+        os.makedirs(directory, exist_ok=True)
+        # Estadísticas de uso
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self._size = None  # Tamaño total en bytes; se calcula al primer almacenamiento
+
+    def key(self, source_code, variant=""):
+        """
+        Clave de una entrada: hash del código fuente, de la versión del compilador
+        y de la variante (opciones que cambian el resultado, como -O).
+        """
+        digest = hashlib.sha256(self.version.encode())
+        digest.update(b"\0" + variant.encode() + b"\0")
+        digest.update(source_code.encode("utf-8"))
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ENTRY_SUFFIX)
+
+    def get(self, source_code, variant=""):
+        """
+        Busca la compilación de `source_code` con la variante indicada.
+
+        Retorna:
+        - Diccionario con 'tokens', 'ast', 'cuadruplas', 'instrucciones',
+          'advertencias' e 'informe', o None si no está en la caché.
+        """
+        path = self._path(self.key(source_code, variant))
+        try:
+            with open(path, "rb") as f:
+                entry = _decode_entry(f.read())
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except Exception:
+            # Entrada dañada o de un formato incompatible: se descarta
+            self._remove(path)
+            self.misses += 1
+            return None
+        try:
+            os.utime(path)  # Marca la entrada como usada recientemente
+        except OSError:
+            pass
+        self.hits += 1
+        return entry
+
+    def put(self, source_code, tokens, ast, cuadruplas, instrucciones, advertencias=(), informe=None,
+            variant=""):
+        """
+        Guarda el resultado de todas las fases de la compilación de `source_code`
+        y desaloja entradas antiguas si se supera el tamaño máximo.
+        `informe` es texto opcional que se muestra junto al resultado (p. ej. el
+        resumen de optimización).
+        """
+        entry = {
+            "tokens": list(tokens),
+            "ast": to_data(ast),  # Tabla plana de nodos: su profundidad no depende de la del AST
+            "cuadruplas": cuadruplas,
+            "instrucciones": instrucciones,
+            "advertencias": list(advertencias),
+            "informe": informe,
+        }
+        data = zlib.compress(json.dumps(entry, ensure_ascii=False).encode("utf-8"))
+        path = self._path(self.key(source_code, variant))
+
+        try:
+            replaced = os.stat(path).st_size  # Una entrada que se sobrescribe deja de ocupar espacio
+        except OSError:
+            replaced = 0
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            self._remove(tmp_path)
+            raise
+
+        self.stores += 1
+        if self._size is None:
+            self._size = self._scan_size()
+        else:
+            self._size += len(data) - replaced
+        if self._size > self.max_bytes:
+            self._evict()
+
+    def _entries(self):
+        """Lista (fecha de uso, tamaño, ruta) de las entradas existentes."""
+        entries = []
+        with os.scandir(self.directory) as it:
+            for item in it:
+                if item.name.endswith(ENTRY_SUFFIX):
+                    try:
+                        st = item.stat()
+                    except OSError:
+                        continue
+                    entries.append((st.st_mtime, st.st_size, item.path))
+        return entries
+
+    def _scan_size(self):
+        return sum(size for _, size, _ in self._entries())
+
+    def _evict(self):
+        """Elimina las entradas usadas hace más tiempo hasta volver al tamaño máximo."""
+        entries = sorted(self._entries())
+        self._size = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if self._size <= self.max_bytes:
+                break
+            if self._remove(path):
+                self._size -= size
+                self.evictions += 1
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            return False
+
+    def clear(self):
+        """Elimina todas las entradas de la caché."""
+        for _, _, path in self._entries():
+            self._remove(path)
+        self._size = 0
+
+    def stats(self):
+        """Retorna las estadísticas de uso de la caché."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "stores": self.stores,
+            "evictions": self.evictions,
+        }
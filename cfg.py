@@ -0,0 +1,227 @@
+"""
+Archivo: cfg.py
+
+Grafo de flujo de control (CFG) sobre las cuádruplas.
+
+Divide la lista plana de cuádruplas de IntermediateCodeGenerator en bloques
+básicos, enlaza sucesores y predecesores, y calcula alcanzabilidad y
+dominadores. El grafo se puede volver a convertir en una lista de cuádruplas
+con `linearize`, que conserva el orden original de los bloques.
+
+Un bloque básico empieza en:
+- la primera cuádrupla,
+- cada LABEL,
+- la cuádrupla que sigue a un GOTO o GOTOF.
+"""
+
+
+class BasicBlock:
+    """
+    Secuencia de cuádruplas sin saltos internos: solo se entra por la primera
+    y solo se sale por la última.
+    """
+    __slots__ = ('index', 'quads', 'label', 'succ', 'pred')
+
+    def __init__(self, index, quads):
+        self.index = index  # Posición del bloque en el orden original
+        self.quads = quads
+        self.label = quads[0][1] if quads and quads[0][0] == 'LABEL' else None
+        self.succ = []  # Bloques sucesores (para GOTOF: primero el que sigue, luego el destino)
+        self.pred = []  # Bloques predecesores
+
+    @property
+    def terminator(self):
+        """Última cuádrupla si es un salto (GOTO o GOTOF), o None."""
+        if self.quads and self.quads[-1][0] in ('GOTO', 'GOTOF'):
+            return self.quads[-1]
+        return None
+
+    def __repr__(self):
+        return f"B{self.index}({len(self.quads)} cuádruplas → {[b.index for b in self.succ]})"
+
+
+def split_blocks(quads):
+    """Divide las cuádruplas en listas consecutivas, una por bloque básico."""
+    blocks = []
+    current = []
+    for quad in quads:
+        head = quad[0]
+        if head == 'LABEL' and current:
+            blocks.append(current)
+            current = []
+        current.append(quad)
+        if head in ('GOTO', 'GOTOF'):
+            blocks.append(current)
+            current = []
+    if current:
+        blocks.append(current)
+    return blocks
+
+
+class ControlFlowGraph:
+    """
+    Grafo de flujo de control de un programa en cuádruplas.
+
+    Atributos:
+    - blocks: bloques básicos en el orden original; blocks[0] es la entrada.
+    - labels: etiqueta → bloque que empieza con ella.
+    """
+
+    def __init__(self, quads):
+        self.blocks = [BasicBlock(i, block) for i, block in enumerate(split_blocks(quads))]
+        self.labels = {block.label: block for block in self.blocks if block.label is not None}
+        self._link()
+        self._idom = None
+
+    @property
+    def entry(self):
+        return self.blocks[0] if self.blocks else None
+
+    def _target(self, label):
+        try:
+            return self.labels[label]
+        except KeyError:
+            raise Exception(f"Error en el grafo de flujo: la etiqueta '{label}' no está definida.")
+
+    def _link(self):
+        """Enlaza cada bloque con sus sucesores y predecesores."""
+        blocks = self.blocks
+        for i, block in enumerate(blocks):
+            following = blocks[i + 1] if i + 1 < len(blocks) else None
+            last = block.terminator
+            if last is None:
+                targets = [following] if following is not None else []
+            elif last[0] == 'GOTO':
+                targets = [self._target(last[1])]
+            else:
+                targets = [following] if following is not None else []
+                jump = self._target(last[2])
+                if jump is not following:
+                    targets.append(jump)
+            block.succ = targets
+            for successor in targets:
+                successor.pred.append(block)
+
+    # ========================
+    # Recorridos
+    # ========================
+
+    def reachable(self):
+        """Conjunto de índices de los bloques alcanzables desde la entrada."""
+        if not self.blocks:
+            return set()
+        seen = {0}
+        stack = [self.blocks[0]]
+        while stack:
+            block = stack.pop()
+            for successor in block.succ:
+                if successor.index not in seen:
+                    seen.add(successor.index)
+                    stack.append(successor)
+        return seen
+
+    def reverse_postorder(self):
+        """Bloques alcanzables en orden postorden inverso (recorrido sin recursión)."""
+        if not self.blocks:
+            return []
+        order = []
+        seen = {0}
+        stack = [(self.blocks[0], iter(self.blocks[0].succ))]
+        while stack:
+            block, successors = stack[-1]
+            for successor in successors:
+                if successor.index not in seen:
+                    seen.add(successor.index)
+                    stack.append((successor, iter(successor.succ)))
+                    break
+            else:
+                stack.pop()
+                order.append(block)
+        order.reverse()
+        return order
+
+    # ========================
+    # Dominadores
+    # ========================
+
+    def immediate_dominators(self):
+        """
+        Dominador inmediato de cada bloque alcanzable (índice → índice); la
+        entrada se domina a sí misma.
+
+        Usa el algoritmo iterativo de Cooper, Harvey y Kennedy sobre el orden
+        postorden inverso, que converge en pocas pasadas en grafos reducibles
+        como los que produce el generador de código intermedio.
+        """
+        if self._idom is not None:
+            return self._idom
+        order = self.reverse_postorder()
+        if not order:
+            self._idom = {}
+            return self._idom
+        rpo_number = {block.index: n for n, block in enumerate(order)}
+        idom = {order[0].index: order[0].index}
+
+        def intersect(a, b):
+            while a != b:
+                while rpo_number[a] > rpo_number[b]:
+                    a = idom[a]
+                while rpo_number[b] > rpo_number[a]:
+                    b = idom[b]
+            return a
+
+        changed = True
+        while changed:
+            changed = False
+            for block in order[1:]:
+                new_idom = None
+                for predecessor in block.pred:
+                    p = predecessor.index
+                    if p in idom:
+                        new_idom = p if new_idom is None else intersect(p, new_idom)
+                if idom.get(block.index) != new_idom:
+                    idom[block.index] = new_idom
+                    changed = True
+
+        self._idom = idom
+        return idom
+
+    def dominators(self, index):
+        """Lista de bloques que dominan al bloque `index`, desde él hasta la entrada."""
+        idom = self.immediate_dominators()
+        if index not in idom:
+            return []
+        chain = [index]
+        while idom[index] != index:
+            index = idom[index]
+            chain.append(index)
+        return chain
+
+    def dominates(self, a, b):
+        """Verifica si el bloque `a` domina al bloque `b` (todo camino a `b` pasa por `a`)."""
+        return a in self.dominators(b)
+
+    # ========================
+    # Linealización
+    # ========================
+
+    def linearize(self, only_reachable=False):
+        """
+        Convierte el grafo de nuevo en una lista de cuádruplas, en el orden
+        original de los bloques. Con only_reachable=True se omiten los bloques
+        a los que no se puede llegar desde la entrada.
+        """
+        keep = self.reachable() if only_reachable else None
+        quads = []
+        for block in self.blocks:
+            if keep is None or block.index in keep:
+                quads.extend(block.quads)
+        return quads
+
+    def __len__(self):
+        return len(self.blocks)
+
+
+def build_cfg(quads):
+    """Construye el grafo de flujo de control de una lista de cuádruplas."""
+    return ControlFlowGraph(quads)
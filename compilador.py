@@ -1,11 +1,162 @@
 import argparse
-from lexer import lexer
-from parser import parser
-from semantic import semantic_analyze
+import contextlib
+import io
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from collections.abc import Sequence
+from lexer import lexer, lexer_file
+from tokenstore import lexer_compact
+from cache import CompilationCache
+from optimizer import QuadOptimizer, default_passes
+from peephole import PeepholeOptimizer
+from vm import VirtualMachine, assemble
+from pycodegen import CompiledProgram
+import bincode
+from parser import parser, parser_stream
+from semantic import SemanticAnalyzer, semantic_analyze_stream
 from intermediate import IntermediateCodeGenerator
+from typedcode import TypedCodeGenerator
 from objectcode import ObjectCodeGenerator
+from regcode import RegisterCodeGenerator
+from profiler import PhaseProfiler
+from ast_nodes import walk
 
-def compilar(codigo_fuente, mostrar_tokens=False, mostrar_ast=False, mostrar_cuadruplas=False):
+class ResultadoCompilacion:
+    """
+    Resultado de todas las fases de una compilación.
+    """
+
+    def __init__(self, tokens, ast, cuadruplas, instrucciones, advertencias):
+        self.tokens = tokens                # Lista de tokens (o TokenStore)
+        self.ast = ast                      # Lista de nodos del AST
+        self.cuadruplas = cuadruplas        # Código intermedio
+        self.instrucciones = instrucciones  # Código objeto
+        self.advertencias = advertencias    # Advertencias del análisis semántico
+
+def compilar_programa(codigo_fuente, cache=None, optimizar=False, mirilla=False, registros=None, perfil=None,
+                      tipado=False):
+    """
+    Ejecuta todas las fases del compilador sin imprimir nada y retorna un
+    ResultadoCompilacion. Cada llamada crea su propio estado (flujo de tokens,
+    analizador semántico y generadores), por lo que es segura para ejecutar
+    varias compilaciones a la vez en hilos distintos.
+
+    Si se pasa una CompilationCache y el código fuente es una cadena, un acierto
+    omite todas las fases y un fallo guarda el resultado en la caché.
+    Con optimizar=True se aplican los pases de optimizer.QuadOptimizer a las cuádruplas,
+    y con mirilla=True la optimización de mirilla (peephole) al código objeto.
+    Con registros=N el código objeto es de tres direcciones para una máquina de
+    N registros (regcode.RegisterCodeGenerator) en lugar de acumulador; la
+    mirilla solo trabaja sobre código de acumulador, así que no admite registros.
+    Con tipado=True el análisis semántico y la generación de cuádruplas se hacen
+    en un solo recorrido (typedcode.TypedCodeGenerator) y las cuádruplas son tipadas.
+    Si se pasa un profiler.PhaseProfiler, se mide cada fase (ver _fase); con caché,
+    la consulta y el almacenamiento se miden como la fase "caché", así que un
+    acierto deja en el perfil solo esa fase.
+
+    Lanza la excepción de la primera fase que falle.
+    """
+    _comprobar_mirilla(mirilla, registros)
+    variante = _variante(optimizar, mirilla, registros, tipado)
+    if cache is not None and isinstance(codigo_fuente, str):
+        with _fase(perfil, "caché", lambda: entrada is not None, "aciertos"):
+            entrada = cache.get(codigo_fuente, variante)
+        if entrada is not None:
+            return ResultadoCompilacion(entrada["tokens"], entrada["ast"], entrada["cuadruplas"],
+                                        entrada["instrucciones"], entrada["advertencias"])
+
+    with _fase(perfil, "léxico", lambda: len(tokens), "tokens"):
+        tokens = lexer(codigo_fuente) if isinstance(codigo_fuente, str) else list(codigo_fuente)
+    with _fase(perfil, "sintáctico", lambda: _contar_nodos(ast), "nodos"):
+        ast = parser(tokens)
+    if tipado:
+        with _fase(perfil, "tipado", lambda: len(cuads), "cuádruplas"):
+            analizador = gen_intermedio = TypedCodeGenerator(echo_warnings=False, cse=optimizar,
+                                                             sethi_ullman=optimizar)
+            cuads = gen_intermedio.generate(ast)
+    else:
+        with _fase(perfil, "semántico", lambda: _contar_nodos(ast), "nodos"):
+            analizador = SemanticAnalyzer(echo_warnings=False)
+            analizador.analyze(ast)
+        with _fase(perfil, "intermedio", lambda: len(cuads), "cuádruplas"):
+            gen_intermedio = IntermediateCodeGenerator(cse=optimizar, sethi_ullman=optimizar)
+            cuads = gen_intermedio.generate(ast)
+    optimizador = None
+    if optimizar:
+        with _fase(perfil, "optimización", lambda: len(cuads), "cuádruplas"):
+            optimizador = QuadOptimizer(default_passes(analizador.read_variables))
+            cuads = optimizador.optimize(cuads)
+    with _fase(perfil, "objeto", lambda: len(instrucciones), "instrucciones"):
+        gen_objeto = _generador_objeto(optimizar, registros)
+        instrucciones = gen_objeto.generate(cuads)
+    mirilla_opt = None
+    if mirilla:
+        with _fase(perfil, "mirilla", lambda: len(instrucciones), "instrucciones"):
+            mirilla_opt = PeepholeOptimizer()
+            instrucciones = mirilla_opt.optimize(instrucciones)
+
+    if cache is not None and isinstance(codigo_fuente, str):
+        # El informe se guarda aunque aquí no se muestre: compilar comparte las entradas
+        informe = _informe(gen_intermedio, gen_objeto, optimizador, mirilla_opt, tipado, registros)
+        with _fase(perfil, "caché"):
+            cache.put(codigo_fuente, tokens, ast, cuads, instrucciones, analizador.warnings, informe, variante)
+    return ResultadoCompilacion(tokens, ast, cuads, instrucciones, analizador.warnings)
+
+def _fase(perfil, nombre, contar=None, unidad=""):
+    """
+    Contexto que mide la fase `nombre` en `perfil` (un PhaseProfiler), o que no
+    hace nada si no se pidió perfil. `contar` retorna los elementos producidos
+    por la fase y solo se llama si hay perfil.
+    """
+    if perfil is None:
+        return contextlib.nullcontext()
+    return perfil.phase(nombre, contar, unidad)
+
+def _contar_nodos(ast):
+    """Número total de nodos del AST, incluidas las expresiones."""
+    return sum(1 for _ in walk(ast))
+
+def _variante(optimizar, mirilla=False, registros=None, tipado=False):
+    """Nombre de la variante de compilación para la clave de la caché."""
+    return (("O" if optimizar else "") + ("M" if mirilla else "") + (f"R{registros}" if registros else "")
+            + ("T" if tipado else ""))
+
+def _comprobar_mirilla(mirilla, registros):
+    """La optimización de mirilla reconoce patrones del código de acumulador, no del de registros."""
+    if mirilla and registros:
+        raise ValueError("La optimización de mirilla solo se aplica al código de acumulador, no con registros.")
+
+def _informe(gen_intermedio, gen_objeto, optimizador=None, mirilla_opt=None, tipado=False, registros=None):
+    """
+    Texto de los informes que se muestran después del código objeto (conversiones
+    de --tipado, reducción de -O, registros y mirilla), o None si no hay ninguno.
+    `optimizador` y `mirilla_opt` son None si no se aplicaron esos pases.
+    """
+    informes = []
+    if tipado:
+        informes.append(f"\n[TIPADO]\nconversiones int → float: {gen_intermedio.conversions}")
+    if optimizador is not None:
+        informes.append(f"\n[OPTIMIZACIÓN]\nsubexpresiones comunes reutilizadas: {gen_intermedio.cse_hits}\n"
+                        f"{optimizador.summary()}")
+    if registros:
+        informes.append(f"\n[ASIGNACIÓN DE REGISTROS]\n{gen_objeto.summary()}")
+    elif optimizador is not None:
+        informes.append(f"cargas del acumulador evitadas: {gen_objeto.loads_skipped}")
+    if mirilla_opt is not None:
+        informes.append(f"\n[OPTIMIZACIÓN DE MIRILLA]\n{mirilla_opt.summary()}")
+    return "\n".join(informes) or None
+
+def _generador_objeto(optimizar, registros=None):
+    """Generador de código objeto: de acumulador o, si se indica registros=N, de registros."""
+    if registros:
+        return RegisterCodeGenerator(registros)
+    return ObjectCodeGenerator(track_accumulator=optimizar)
+
+def compilar(codigo_fuente, mostrar_tokens=False, mostrar_ast=False, mostrar_cuadruplas=False, cache=None,
+             optimizar=False, mirilla=False, ejecutar=False, salida_binaria=None, registros=None, perfil=None,
+             tipado=False, compacto=False):
     """
     Ejecuta todas las fases del compilador de forma secuencial:
     1. Análisis léxico
@@ -13,51 +164,445 @@ def compilar(codigo_fuente, mostrar_tokens=False, mostrar_ast=False, mostrar_cua
     3. Análisis semántico
     4. Generación de código intermedio (cuádruplas)
     5. Generación de código objeto (ensamblador simple)
+    Con tipado=True las fases 3 y 4 se hacen en un solo recorrido del AST.
 
     Parámetros:
-    - codigo_fuente: cadena con el código fuente completo.
+    - codigo_fuente: cadena con el código fuente completo, o los tokens ya producidos
+      por el analizador léxico: un iterable (por ejemplo, lexer_file), que se consume
+      de forma perezosa durante el análisis sintáctico, o una secuencia (por ejemplo,
+      el TokenStore de lexer_compact).
     - mostrar_tokens: bool, si se desea imprimir los tokens.
     - mostrar_ast: bool, si se desea imprimir el árbol de sintaxis abstracta.
     - mostrar_cuadruplas: bool, si se desea imprimir las cuádruplas generadas.
+    - cache: CompilationCache opcional. Solo se usa si codigo_fuente es una cadena;
+      un acierto muestra el resultado guardado y omite todas las fases.
+    - optimizar: bool, si se desea optimizar las cuádruplas (opción -O) e informar la reducción.
+    - mirilla: bool, si se desea aplicar la optimización de mirilla al código objeto (opción --mirilla).
+    - ejecutar: "vm" (o True) para ejecutar el código objeto en la máquina virtual, o "python" para
+      ejecutar las cuádruplas traducidas a Python (opción --ejecutar [vm|python]).
+    - salida_binaria: ruta donde escribir el programa en formato binario (opción -o).
+    - registros: int opcional; genera código de tres direcciones para una máquina con
+      ese número de registros (opción --target registros) en lugar de código de acumulador.
+      No admite mirilla.
+    - perfil: profiler.PhaseProfiler opcional donde medir cada fase (opción --perfil). Con perfil,
+      un iterable de tokens se materializa en la fase léxica para no sumar su tiempo al del parser.
+      Con caché, su consulta y su almacenamiento se miden como la fase "caché".
+    - tipado: bool, si se desea validar y generar cuádruplas tipadas en un solo recorrido
+      (typedcode.TypedCodeGenerator, opción --tipado).
+    - compacto: bool, si una cadena se tokeniza en un almacén por columnas (tokenstore.lexer_compact,
+      opción --compacto) en lugar de una lista de tuplas.
     """
     print("\n[COMPILADOR INICIADO]")
 
+    _comprobar_mirilla(mirilla, registros)
+    variante = _variante(optimizar, mirilla, registros, tipado)
+    usar_cache = cache is not None and isinstance(codigo_fuente, str)
+    if usar_cache:
+        with _fase(perfil, "caché", lambda: entrada is not None, "aciertos"):
+            entrada = cache.get(codigo_fuente, variante)
+        if entrada is not None:
+            _mostrar_desde_cache(entrada, mostrar_tokens, mostrar_ast, mostrar_cuadruplas, ejecutar, salida_binaria)
+            return
+
     # Fase 1: Análisis léxico
-    tokens = lexer(codigo_fuente)
+    with _fase(perfil, "léxico", lambda: len(tokens), "tokens"):
+        if isinstance(codigo_fuente, str):
+            tokens = lexer_compact(codigo_fuente) if compacto else lexer(codigo_fuente)
+        else:
+            tokens = codigo_fuente
+            if perfil is not None and not isinstance(tokens, Sequence):
+                tokens = list(tokens)
     if mostrar_tokens:
+        if not isinstance(tokens, Sequence):
+            tokens = list(tokens)  # Para imprimirlos antes del AST hay que materializarlos
         print("\n[TOKENS]")
         for t in tokens:
             print(t)
 
     # Fase 2: Análisis sintáctico
-    ast = parser(tokens)
+    with _fase(perfil, "sintáctico", lambda: _contar_nodos(ast), "nodos"):
+        ast = parser(tokens)
     if mostrar_ast:
         print("\n[ÁRBOL DE SINTAXIS ABSTRACTA (AST)]")
         for nodo in ast:
             print(nodo)
 
-    # Fase 3: Análisis semántico
-    semantic_analyze(ast)
-    print("\n[ANÁLISIS SEMÁNTICO] ✔️ Sin errores")
+    if tipado:
+        # Fases 3 y 4 en un solo recorrido: el generador es también el analizador
+        with _fase(perfil, "tipado", lambda: len(cuads), "cuádruplas"):
+            analizador = gen_intermedio = TypedCodeGenerator(cse=optimizar, sethi_ullman=optimizar)
+            cuads = gen_intermedio.generate(ast)
+        print("\n[ANÁLISIS SEMÁNTICO] ✔️ Sin errores")
+    else:
+        # Fase 3: Análisis semántico
+        with _fase(perfil, "semántico", lambda: _contar_nodos(ast), "nodos"):
+            analizador = SemanticAnalyzer()
+            analizador.analyze(ast)
+        print("\n[ANÁLISIS SEMÁNTICO] ✔️ Sin errores")
 
-    # Fase 4: Generación de código intermedio (cuádruplas)
-    gen_intermedio = IntermediateCodeGenerator()
-    cuads = gen_intermedio.generate(ast)
+        # Fase 4: Generación de código intermedio (cuádruplas)
+        with _fase(perfil, "intermedio", lambda: len(cuads), "cuádruplas"):
+            gen_intermedio = IntermediateCodeGenerator(cse=optimizar, sethi_ullman=optimizar)
+            cuads = gen_intermedio.generate(ast)
+    optimizador = None
+    if optimizar:
+        with _fase(perfil, "optimización", lambda: len(cuads), "cuádruplas"):
+            optimizador = QuadOptimizer(default_passes(analizador.read_variables))
+            cuads = optimizador.optimize(cuads)
     if mostrar_cuadruplas:
         print("\n[CÓDIGO INTERMEDIO - CUÁDRUPLAS]")
         for q in cuads:
             print(q)
 
     # Fase 5: Generación de código objeto
-    gen_objeto = ObjectCodeGenerator()
-    instrucciones = gen_objeto.generate(cuads)
+    with _fase(perfil, "objeto", lambda: len(instrucciones), "instrucciones"):
+        gen_objeto = _generador_objeto(optimizar, registros)
+        instrucciones = gen_objeto.generate(cuads)
+    mirilla_opt = None
+    if mirilla:
+        with _fase(perfil, "mirilla", lambda: len(instrucciones), "instrucciones"):
+            mirilla_opt = PeepholeOptimizer()
+            instrucciones = mirilla_opt.optimize(instrucciones)
 
     print("\n[CÓDIGO OBJETO]")
     for instr in instrucciones:
         print(instr)
 
+    # Informes de optimización, después del código objeto
+    informe = _informe(gen_intermedio, gen_objeto, optimizador, mirilla_opt, tipado, registros)
+    if informe:
+        print(informe)
+
+    if usar_cache:
+        with _fase(perfil, "caché"):
+            cache.put(codigo_fuente, tokens, ast, cuads, instrucciones, analizador.warnings, informe, variante)
+
+    if salida_binaria:
+        _escribir_binario(instrucciones, salida_binaria)
+    if ejecutar:
+        _ejecutar(instrucciones, cuads if ejecutar == "python" else None)
+
+    print("\n[COMPILACIÓN COMPLETA ✅]\n")
+
+def _escribir_binario(instrucciones, ruta):
+    """Ensambla el código objeto y lo escribe en `ruta` con el formato de bincode."""
+    tamano = bincode.dump(assemble(instrucciones), ruta)
+    print(f"\n[CÓDIGO BINARIO] {ruta} ({tamano} bytes)")
+
+def _ejecutar(programa, cuadruplas=None):
+    """
+    Ejecuta el código objeto (instrucciones de texto o un vm.Program) en la
+    máquina virtual e imprime el valor final de cada variable y la velocidad de ejecución.
+    Si se pasan las cuádruplas, se ejecutan traducidas a Python (pycodegen) en su lugar.
+    """
+    maquina = VirtualMachine(programa) if cuadruplas is None else CompiledProgram(cuadruplas)
+    memoria = maquina.run()
+    print("\n[EJECUCIÓN]")
+    for nombre, valor in memoria.items():
+        print(f"{nombre} = {valor!r}")
+    print(maquina.summary())
+
+def _mostrar_desde_cache(entrada, mostrar_tokens, mostrar_ast, mostrar_cuadruplas, ejecutar=False,
+                         salida_binaria=None):
+    """
+    Imprime una compilación recuperada de la caché con las mismas secciones que `compilar`.
+    """
+    print("\n[CACHÉ] ✔️ Resultado recuperado de la caché, se omiten todas las fases")
+    if mostrar_tokens:
+        print("\n[TOKENS]")
+        for t in entrada["tokens"]:
+            print(t)
+    if mostrar_ast:
+        print("\n[ÁRBOL DE SINTAXIS ABSTRACTA (AST)]")
+        for nodo in entrada["ast"]:
+            print(nodo)
+    for advertencia in entrada["advertencias"]:
+        print(advertencia)
+    print("\n[ANÁLISIS SEMÁNTICO] ✔️ Sin errores")
+    if mostrar_cuadruplas:
+        print("\n[CÓDIGO INTERMEDIO - CUÁDRUPLAS]")
+        for q in entrada["cuadruplas"]:
+            print(q)
+    print("\n[CÓDIGO OBJETO]")
+    for instr in entrada["instrucciones"]:
+        print(instr)
+    if entrada.get("informe"):
+        print(entrada["informe"])
+    if salida_binaria:
+        _escribir_binario(entrada["instrucciones"], salida_binaria)
+    if ejecutar:
+        _ejecutar(entrada["instrucciones"], entrada["cuadruplas"] if ejecutar == "python" else None)
     print("\n[COMPILACIÓN COMPLETA ✅]\n")
 
+def compilar_flujo(codigo_fuente, mostrar_ast=False, mostrar_cuadruplas=False, salida=None, optimizar=False,
+                   mirilla=False, ejecutar=False, salida_binaria=None, registros=None):
+    """
+    Ejecuta las fases del compilador sentencia por sentencia: cada sentencia de
+    nivel superior pasa por el análisis sintáctico, el semántico, la generación de
+    cuádruplas y la de código objeto, y su código objeto se escribe antes de leer
+    la siguiente. La memoria queda acotada por la sentencia más grande (más la
+    tabla de símbolos) y la primera salida aparece sin esperar al resto del archivo.
+
+    Si una sentencia tiene un error, el código de las sentencias anteriores ya
+    habrá sido escrito.
+
+    Parámetros:
+    - codigo_fuente: cadena con el código fuente o iterable de tokens (p. ej. lexer_file).
+    - mostrar_ast: bool, si se desea imprimir el nodo del AST de cada sentencia.
+    - mostrar_cuadruplas: bool, si se desea imprimir las cuádruplas de cada sentencia.
+    - salida: archivo donde escribir el código objeto (por defecto, la salida estándar).
+    - optimizar: bool, si se desea optimizar las cuádruplas de cada sentencia (opción -O), con las
+      mismas opciones del generador que compilar. Como no se conoce el resto del programa, se
+      consideran leídas todas las variables y cada sentencia se optimiza por separado, así que no
+      se eliminan las asignaciones a variables que nunca se leen ni las que otra sentencia sobrescribe.
+    - mirilla: bool, si se desea aplicar la optimización de mirilla al código objeto de cada sentencia.
+    - ejecutar: "vm" (o True) o "python", si se desea ejecutar el programa al terminar (se conserva
+      todo su código objeto o, con "python", todas sus cuádruplas).
+    - salida_binaria: ruta donde escribir el programa completo en formato binario al terminar.
+    - registros: int opcional; genera código de tres direcciones para una máquina con ese número de
+      registros. No admite mirilla.
+    """
+    _comprobar_mirilla(mirilla, registros)
+    salida = salida or sys.stdout
+    print("\n[COMPILADOR INICIADO - MODO POR FLUJO]")
+
+    tokens = lexer(codigo_fuente) if isinstance(codigo_fuente, str) else codigo_fuente
+    sentencias = semantic_analyze_stream(parser_stream(tokens))
+
+    gen_intermedio = IntermediateCodeGenerator(cse=optimizar, sethi_ullman=optimizar)
+    gen_objeto = _generador_objeto(optimizar, registros)
+
+    optimizador = QuadOptimizer()  # Sin read_variables: las variables se leen quizá más adelante
+    antes = despues = 0
+    mirilla_opt = PeepholeOptimizer()
+    instr_antes = instr_despues = 0
+    programa = []  # Código objeto completo, solo si hay que ejecutarlo o escribirlo en binario
+    conservar = ejecutar or bool(salida_binaria)
+    programa_cuads = [] if ejecutar == "python" else None
+
+    print("\n[CÓDIGO OBJETO]")
+    primera = True
+    for nodo in sentencias:
+        cuads = gen_intermedio.generate_statement(nodo)
+        if optimizar:
+            antes += len(cuads)
+            cuads = optimizador.optimize(cuads)
+            despues += len(cuads)
+        lineas = []
+        if mostrar_ast:
+            lineas.append(f"; AST: {nodo}")
+        if mostrar_cuadruplas:
+            lineas.extend(f"; {q}" for q in cuads)
+        if programa_cuads is not None:
+            programa_cuads.extend(cuads)
+        instrucciones = gen_objeto.generate(cuads)
+        if mirilla:
+            instr_antes += len(instrucciones)
+            instrucciones = mirilla_opt.optimize(instrucciones)
+            instr_despues += len(instrucciones)
+        lineas.extend(instrucciones)
+        if conservar:
+            programa.extend(instrucciones)
+        if not lineas:
+            continue  # Declaración sin inicialización: no genera código
+        salida.write("\n".join(lineas) + "\n")
+        if primera:
+            salida.flush()  # La primera sentencia se muestra de inmediato
+            primera = False
+
+    print("\n[ANÁLISIS SEMÁNTICO] ✔️ Sin errores")
+    if optimizar:
+        porcentaje = (antes - despues) / antes * 100 if antes else 0.0
+        print(f"\n[OPTIMIZACIÓN]\ncuádruplas: {antes} → {despues} ({porcentaje:.1f}% menos)")
+    if mirilla:
+        porcentaje = (instr_antes - instr_despues) / instr_antes * 100 if instr_antes else 0.0
+        print(f"\n[OPTIMIZACIÓN DE MIRILLA]\ninstrucciones: {instr_antes} → {instr_despues} ({porcentaje:.1f}% menos)")
+    if salida_binaria:
+        _escribir_binario(programa, salida_binaria)
+    if ejecutar:
+        _ejecutar(programa, programa_cuads)
+    print("\n[COMPILACIÓN COMPLETA ✅]\n")
+
+def compilar_archivo(ruta, args):
+    """
+    Compila un archivo con las opciones de la línea de comandos (`args`) e imprime
+    el resultado de cada fase o el error encontrado.
+
+    Retorna True si la compilación terminó sin errores.
+    """
+    try:
+        if bincode.is_binary(ruta):
+            if args.ejecutar == "python":
+                raise Exception("Un programa binario solo se puede ejecutar en la máquina virtual (--ejecutar vm).")
+            ejecutar_binario(ruta, args.ejecutar)
+            return True
+
+        cache = _obtener_cache(args)
+        perfil = PhaseProfiler() if getattr(args, "perfil", None) else None
+        if cache is not None and not args.flujo:
+            # La clave de la caché es el texto completo, así que el archivo se lee entero;
+            # si no hay acierto, compilar lo tokeniza (con --compacto, por columnas)
+            with open(ruta, "r", encoding="utf-8") as f:
+                tokens = f.read()
+        elif args.compacto:
+            # Los tokens se guardan por columnas y sus valores se leen del código fuente
+            with open(ruta, "r", encoding="utf-8") as f:
+                tokens = lexer_compact(f.read())
+        else:
+            # El archivo se lee por bloques (mmap) y los tokens se generan bajo demanda
+            tokens = lexer_file(ruta)
+
+        if args.flujo:
+            compilar_flujo(
+                tokens,
+                mostrar_ast=args.ast,
+                mostrar_cuadruplas=args.cuadruplas,
+                optimizar=args.optimizar,
+                mirilla=(args.mirilla or args.optimizar) and args.target == "acumulador",
+                ejecutar=args.ejecutar,
+                salida_binaria=args.salida,
+                registros=args.registros if args.target == "registros" else None
+            )
+        else:
+            compilar(
+                tokens,
+                mostrar_tokens=args.tokens,
+                mostrar_ast=args.ast,
+                mostrar_cuadruplas=args.cuadruplas,
+                cache=cache,
+                optimizar=args.optimizar,
+                mirilla=(args.mirilla or args.optimizar) and args.target == "acumulador",
+                ejecutar=args.ejecutar,
+                salida_binaria=args.salida,
+                registros=args.registros if args.target == "registros" else None,
+                perfil=perfil,
+                tipado=args.tipado,
+                compacto=args.compacto
+            )
+            if perfil is not None:
+                _mostrar_perfil(perfil, ruta, args)
+        return True
+    except Exception as e:
+        print(f"\n❌ ERROR DURANTE LA COMPILACIÓN:\n{e}\n")
+        return False
+
+def _mostrar_perfil(perfil, ruta, args):
+    """
+    Imprime las mediciones por fase como tabla o como JSON (--perfil json) y, si se
+    pidió --perfil-salida, añade el documento JSON como una línea de ese archivo.
+    """
+    documento = perfil.to_json(archivo=ruta, variante=_variante(
+        args.optimizar, (args.mirilla or args.optimizar) and args.target == "acumulador",
+        args.registros if args.target == "registros" else None,
+        args.tipado))
+    print("\n[PERFIL]")
+    print(documento if args.perfil == "json" else perfil.table())
+    if args.perfil_salida:
+        with open(args.perfil_salida, "a", encoding="utf-8") as f:
+            f.write(documento + "\n")
+
+def ejecutar_binario(ruta, ejecutar=True):
+    """
+    Carga un programa escrito con -o (mapeado en memoria, sin copiar el código)
+    y, si se pide, lo ejecuta en la máquina virtual.
+    """
+    with bincode.load(ruta) as programa:
+        print(f"\n[PROGRAMA BINARIO] {ruta}: {len(programa)} instrucciones, "
+              f"{len(programa.symbols)} variables, {len(programa.constants)} constantes")
+        if ejecutar:
+            _ejecutar(programa)
+
+# Cachés abiertas en este proceso (directorio → CompilationCache)
+_caches = {}
+
+def _obtener_cache(args):
+    """
+    Retorna la caché indicada con --cache (una instancia por proceso y directorio),
+    o None si no se pidió caché.
+    """
+    if not getattr(args, "cache", None):
+        return None
+    cache = _caches.get(args.cache)
+    if cache is None:
+        cache = CompilationCache(args.cache, max_bytes=int(args.cache_max_mb * 1024 * 1024))
+        _caches[args.cache] = cache
+    return cache
+
+def _compilar_en_proceso(trabajo):
+    """
+    Tarea de un proceso del modo por lotes: compila un archivo capturando toda su
+    salida, para imprimirla después como un bloque sin mezclarla con la de otros.
+    Retorna (ruta, salida, éxito, líneas, segundos, aciertos de caché, fallos de caché).
+    """
+    ruta, args = trabajo
+    cache = _obtener_cache(args)
+    antes = (cache.hits, cache.misses) if cache else (0, 0)
+    inicio = time.perf_counter()
+    salida = io.StringIO()
+    with contextlib.redirect_stdout(salida):
+        exito = compilar_archivo(ruta, args)
+    segundos = time.perf_counter() - inicio
+    try:
+        with open(ruta, "rb") as f:
+            lineas = sum(1 for _ in f)
+    except OSError:
+        lineas = 0
+    despues = (cache.hits, cache.misses) if cache else (0, 0)
+    return ruta, salida.getvalue(), exito, lineas, segundos, despues[0] - antes[0], despues[1] - antes[1]
+
+def expandir_rutas(rutas):
+    """
+    Convierte la lista de rutas de la línea de comandos en una lista de archivos:
+    los directorios se recorren recursivamente tomando sus archivos .txt en orden.
+    """
+    archivos = []
+    for ruta in rutas:
+        if os.path.isdir(ruta):
+            for raiz, dirs, nombres in os.walk(ruta):
+                dirs.sort()
+                archivos.extend(os.path.join(raiz, n) for n in sorted(nombres) if n.endswith(".txt"))
+        else:
+            archivos.append(ruta)
+    return archivos
+
+def compilar_lote(archivos, args, jobs=None):
+    """
+    Compila varios archivos repartiéndolos en un grupo de `jobs` procesos.
+    La salida de cada archivo se imprime completa y en el orden de entrada, y al
+    final se informa el total de errores y el rendimiento en archivos/s y líneas/s.
+
+    Retorna el número de archivos que fallaron.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    inicio = time.perf_counter()
+    fallidos = 0
+    total_lineas = 0
+    aciertos = fallos_cache = 0
+    trabajos = [(ruta, args) for ruta in archivos]
+    # Varios archivos por tarea para que el costo de comunicación no domine con archivos pequeños
+    tamano_tarea = max(1, len(trabajos) // (jobs * 4))
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        for ruta, salida, exito, lineas, segundos, hits, misses in pool.map(
+                _compilar_en_proceso, trabajos, chunksize=tamano_tarea):
+            print(f"\n===== {ruta} ({segundos * 1000:.1f} ms) =====")
+            print(salida, end="")
+            fallidos += not exito
+            total_lineas += lineas
+            aciertos += hits
+            fallos_cache += misses
+
+    transcurrido = time.perf_counter() - inicio
+    print("\n[RESUMEN DEL LOTE]")
+    print(f"Archivos: {len(archivos)} ({len(archivos) - fallidos} correctos, {fallidos} con errores)")
+    print(f"Procesos: {jobs}")
+    print(f"Tiempo total: {transcurrido:.3f} s")
+    if transcurrido > 0:
+        print(f"Rendimiento: {len(archivos) / transcurrido:.1f} archivos/s, {total_lineas / transcurrido:.1f} líneas/s")
+    if aciertos or fallos_cache:
+        print(f"Caché: {aciertos} aciertos, {fallos_cache} fallos")
+    return fallidos
+
 def main():
     """
     Función principal que maneja la interfaz por línea de comandos.
@@ -65,27 +610,85 @@ def main():
     """
     parser_args = argparse.ArgumentParser(description="Compilador simple")
 
-    # Argumento obligatorio: archivo fuente
-    parser_args.add_argument("archivo", help="Archivo de entrada con código fuente")
+    # Argumento obligatorio: archivo(s) fuente
+    parser_args.add_argument("archivo", nargs="+",
+                             help="Archivo de entrada con código fuente (varios archivos o directorios activan el modo por lotes)")
 
     # Opciones adicionales para mostrar fases del compilador
     parser_args.add_argument("--tokens", action="store_true", help="Mostrar tokens")
     parser_args.add_argument("--ast", action="store_true", help="Mostrar AST")
     parser_args.add_argument("--cuadruplas", action="store_true", help="Mostrar código intermedio")
+    parser_args.add_argument("-O", dest="optimizar", action="store_true",
+                             help="Optimizar el código intermedio (plegado de constantes, identidades, propagación); "
+                                  "con --target acumulador incluye --mirilla")
+    parser_args.add_argument("--mirilla", action="store_true",
+                             help="Aplicar la optimización de mirilla (peephole) al código objeto de acumulador")
+    parser_args.add_argument("--ejecutar", nargs="?", const="vm", choices=("vm", "python"), default=None,
+                             help="Ejecutar el programa y mostrar la memoria final: en la máquina virtual (vm, "
+                                  "por defecto) o traducido a Python y compilado (python)")
+    parser_args.add_argument("-o", dest="salida", metavar="ARCHIVO",
+                             help="Escribir el código objeto ensamblado en formato binario (se ejecuta con "
+                                  "'compilador.py ARCHIVO --ejecutar')")
+    parser_args.add_argument("--target", choices=("acumulador", "registros"), default="acumulador",
+                             help="Máquina destino del código objeto (por defecto, acumulador)")
+    parser_args.add_argument("--registros", type=int, default=8, metavar="N",
+                             help="Número de registros de la máquina con --target registros (por defecto 8)")
+    parser_args.add_argument("--perfil", "--profile", nargs="?", const="tabla", choices=("tabla", "json"),
+                             default=None,
+                             help="Medir tiempo real, de CPU, pico de memoria y elementos de cada fase y mostrarlos "
+                                  "como tabla (por defecto) o JSON")
+    parser_args.add_argument("--perfil-salida", metavar="ARCHIVO", default=None,
+                             help="Con --perfil, añadir las mediciones de cada archivo como una línea JSON en ARCHIVO")
+    parser_args.add_argument("--tipado", action="store_true",
+                             help="Validar y generar el código intermedio en un solo recorrido del AST, con "
+                                  "cuádruplas tipadas (operaciones float e int → float explícitas)")
+    parser_args.add_argument("--compacto", action="store_true",
+                             help="Guardar los tokens en un almacén compacto por columnas (TokenStore)")
+    parser_args.add_argument("--flujo", action="store_true",
+                             help="Compilar sentencia por sentencia, escribiendo el código objeto de cada una al "
+                                  "terminarla; con -O cada sentencia se optimiza por separado y no se eliminan las "
+                                  "asignaciones a variables que nunca se leen. No admite --tokens, --cache, "
+                                  "--perfil ni --tipado")
+    parser_args.add_argument("--cache", metavar="DIR", default=None,
+                             help="Directorio de la caché de compilaciones (se omiten las fases si el código no cambió)")
+    parser_args.add_argument("--cache-max-mb", type=float, default=64,
+                             help="Tamaño máximo de la caché en MiB (desalojo LRU)")
+    parser_args.add_argument("-j", "--jobs", type=int, default=None,
+                             help="Número de procesos del modo por lotes (por defecto, uno por CPU)")
 
     args = parser_args.parse_args()
+    if args.perfil and args.flujo:
+        parser_args.error("--perfil no admite --flujo (las fases se intercalan sentencia por sentencia)")
+    if args.tipado and args.flujo:
+        parser_args.error("--tipado no admite --flujo")
+    if args.tokens and args.flujo:
+        parser_args.error("--tokens no admite --flujo (los tokens se consumen a medida que se leen)")
+    if args.cache and args.flujo:
+        parser_args.error("--cache no admite --flujo (la clave de la caché es el archivo completo)")
+    if args.perfil_salida and not args.perfil:
+        args.perfil = "tabla"
+    if args.target == "registros":
+        if args.mirilla:
+            parser_args.error("--mirilla solo admite --target acumulador (con -O se omite en el código de registros)")
+        if args.ejecutar == "vm" or args.salida:
+            parser_args.error("--ejecutar vm y -o solo admiten --target acumulador")
+        if args.registros < 3:
+            parser_args.error("--registros debe ser al menos 3 (r0 y r1 están reservados)")
 
-    try:
-        with open(args.archivo, "r", encoding="utf-8") as f:
-            codigo = f.read()
-        compilar(
-            codigo,
-            mostrar_tokens=args.tokens,
-            mostrar_ast=args.ast,
-            mostrar_cuadruplas=args.cuadruplas
-        )
-    except Exception as e:
-        print(f"\n❌ ERROR DURANTE LA COMPILACIÓN:\n{e}\n")
+    archivos = expandir_rutas(args.archivo)
+    if len(archivos) == 1 and args.jobs is None and not os.path.isdir(args.archivo[0]):
+        compilar_archivo(archivos[0], args)
+        cache = _obtener_cache(args)
+        if cache is not None:
+            stats = cache.stats()
+            print(f"[CACHÉ] aciertos: {stats['hits']}, fallos: {stats['misses']}, "
+                  f"almacenadas: {stats['stores']}, desalojadas: {stats['evictions']}")
+    else:
+        if args.salida:
+            parser_args.error("-o solo admite un archivo de entrada")
+        fallidos = compilar_lote(archivos, args, args.jobs)
+        if fallidos:
+            sys.exit(1)
 
 if __name__ == "__main__":
     main()
@@ -1,21 +1,47 @@
+from ast_nodes import Declaration, Assignment, If, BinaryOp, Literal, Name
+
+# Prefijo de los temporales (%t1, %t2, ...). El analizador léxico no produce
+# identificadores con '%', así que ninguna variable del programa lo tiene
+TEMP_PREFIX = '%t'
+
+# Operadores cuyo resultado no depende del orden de los operandos
+COMMUTATIVE_OPS = {'+', '*', '==', '!=', 'f+', 'f*'}
+
+
 class IntermediateCodeGenerator:
     """
     Generador de código intermedio (cuádruplas) a partir de un árbol de sintaxis abstracta (AST).
-    Traduce instrucciones en forma de tuplas AST a una secuencia de cuádruplas para facilitar
+    Traduce los nodos tipados del AST (ast_nodes) a una secuencia de cuádruplas para facilitar
     la generación posterior de código objeto.
+
+    Con cse=True se eliminan subexpresiones comunes por numeración de valores
+    local: dentro de un bloque básico, una operación (op, izq, der) o un literal
+    ya calculado reutiliza su temporal en lugar de generar uno nuevo.
+
+    Con sethi_ullman=True, en cada operación binaria se genera primero el
+    operando que necesita más temporales (etiquetado de Sethi-Ullman), lo que
+    minimiza los temporales vivos a la vez. Las expresiones no tienen efectos
+    secundarios, así que el orden de evaluación no cambia el resultado; los
+    operandos conservan su posición en la cuádrupla.
     """
 
-    def __init__(self):
-        self.temp_counter = 0       # Contador para temporales (t1, t2, ...)
+    def __init__(self, cse=False, sethi_ullman=False):
+        self.temp_counter = 0       # Contador para temporales (%t1, %t2, ...)
         self.label_counter = 0      # Contador para etiquetas (L1, L2, ...)
         self.code = []              # Lista de cuádruplas generadas
+        self.cse = cse
+        self.values = {}            # Clave de la expresión → temporal que la contiene
+        self.dependents = {}        # Variable → claves de expresiones que la leen
+        self.cse_hits = 0           # Expresiones reutilizadas
+        self.sethi_ullman = sethi_ullman
+        self.labels = {}            # id(nodo) → temporales que necesita (etiqueta de Sethi-Ullman)
 
     def new_temp(self):
         """
         Genera un nuevo nombre de variable temporal.
         """
         self.temp_counter += 1
-        return f"t{self.temp_counter}"
+        return f"{TEMP_PREFIX}{self.temp_counter}"
 
     def new_label(self):
         """
@@ -29,57 +55,184 @@ class IntermediateCodeGenerator:
         Genera cuádruplas a partir de una lista de nodos del AST.
 
         Parámetro:
-        - ast: lista de tuplas que representan instrucciones del árbol de sintaxis.
+        - ast: lista de nodos (ast_nodes) que representan instrucciones del árbol de sintaxis.
 
         Retorna:
         - Lista de cuádruplas generadas.
         """
         self.code = []  # Reinicia el código generado
+        self.forget_values()
         for stmt in ast:
             self._generate_stmt(stmt)
+        self.labels.clear()
+        return self.code
+
+    def generate_statement(self, stmt):
+        """
+        Genera las cuádruplas de una sola sentencia de nivel superior.
+        Los contadores de temporales y etiquetas se conservan entre llamadas,
+        por lo que los nombres siguen siendo únicos en todo el programa. Con
+        cse=True solo se reutilizan expresiones de la misma sentencia: las
+        cuádruplas de cada sentencia se optimizan por separado, así que ningún
+        temporal debe leerse fuera de la sentencia que lo define.
+
+        Retorna:
+        - Lista de cuádruplas de la sentencia.
+        """
+        self.code = []
+        self.forget_values()
+        self._generate_stmt(stmt)
+        self.labels.clear()  # Las etiquetas se indexan por id() y los nodos no sobreviven a la sentencia
         return self.code
 
+    # ========================
+    # Numeración de valores
+    # ========================
+
+    def forget_values(self):
+        """Olvida las expresiones disponibles (al cambiar de bloque básico)."""
+        self.values.clear()
+        self.dependents.clear()
+
+    def invalidate(self, name):
+        """Olvida las expresiones que leen la variable `name`, porque acaba de cambiar."""
+        for key in self.dependents.pop(name, ()):
+            self.values.pop(key, None)
+
+    def _value_key(self, op, left, right):
+        if op in COMMUTATIVE_OPS and right < left:
+            left, right = right, left
+        return (op, left, right)
+
+    def _remember(self, key, temp, operands=()):
+        self.values[key] = temp
+        for operand in operands:
+            self.dependents.setdefault(operand, []).append(key)
+
     def _generate_stmt(self, node):
         """
         Genera cuádruplas para una instrucción individual (declaración, asignación, if...).
+        Los bloques no se recorren con recursión: el generador de un if emite la
+        condición y retorna el cuerpo y su etiqueta de salida; los cuerpos abiertos
+        se apilan y, al agotar uno, se emite su etiqueta.
         """
-        kind = node[0]
+        blocks = []  # Pila de (iterador sobre el cuerpo, etiqueta de salida)
+        while True:
+            generator = self._STMT_GENERATORS.get(type(node))
+            if generator is None:
+                raise ValueError(f"Sentencia no válida: {node}")
+            block = generator(self, node)
+            if block is not None:
+                body, end_label = block
+                blocks.append((iter(body), end_label))
+            node = None
+            while blocks:
+                node = next(blocks[-1][0], None)
+                if node is not None:
+                    break
+                self._end_if(blocks.pop()[1])
+            if node is None:
+                return
 
+    def _generate_declaration(self, node):
         # Declaración de variable con valor inicial (int x = expr;)
-        if kind == "DECLARATION":
-            if len(node) == 3:
-                # Declaración sin inicialización (e.g., int x;)
-                return
-            _, _, name, expr = node
-            result = self._generate_expr(expr)
-            self.code.append((name, '=', result, ''))
+        if node.value is None:
+            # Declaración sin inicialización (e.g., int x;)
+            return
+        result = self._generate_expr(node.value)
+        self.code.append((node.name, '=', result, ''))
+        if self.cse:
+            self.invalidate(node.name)
 
+    def _generate_assignment(self, node):
         # Asignación simple (x = expr;)
-        elif kind == "ASSIGNMENT":
-            _, name, expr = node
-            result = self._generate_expr(expr)
-            self.code.append((name, '=', result, ''))
+        result = self._generate_expr(node.value)
+        self.code.append((node.name, '=', result, ''))
+        if self.cse:
+            self.invalidate(node.name)
 
+    def _generate_if(self, node):
         # Condicional (if (cond) { ... })
-        elif kind == "IF":
-            _, cond_expr, block = node
-            cond_result = self._generate_expr(cond_expr)
-            false_label = self.new_label()
-            self.code.append(('GOTOF', cond_result, false_label, ''))
+        cond_result = self._generate_expr(node.condition)
+        false_label = self.new_label()
+        self.code.append(('GOTOF', cond_result, false_label, ''))
+        if self.cse:
+            self.forget_values()
+
+        # _generate_stmt genera el bloque dentro del if y después llama a _end_if
+        return node.body, false_label
 
-            # Genera cuádruplas para el bloque dentro del if
-            for stmt in block:
-                self._generate_stmt(stmt)
+    def _end_if(self, false_label):
+        # Fin del bloque de un if: la etiqueta a la que salta la condición falsa
+        self.code.append(('LABEL', false_label, '', ''))
+        if self.cse:
+            self.forget_values()
 
-            self.code.append(('LABEL', false_label, '', ''))
+    # Tabla de despacho: clase del nodo → método que genera sus cuádruplas
+    _STMT_GENERATORS = {
+        Declaration: _generate_declaration,
+        Assignment: _generate_assignment,
+        If: _generate_if,
+    }
+
+    def need(self, expr):
+        """
+        Etiqueta de Sethi-Ullman: número máximo de temporales vivos a la vez al
+        evaluar `expr`, incluido el que guarda su resultado.
+
+        - Una variable no ocupa temporales (se usa directamente como operando).
+        - Un literal ocupa uno (t = literal).
+        - En una operación, el operando que se evalúa primero mantiene su
+          resultado vivo mientras se evalúa el segundo, por lo que conviene
+          empezar por el que necesita más.
+
+        Las operaciones se etiquetan de abajo arriba con una pila explícita; al
+        etiquetar una, sus operandos ya tienen etiqueta y need() no recurre.
+        """
+        kind = type(expr)
+        if kind is Name:
+            return 0
+        if kind is Literal:
+            return 1
+        labels = self.labels
+        label = labels.get(id(expr))
+        if label is not None:
+            return label
+        stack = [expr]
+        while stack:
+            node = stack[-1]
+            left = _LEAF_NEED.get(type(node.left))
+            if left is None:
+                left = labels.get(id(node.left))
+                if left is None:
+                    stack.append(node.left)  # Se etiqueta antes y se vuelve a este nodo
+                    continue
+            right = _LEAF_NEED.get(type(node.right))
+            if right is None:
+                right = labels.get(id(node.right))
+                if right is None:
+                    stack.append(node.right)
+                    continue
+            stack.pop()
+            first, second = max(left, right), min(left, right)
+            held = 1 if first else 0  # El primer operando, si no es variable, sigue vivo
+            labels[id(node)] = max(first, held + second, 1)
+        return labels[id(expr)]
+
+    def _right_first(self, node):
+        """
+        Con Sethi-Ullman, verdadero si el operando derecho de `node` necesita más
+        temporales y debe generarse primero (need ya etiquetó la expresión).
+        """
+        labels = self.labels
+        right = labels.get(id(node.right)) or _LEAF_NEED[type(node.right)]
+        return right > (labels.get(id(node.left)) or _LEAF_NEED[type(node.left)])
 
     def is_literal(self, expr):
         """
         Determina si una expresión es un literal (int, float, string o char).
         """
-        return isinstance(expr, (int, float)) or (
-            isinstance(expr, str) and (expr.startswith('"') or expr.startswith("'"))
-        )
+        return type(expr) is Literal
 
     def _generate_expr(self, expr):
         """
@@ -87,28 +240,100 @@ class IntermediateCodeGenerator:
         Devuelve el nombre del temporal donde se almacena el resultado.
 
         Ejemplos:
-        - 5        → genera t1 = 5
-        - ('+', 'a', 3) → genera t2 = a + 3
+        - Literal(5)        → genera t1 = 5
+        - BinaryOp('+', Name('a'), Literal(3)) → genera t1 = 3, t2 = a + t1
+
+        Las operaciones se generan en postorden con una pila explícita, así que
+        la profundidad de la expresión no está limitada por la pila de Python.
         """
-        # Literal (constante numérica o string/char)
-        if self.is_literal(expr):
-            temp = self.new_temp()
-            self.code.append((temp, '=', expr, ''))
-            return temp
+        if type(expr) is not BinaryOp:
+            return self._generate_leaf(expr)
+        sethi_ullman = self.sethi_ullman
+        if sethi_ullman:
+            self.need(expr)  # Etiqueta de una vez todas las operaciones de la expresión
+        results = []        # Nombres de las subexpresiones ya generadas, en orden de generación
+        stack = [expr]      # Nodos por generar; tras una operación expandida va una marca de combinación
+        push, pop = stack.append, stack.pop
+        while stack:
+            node = pop()
+            kind = type(node)
+            if kind is Name:
+                results.append(node.id)
+            elif kind is BinaryOp:
+                # Con Sethi-Ullman se genera primero el operando que necesita más temporales
+                if sethi_ullman and self._right_first(node):
+                    stack += (node, _SWAPPED_DONE, node.left)
+                    first = node.right
+                else:
+                    stack += (node, _OPERANDS_DONE, node.right)
+                    first = node.left
+                # El primer operando se genera a continuación; una variable no necesita pasar por la pila
+                if type(first) is Name:
+                    results.append(first.id)
+                else:
+                    push(first)
+            elif node is _OPERANDS_DONE:
+                right = results.pop()
+                results[-1] = self._generate_binary_op(pop(), results[-1], right)
+            elif node is _SWAPPED_DONE:
+                left = results.pop()
+                results[-1] = self._generate_binary_op(pop(), left, results[-1])
+            else:
+                results.append(self._generate_leaf(node))
+        return results[0]
+
+    def _generate_leaf(self, expr):
+        """Literal o variable: retorna el temporal con el literal o el nombre de la variable."""
+        kind = type(expr)
 
-        # Expresión binaria: operador y dos operandos
-        elif isinstance(expr, tuple):
-            op = expr[0]
-            left = self._generate_expr(expr[1])
-            right = self._generate_expr(expr[2])
+        # Literal (constante numérica o string/char)
+        if kind is Literal:
+            if self.cse:
+                # El tipo forma parte de la clave: 1 y 1.0 son literales distintos
+                key = ('=', type(expr.value), expr.value)
+                temp = self.values.get(key)
+                if temp is not None:
+                    self.cse_hits += 1
+                    return temp
             temp = self.new_temp()
-            self.code.append((temp, op, left, right))
+            self.code.append((temp, '=', expr.value, ''))
+            if self.cse:
+                self._remember(key, temp)
             return temp
 
         # Variable o identificador
-        elif isinstance(expr, str):
-            return expr
+        elif kind is Name:
+            return expr.id
 
         # Cualquier otra estructura no válida
         else:
             raise ValueError(f"Expresión no válida: {expr}")
+
+    def _generate_binary_op(self, expr, left, right, op=None):
+        """
+        Operación cuyos operandos ya están en `left` y `right`: retorna su temporal.
+        `op` reemplaza al operador del nodo (por ejemplo, con su versión tipada).
+        """
+        op = op or expr.op
+        if self.cse:
+            key = self._value_key(op, left, right)
+            temp = self.values.get(key)
+            if temp is not None:
+                self.cse_hits += 1
+                return temp
+        temp = self.new_temp()
+        self.code.append((temp, op, left, right))
+        if self.cse:
+            # Solo las variables pueden cambiar; los temporales se asignan una sola vez
+            self._remember(key, temp, [operand.id for operand in (expr.left, expr.right)
+                                       if type(operand) is Name])
+        return temp
+
+
+# Etiqueta de Sethi-Ullman de las hojas (ver need)
+_LEAF_NEED = {Name: 0, Literal: 1}
+
+# Marcas en la pila de _generate_expr: los operandos de la operación de debajo ya
+# están generados, en orden (izquierdo, derecho) o invertido por Sethi-Ullman
+_OPERANDS_DONE = object()
+_SWAPPED_DONE = object()
@@ -1,12 +1,14 @@
 import re  # Importamos la librería de expresiones regulares para facilitar la búsqueda de patrones en el código fuente
+import codecs  # Decodificación incremental de UTF-8 para la lectura por bloques
+import mmap  # Lectura de archivos mapeados en memoria
 
 # Palabras clave
 keywords = {'if', 'else', 'while', 'return', 'for', 'int', 'float', 'bool', 'true', 'false'}
 
 # Definición de tokens con expresiones regulares
 token_definitions = [
-    ('STRING', r'"([^"\\]|\\.)*"'),  # Cadenas entre comillas dobles
-    ('CHAR', r"'([^'\\]|\\.)'"),  # Caracteres entre comillas simples (y permitiendo escape)
+    ('STRING', r'"(?:[^"\\]|\\.)*"'),  # Cadenas entre comillas dobles
+    ('CHAR', r"'(?:[^'\\]|\\.)'"),  # Caracteres entre comillas simples (y permitiendo escape)
     ('EQUALS', r'=='),  # Comparación de igualdad
     ('NOTEQUAL', r'!='),  # Comparación de desigualdad
     ('LESSEQUAL', r'<='),  # Comparación menor o igual
@@ -25,56 +27,169 @@ token_definitions = [
     ('WHITESPACE', r'\s+'),  # Espacios en blanco
 ]
 
-# Compilamos todas las expresiones regulares para cada tipo de token
-token_regex_compiled = [(ttype, re.compile(pattern)) for ttype, pattern in token_definitions]
+# Expresión regular maestra: todos los patrones en una sola alternancia con grupos con nombre.
+# La alternancia conserva el orden de token_definitions, así que gana el mismo patrón
+# que ganaba en el bucle de intentos uno a uno.
+master_regex = re.compile('|'.join(f'(?P<{ttype}>{pattern})' for ttype, pattern in token_definitions))
 
-def lexer(source_code):
+# Tokens que pueden contener saltos de línea y obligan a recalcular línea y columna
+multiline_tokens = {'WHITESPACE', 'STRING', 'CHAR'}
+
+# Tokens que no se entregan al analizador sintáctico
+ignored_tokens = {'WHITESPACE', 'COMMENT'}
+
+# Tamaño (en caracteres o bytes) de cada bloque leído en el modo por flujo
+CHUNK_SIZE = 1 << 16
+
+# Caracteres que deben quedar en el búfer después de una coincidencia para aceptarla
+# sin leer más: el patrón que más mira hacia adelante es NUMBER, que ante "12." necesita
+# ver el carácter siguiente al punto para decidir entre "12.5" y "12".
+MAX_LOOKAHEAD = 2
+
+# Caracteres desde la posición actual que bastan para decidir que ningún token empieza
+# ahí: el patrón acotado más largo es CHAR con escape ('\n', cuatro caracteres). Solo
+# una cadena, que empieza con comillas dobles, puede necesitar más texto para decidir.
+MAX_TOKEN_PREFIX = 4
+
+def scan(source_code):
     """
-    Función principal que convierte el código fuente en una lista de tokens.
-    La función recorre el código, encuentra coincidencias con las expresiones regulares definidas 
-    y las convierte en tokens. También maneja la información de las líneas y columnas.
+    Recorrido común del analizador léxico sobre un texto completo (lo usan `lexer`
+    y tokenstore.TokenStore). Genera (tipo, inicio, fin, línea, columna) por cada
+    token que se entrega al parser: los identificadores que son palabras clave ya
+    vienen como 'KEYWORD' y los espacios y comentarios se omiten.
+
+    Recorre el código con una única expresión regular maestra (un solo intento por posición)
+    y lleva la línea y la columna mediante desplazamientos: la columna se calcula como la
+    distancia al inicio de la línea actual, sin dividir el texto de cada token.
     """
+    match_at = master_regex.match
+    end_of_source = len(source_code)
     position = 0  # Índice actual del código fuente
-    found_tokens = []  # Lista de tokens encontrados
     line = 1  # Número de la línea actual
-    col = 1  # Columna actual
+    line_start = 0  # Índice donde comienza la línea actual
 
     # Mientras no lleguemos al final del código
-    while position < len(source_code):
-        match = None  # Variable para almacenar la coincidencia con el patrón
-
-        # Intentamos hacer coincidir cada uno de los patrones definidos en token_definitions
-        for token_type, regex in token_regex_compiled:
-            match = regex.match(source_code, position)
-            if match:
-                # Si encontramos una coincidencia, obtenemos el valor del token
-                token_value = match.group(0)
-                start_line = line  # Línea en la que comienza el token
-                start_col = col  # Columna en la que comienza el token
-
-                # Actualizamos las líneas y columnas en caso de que el token ocupe varias líneas
-                lines = token_value.split('\n')
-                if len(lines) > 1:
-                    line += len(lines) - 1
-                    col = len(lines[-1]) + 1
-                else:
-                    col += len(token_value)
-
-                # Ignoramos los espacios y los comentarios
-                if token_type not in ('WHITESPACE', 'COMMENT'):
-                    # Si el token es un identificador y se encuentra en las palabras clave, lo cambiamos a 'KEYWORD'
-                    if token_type == 'IDENTIFIER' and token_value in keywords:
-                        token_type = 'KEYWORD'
-                    # Añadimos el token a la lista de tokens encontrados
-                    found_tokens.append((token_type, token_value, start_line, start_col))
-
-                # Avanzamos la posición del código fuente hasta donde termina la coincidencia
-                position = match.end()
-                break  # Salimos del ciclo de intentos de coincidencia, ya que encontramos un token válido
+    while position < end_of_source:
+        match = match_at(source_code, position)
 
         # Si no encontramos ninguna coincidencia, significa que tenemos un error en el código
-        if not match:
+        if match is None:
             char_error = source_code[position]  # Obtenemos el carácter donde ocurrió el error
-            raise SyntaxError(f"Token no reconocido '{char_error}' en línea {line}, columna {col}")  # Lanza un error
+            raise SyntaxError(f"Token no reconocido '{char_error}' en línea {line}, columna {position - line_start + 1}")
+
+        token_type = match.lastgroup
+        end = match.end()
+
+        # Ignoramos los espacios y los comentarios
+        if token_type not in ignored_tokens:
+            # Si el token es un identificador y se encuentra en las palabras clave, lo cambiamos a 'KEYWORD'
+            if token_type == 'IDENTIFIER' and match.group() in keywords:
+                yield ('KEYWORD', position, end, line, position - line_start + 1)
+            else:
+                yield (token_type, position, end, line, position - line_start + 1)
+
+        # Actualizamos la línea en caso de que el token ocupe varias líneas
+        if token_type in multiline_tokens:
+            newlines = source_code.count('\n', position, end)
+            if newlines:
+                line += newlines
+                line_start = source_code.rfind('\n', position, end) + 1
+
+        position = end  # Avanzamos hasta donde termina la coincidencia
+
+def lexer(source_code):
+    """
+    Función principal que convierte el código fuente en una lista de tokens
+    (tipo, valor, línea, columna), a partir del recorrido de `scan`.
+    """
+    return [(token_type, source_code[start:end], line, col)
+            for token_type, start, end, line, col in scan(source_code)]
+
+def lexer_stream(source, chunk_size=CHUNK_SIZE):
+    """
+    Versión por flujo del analizador léxico: genera los mismos tokens que `lexer`
+    pero leyendo el código por bloques desde un objeto con método read(n)
+    (archivo de texto, archivo binario o mmap), sin cargarlo completo en memoria.
 
-    return found_tokens  # Devuelve la lista de tokens encontrados
+    Un token solo se acepta cuando termina al menos MAX_LOOKAHEAD caracteres antes
+    del final del búfer; si no, se lee otro bloque y se vuelve a intentar. Así, los
+    tokens partidos entre bloques (cadenas, comentarios, '<=', '==', números)
+    se reconocen igual que sobre el texto completo. La memoria usada depende del
+    tamaño del bloque y del token más largo, no del tamaño de la entrada.
+
+    Si no hay coincidencia, el error léxico se lanza en cuanto el búfer tiene
+    MAX_TOKEN_PREFIX caracteres desde la posición actual, sin leer el resto del
+    origen (salvo ante unas comillas dobles, que pueden abrir una cadena larga).
+    """
+    match_at = master_regex.match
+    decoder = None  # Decodificador UTF-8 incremental, solo para fuentes binarias
+    buffer = ''  # Texto leído y aún no consumido
+    position = 0  # Índice actual dentro del búfer
+    line = 1  # Número de la línea actual
+    line_start = 0  # Índice (relativo al búfer) donde comienza la línea actual
+    eof = False  # Indica si ya se leyó todo el origen
+
+    while True:
+        match = match_at(buffer, position) if position < len(buffer) else None
+
+        # Si el token podría continuar en el siguiente bloque, leemos más antes de decidir
+        if not eof and (match.end() > len(buffer) - MAX_LOOKAHEAD if match is not None
+                        else len(buffer) - position < MAX_TOKEN_PREFIX or buffer[position] == '"'):
+            data = source.read(chunk_size)
+            if isinstance(data, bytes):
+                if decoder is None:
+                    decoder = codecs.getincrementaldecoder('utf-8')()
+                chunk = decoder.decode(data, final=not data)
+            else:
+                chunk = data
+            eof = not data
+            # Descartamos lo ya consumido para que el búfer no crezca con la entrada
+            buffer = buffer[position:] + chunk
+            line_start -= position
+            position = 0
+            continue
+
+        if position >= len(buffer):
+            return
+
+        # Si no encontramos ninguna coincidencia, significa que tenemos un error en el código
+        if match is None:
+            char_error = buffer[position]
+            raise SyntaxError(f"Token no reconocido '{char_error}' en línea {line}, columna {position - line_start + 1}")
+
+        token_type = match.lastgroup
+        end = match.end()
+
+        if token_type not in ignored_tokens:
+            token_value = match.group()
+            if token_type == 'IDENTIFIER' and token_value in keywords:
+                token_type = 'KEYWORD'
+            yield (token_type, token_value, line, position - line_start + 1)
+
+        if token_type in multiline_tokens:
+            newlines = buffer.count('\n', position, end)
+            if newlines:
+                line += newlines
+                line_start = buffer.rfind('\n', position, end) + 1
+
+        position = end
+
+
+def lexer_file(path, chunk_size=CHUNK_SIZE):
+    """
+    Genera los tokens de un archivo mapeándolo en memoria (mmap) y leyéndolo por
+    bloques con `lexer_stream`. El sistema operativo carga las páginas bajo demanda,
+    por lo que el archivo nunca se copia completo a la memoria del proceso.
+    """
+    with open(path, 'rb') as f:
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Un archivo vacío no se puede mapear; se lee directamente
+            yield from lexer_stream(f, chunk_size)
+            return
+        # El mapa se cierra también si el generador se abandona antes del final
+        try:
+            yield from lexer_stream(mapped, chunk_size)
+        finally:
+            mapped.close()
@@ -2,11 +2,20 @@ class ObjectCodeGenerator:
     """
     Generador de código objeto a partir de cuádruplas intermedias.
     Traduce instrucciones intermedias a una representación tipo ensamblador simple.
+
+    Con track_accumulator=True el generador recuerda qué valores contiene el
+    acumulador (el último LOAD y los STORE posteriores) y omite los LOAD
+    redundantes. Ese conocimiento se descarta en cada LABEL, porque se puede
+    llegar a ella desde otro salto, y tras cada JUMP.
     """
 
-    def __init__(self):
+    def __init__(self, track_accumulator=False):
         # Lista de instrucciones generadas en formato de pseudocódigo ensamblador
         self.instructions = []
+        self.track_accumulator = track_accumulator
+        # Operandos (tal como se escriben en las instrucciones) cuyo valor está en el acumulador
+        self.accumulator = set()
+        self.loads_skipped = 0  # LOAD omitidos por estar ya el valor en el acumulador
 
     def generate(self, quads):
         """
@@ -19,6 +28,8 @@ class ObjectCodeGenerator:
         - Lista de instrucciones tipo ensamblador.
         """
         self.instructions = []  # Reinicia para permitir reutilización
+        self.accumulator = set()
+        self.loads_skipped = 0
 
         for quad in quads:
             op = quad[1] if len(quad) > 1 else None  # Extrae el operador
@@ -29,35 +40,43 @@ class ObjectCodeGenerator:
                 label = quad[2]
                 self._emit_load(cond)
                 self._emit(f"JUMP_IF_FALSE {label}")
+                # Si no salta, el acumulador conserva la condición: el salto no lo modifica
 
             # Instrucción de salto incondicional
             elif quad[0] == 'GOTO':
                 label = quad[1]
                 self._emit(f"JUMP {label}")
+                self.accumulator = set()
 
             # Marca de etiqueta (LABEL)
             elif quad[0] == 'LABEL':
                 label = quad[1]
                 self._emit(f"LABEL {label}")
+                self.accumulator = set()
 
             # Asignación directa (a = b)
             elif op == '=':
                 dest, _, src, _ = quad
                 self._emit_load(src)
-                self._emit(f"STORE {dest}")
+                self._emit_store(dest)
 
-            # Operaciones aritméticas binarias: +, -, *, /
-            elif op in {'+', '-', '*', '/'}:
+            # Operaciones aritméticas binarias: +, -, *, / (y f+, f-, f*, f/ entre float)
+            elif op in {'+', '-', '*', '/', 'f+', 'f-', 'f*', 'f/'}:
                 dest, _, left, right = quad
                 self._emit_load(left)
                 mnemonic = {
                     '+': 'ADD',
                     '-': 'SUB',
                     '*': 'MUL',
-                    '/': 'DIV'
+                    '/': 'DIV',
+                    'f+': 'FADD',
+                    'f-': 'FSUB',
+                    'f*': 'FMUL',
+                    'f/': 'FDIV'
                 }[op]
                 self._emit(f"{mnemonic} {right}")
-                self._emit(f"STORE {dest}")
+                self.accumulator = set()
+                self._emit_store(dest)
 
             # Operaciones relacionales: <, >, ==, !=
             elif op in {'<', '>', '==', '!='}:
@@ -70,7 +89,15 @@ class ObjectCodeGenerator:
                     '!=': 'CMP_NE'
                 }[op]
                 self._emit(f"{cmp_op} {right}")
-                self._emit(f"STORE {dest}")
+                self.accumulator = set()
+                self._emit_store(dest)
+
+            # Conversión int → float (t = itof a): el acumulador recibe a convertido
+            elif op == 'itof':
+                dest, _, src, _ = quad
+                self._emit(f"ITOF {src}")
+                self.accumulator = set()
+                self._emit_store(dest)
 
             # Si ninguna de las anteriores coincide, es un error
             else:
@@ -86,6 +113,19 @@ class ObjectCodeGenerator:
 
     def _emit_load(self, value):
         """
-        Genera la instrucción LOAD para cargar un valor o variable.
+        Genera la instrucción LOAD para cargar un valor o variable, salvo que
+        el acumulador ya lo contenga (con track_accumulator).
+        """
+        operand = str(value)  # 5 y 5.0 son cargas distintas
+        if self.track_accumulator and operand in self.accumulator:
+            self.loads_skipped += 1
+            return
+        self._emit(f"LOAD {operand}")
+        self.accumulator = {operand}
+
+    def _emit_store(self, dest):
+        """
+        Genera la instrucción STORE; tras ella, `dest` contiene el valor del acumulador.
         """
-        self._emit(f"LOAD {value}")
+        self._emit(f"STORE {dest}")
+        self.accumulator.add(dest)
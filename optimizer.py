@@ -0,0 +1,512 @@
+"""
+Archivo: optimizer.py
+
+Optimizaciones sobre el código intermedio (cuádruplas).
+
+Las cuádruplas tienen las formas que produce IntermediateCodeGenerator:
+- (dest, '=', src, '')        asignación / copia
+- (dest, op, izq, der)        operación binaria (+ - * / < > == !=)
+- (dest, 'itof', src, '')     conversión int → float
+- ('GOTOF', cond, etiqueta, '') salto si falso
+- ('GOTO', etiqueta, '', '')  salto incondicional
+- ('LABEL', etiqueta, '', '') etiqueta
+
+Con --tipado (typedcode.py), las operaciones aritméticas entre float usan
+f+ f- f* f/ y los ensanchamientos int → float son cuádruplas 'itof'; sin
+prefijo, la división entre enteros trunca.
+
+Los temporales (%t1, %t2, ...) se asignan una sola vez y solo los usa el propio
+generador, lo que permite propagarlos y eliminarlos sin afectar a las variables
+del programa: su prefijo (intermediate.TEMP_PREFIX) no puede aparecer en un
+identificador.
+"""
+
+import heapq
+from functools import partial
+
+from cfg import build_cfg
+from intermediate import TEMP_PREFIX
+
+ARITHMETIC_OPS = {'+', '-', '*', '/'}
+COMPARISON_OPS = {'<', '>', '==', '!='}
+FLOAT_OPS = {'f+', 'f-', 'f*', 'f/'}
+BINARY_OPS = ARITHMETIC_OPS | COMPARISON_OPS | FLOAT_OPS
+CONTROL_OPS = {'GOTOF', 'GOTO', 'LABEL'}
+
+
+# ========================
+# Clasificación de operandos
+# ========================
+
+def is_temp(operand):
+    """Verifica si un operando es un temporal generado (%t1, %t2, ...)."""
+    return isinstance(operand, str) and operand.startswith(TEMP_PREFIX)
+
+def is_constant(operand):
+    """Verifica si un operando es un literal (número, cadena o carácter)."""
+    if isinstance(operand, (int, float)) and not isinstance(operand, bool):
+        return True
+    return isinstance(operand, str) and operand[:1] in ('"', "'")
+
+def is_number(operand):
+    return isinstance(operand, (int, float)) and not isinstance(operand, bool)
+
+def quad_uses(quad):
+    """Retorna los operandos que lee una cuádrupla (variables, temporales o literales)."""
+    head, op = quad[0], quad[1]
+    if head == 'GOTOF':
+        return (op,)
+    if head in ('GOTO', 'LABEL'):
+        return ()
+    if op == '=' or op == 'itof':
+        return (quad[2],)
+    return (quad[2], quad[3])
+
+def quad_def(quad):
+    """Retorna el nombre que escribe una cuádrupla, o None si no escribe ninguno."""
+    return None if quad[0] in CONTROL_OPS else quad[0]
+
+
+# ========================
+# Evaluación de constantes
+# ========================
+
+def fold_binary(op, left, right):
+    """
+    Evalúa una operación entre dos literales con la semántica del lenguaje:
+    la división entre enteros trunca hacia cero y las comparaciones producen 1 o 0.
+
+    Retorna el valor resultante, o None si la operación no se puede plegar
+    (operandos no numéricos, división por cero...).
+    """
+    if op in FLOAT_OPS:
+        if not (is_number(left) and is_number(right)):
+            return None
+        return fold_binary(op[1:], float(left), float(right))
+    if op in COMPARISON_OPS:
+        if is_number(left) and is_number(right):
+            pass
+        elif op in ('==', '!=') and isinstance(left, str) and isinstance(right, str):
+            pass
+        else:
+            return None
+        if op == '<':
+            return int(left < right)
+        if op == '>':
+            return int(left > right)
+        if op == '==':
+            return int(left == right)
+        return int(left != right)
+
+    if not (is_number(left) and is_number(right)):
+        return None
+    if op == '+':
+        return left + right
+    if op == '-':
+        return left - right
+    if op == '*':
+        return left * right
+    if op == '/':
+        if right == 0:
+            return None
+        if isinstance(left, int) and isinstance(right, int):
+            quotient = abs(left) // abs(right)
+            return quotient if (left < 0) == (right < 0) else -quotient
+        return left / right
+    return None
+
+def simplify_identity(op, left, right):
+    """
+    Aplica identidades algebraicas con un operando literal.
+
+    Retorna ('copy', operando) si la operación equivale a una copia (x+0, x*1...),
+    ('const', valor) si equivale a un literal (x*0), o None si no hay identidad.
+
+    Fuera de las operaciones f+ f- f* f/, las copias solo se aplican con un
+    literal entero: una variable float puede contener un entero (float c = 7;)
+    y x * 1.0 la convierte a float, cosa que la copia no haría.
+    """
+    if op in FLOAT_OPS:
+        result = simplify_identity(op[1:], _as_int(left), _as_int(right))
+        return ('const', float(result[1])) if result and result[0] == 'const' else result
+    if op == '+':
+        if right == 0 and type(right) is int:
+            return ('copy', left)
+        if left == 0 and type(left) is int:
+            return ('copy', right)
+    elif op == '-':
+        if right == 0 and type(right) is int:
+            return ('copy', left)
+    elif op == '*':
+        # El cero conserva el tipo del literal: x * 0.0 → 0.0
+        if right == 0 and is_number(right):
+            return ('const', right * 0)
+        if left == 0 and is_number(left):
+            return ('const', left * 0)
+        if right == 1 and type(right) is int:
+            return ('copy', left)
+        if left == 1 and type(left) is int:
+            return ('copy', right)
+    elif op == '/':
+        if right == 1 and type(right) is int:
+            return ('copy', left)
+    return None
+
+def _as_int(operand):
+    """Un literal float entero como int (1.0 → 1); en f+ f- f* f/ ambos operandos ya son float."""
+    return int(operand) if type(operand) is float and operand.is_integer() else operand
+
+
+# ========================
+# Pases de optimización
+# ========================
+
+def fold_constants(quads):
+    """
+    Plegado y propagación de constantes.
+
+    - Los temporales que reciben un literal (t1 = 2) se eliminan y su valor se
+      sustituye en sus usos.
+    - Las operaciones entre literales se calculan (t3 = 2 + 3 → 5) y las
+      comparaciones entre literales producen 1 o 0.
+    - Se simplifican identidades: x+0, 0+x, x-0, x*1, 1*x, x/1 → x; x*0, 0*x → 0
+      (ver simplify_identity).
+    - Las conversiones itof de un literal se pliegan (itof 2 → 2.0).
+    """
+    constants = {}  # temporal → literal que contiene
+    aliases = {}    # temporal → temporal equivalente (por identidades)
+    optimized = []
+
+    def value(operand):
+        if is_temp(operand):
+            operand = aliases.get(operand, operand)
+            return constants.get(operand, operand)
+        return operand
+
+    for quad in quads:
+        head, op = quad[0], quad[1]
+
+        if head == 'GOTOF':
+            optimized.append(('GOTOF', value(op), quad[2], quad[3]))
+            continue
+        if head in ('GOTO', 'LABEL'):
+            optimized.append(quad)
+            continue
+
+        dest = head
+        if op == '=':
+            result = ('const', value(quad[2])) if is_constant(value(quad[2])) else ('copy', value(quad[2]))
+        elif op == 'itof':
+            source = value(quad[2])
+            result = ('const', float(source)) if is_number(source) else ('op', source, '')
+        else:
+            left, right = value(quad[2]), value(quad[3])
+            folded = fold_binary(op, left, right) if is_constant(left) and is_constant(right) else None
+            if folded is not None:
+                result = ('const', folded)
+            else:
+                result = simplify_identity(op, left, right) or ('op', left, right)
+
+        kind = result[0]
+        if kind == 'copy' and is_constant(result[1]):
+            kind = 'const'
+        if is_temp(dest) and kind == 'const':
+            constants[dest] = result[1]
+        elif is_temp(dest) and kind == 'copy' and is_temp(result[1]):
+            aliases[dest] = result[1]
+        elif kind == 'op':
+            optimized.append((dest, op, result[1], result[2]))
+        else:
+            optimized.append((dest, '=', result[1], ''))
+
+    return optimized
+
+def coalesce_copies(quads):
+    """
+    Fusiona un temporal con la copia que lo sigue: t5 = a + b; x = t5  →  x = a + b,
+    siempre que el temporal no se use en ninguna otra cuádrupla.
+    """
+    uses = {}
+    for quad in quads:
+        for operand in quad_uses(quad):
+            if is_temp(operand):
+                uses[operand] = uses.get(operand, 0) + 1
+
+    optimized = []
+    for quad in quads:
+        if (quad[1] == '=' and quad[0] not in CONTROL_OPS and is_temp(quad[2])
+                and uses.get(quad[2]) == 1 and optimized and optimized[-1][0] == quad[2]):
+            previous = optimized.pop()
+            optimized.append((quad[0],) + previous[1:])
+            continue
+        optimized.append(quad)
+    return optimized
+
+
+# ========================
+# Eliminación de código muerto
+# ========================
+
+def fold_branches(quads):
+    """
+    Resuelve los saltos condicionales con condición literal:
+    GOTOF 0 → GOTO (el bloque del if nunca se ejecuta) y GOTOF distinto de 0 se elimina.
+    """
+    optimized = []
+    for quad in quads:
+        if quad[0] == 'GOTOF' and is_number(quad[1]):
+            if quad[1] == 0:
+                optimized.append(('GOTO', quad[2], '', ''))
+            continue
+        optimized.append(quad)
+    return optimized
+
+def remove_unreachable(quads):
+    """
+    Elimina los bloques básicos a los que no se llega desde la entrada (por
+    ejemplo, el cuerpo de un if cuya condición es falsa tras fold_branches),
+    los GOTO a la etiqueta que los sigue y las etiquetas a las que nadie salta.
+    """
+    quads = build_cfg(quads).linearize(only_reachable=True)
+
+    optimized = []
+    for i, quad in enumerate(quads):
+        if quad[0] == 'GOTO' and i + 1 < len(quads) and quads[i + 1] == ('LABEL', quad[1], '', ''):
+            continue
+        optimized.append(quad)
+
+    targets = {quad[2] if quad[0] == 'GOTOF' else quad[1] for quad in optimized if quad[0] in ('GOTO', 'GOTOF')}
+    return [quad for quad in optimized if quad[0] != 'LABEL' or quad[1] in targets]
+
+def remove_dead_stores(quads, read_variables=None):
+    """
+    Elimina las cuádruplas cuyo resultado no está vivo después de ellas (ver
+    liveness): temporales sin usos y asignaciones a variables que se
+    sobrescriben antes de leerse (x = 1; x = 2 → x = 2).
+
+    Al terminar el programa se consideran vivas las variables de
+    `read_variables` (SemanticAnalyzer.read_variables), de modo que también
+    se eliminan las asignaciones a las variables que el programa nunca lee; sin
+    ese conjunto, todas las variables. Se repite hasta que no quedan cuádruplas
+    muertas, porque quitar una puede dejar muertos los valores que la
+    alimentaban en otros bloques.
+    """
+    while True:
+        if read_variables is None:
+            live_at_exit = {dest for dest in map(quad_def, quads) if dest is not None and not is_temp(dest)}
+        else:
+            live_at_exit = read_variables
+        graph = build_cfg(quads)
+        _, live_out = liveness(graph, live_at_exit)
+
+        optimized = []
+        for block in graph.blocks:
+            # Recorrido hacia atrás del bloque con el conjunto de nombres vivos
+            live = set(live_out[block.index])
+            kept = []
+            for quad in reversed(block.quads):
+                dest = quad_def(quad)
+                if dest is not None:
+                    if dest not in live:
+                        continue
+                    live.discard(dest)
+                for operand in quad_uses(quad):
+                    if isinstance(operand, str) and not is_constant(operand):
+                        live.add(operand)
+                kept.append(quad)
+            kept.reverse()
+            optimized.extend(kept)
+        if len(optimized) == len(quads):
+            return optimized
+        quads = optimized
+
+def eliminate_dead_code(quads, read_variables=None):
+    """
+    Eliminación de código muerto: saltos con condición literal, bloques
+    inalcanzables y asignaciones cuyo valor no se lee antes de sobrescribirse.
+    """
+    return remove_dead_stores(remove_unreachable(fold_branches(quads)), read_variables)
+
+
+# ========================
+# Vida de las variables y reutilización de temporales
+# ========================
+
+def liveness(graph, live_at_exit=()):
+    """
+    Análisis de vida hacia atrás sobre un ControlFlowGraph.
+
+    Retorna (live_in, live_out): para cada bloque (por índice), el conjunto de
+    nombres (variables o temporales) cuyo valor puede leerse más adelante al
+    entrar y al salir del bloque. `live_at_exit` son los nombres que se
+    consideran leídos al terminar el programa (vivos a la salida de los bloques
+    sin sucesores).
+    """
+    uses, defs = [], []
+    for block in graph.blocks:
+        used, defined = set(), set()
+        for quad in block.quads:
+            for operand in quad_uses(quad):
+                if isinstance(operand, str) and not is_constant(operand) and operand not in defined:
+                    used.add(operand)
+            dest = quad_def(quad)
+            if dest is not None:
+                defined.add(dest)
+        uses.append(used)
+        defs.append(defined)
+
+    live_in = [set() for _ in graph.blocks]
+    live_out = [set() for _ in graph.blocks]
+    worklist = list(graph.blocks)
+    pending = set(range(len(graph.blocks)))
+    while worklist:
+        block = worklist.pop()
+        i = block.index
+        pending.discard(i)
+        out = set() if block.succ else set(live_at_exit)
+        for successor in block.succ:
+            out |= live_in[successor.index]
+        live_out[i] = out
+        new_in = uses[i] | (out - defs[i])
+        if new_in != live_in[i]:
+            live_in[i] = new_in
+            for predecessor in block.pred:
+                if predecessor.index not in pending:
+                    pending.add(predecessor.index)
+                    worklist.append(predecessor)
+    return live_in, live_out
+
+def temp_intervals(quads):
+    """
+    Intervalo de vida de cada temporal en el orden lineal de las cuádruplas:
+    temporal → [primera posición, última posición] en que está vivo.
+
+    Si un temporal está vivo a la entrada o salida de un bloque, el intervalo
+    se extiende hasta el principio o el final de ese bloque.
+    """
+    graph = build_cfg(quads)
+    live_in, live_out = liveness(graph)
+    intervals = {}
+
+    def extend(temp, position):
+        interval = intervals.get(temp)
+        if interval is None:
+            intervals[temp] = [position, position]
+        elif position < interval[0]:
+            interval[0] = position
+        elif position > interval[1]:
+            interval[1] = position
+
+    position = 0
+    for block in graph.blocks:
+        start = position
+        for quad in block.quads:
+            for operand in quad_uses(quad):
+                if is_temp(operand):
+                    extend(operand, position)
+            dest = quad_def(quad)
+            if is_temp(dest):
+                extend(dest, position)
+            position += 1
+        for temp in live_in[block.index]:
+            if is_temp(temp):
+                extend(temp, start)
+        for temp in live_out[block.index]:
+            if is_temp(temp):
+                extend(temp, position - 1)
+    return intervals
+
+def count_temps(quads):
+    """Número de temporales distintos que aparecen en las cuádruplas."""
+    temps = set()
+    for quad in quads:
+        for operand in quad:
+            if is_temp(operand):
+                temps.add(operand)
+    return len(temps)
+
+def reuse_temps(quads):
+    """
+    Renombra los temporales para reutilizar los que ya no están vivos, de modo
+    que el número de temporales distintos sea el máximo de valores vivos a la vez.
+
+    Asignación por barrido lineal sobre los intervalos de temp_intervals: cada
+    temporal recibe el menor nombre libre (%t1, %t2, ...). Un temporal puede
+    recibir el nombre de otro cuyo último uso es la misma cuádrupla que lo
+    define (t1 = t1 + t2), porque los operandos se leen antes de escribir.
+
+    Tras este pase los temporales dejan de asignarse una sola vez, por lo que
+    debe ir después de los pases que suponen lo contrario.
+    """
+    intervals = temp_intervals(quads)
+    if not intervals:
+        return list(quads)
+
+    renaming = {}
+    free = []      # Montículo con los números de temporal libres
+    active = []    # Montículo de (fin del intervalo, número asignado)
+    next_number = 1
+    for temp, (start, end) in sorted(intervals.items(), key=lambda item: item[1][0]):
+        while active and active[0][0] <= start:
+            heapq.heappush(free, heapq.heappop(active)[1])
+        if free:
+            number = heapq.heappop(free)
+        else:
+            number = next_number
+            next_number += 1
+        renaming[temp] = f"{TEMP_PREFIX}{number}"
+        heapq.heappush(active, (end, number))
+
+    return [tuple(renaming.get(operand, operand) if is_temp(operand) else operand for operand in quad)
+            for quad in quads]
+
+
+def default_passes(read_variables=None):
+    """
+    Pases aplicados con -O, en orden. Si se pasa el conjunto de variables
+    leídas por el programa, también se eliminan las asignaciones a las demás.
+    """
+    return (
+        ('plegado de constantes', fold_constants),
+        ('código muerto', partial(eliminate_dead_code, read_variables=read_variables)),
+        ('fusión de copias', coalesce_copies),
+        ('reutilización de temporales', reuse_temps),  # Último: rompe la asignación única
+    )
+
+DEFAULT_PASSES = default_passes()
+
+
+class QuadOptimizer:
+    """
+    Aplica una secuencia de pases sobre las cuádruplas y registra cuántas
+    cuádruplas quedan después de cada uno.
+    """
+
+    def __init__(self, passes=DEFAULT_PASSES):
+        self.passes = passes
+        self.stats = []  # Lista de (pase, cuádruplas antes, cuádruplas después)
+        self.temps = None  # (temporales antes, temporales después)
+
+    def optimize(self, quads):
+        """Retorna una nueva lista de cuádruplas optimizada."""
+        self.stats = []
+        temps_before = count_temps(quads)
+        for name, optimization in self.passes:
+            before = len(quads)
+            quads = optimization(quads)
+            self.stats.append((name, before, len(quads)))
+        self.temps = (temps_before, count_temps(quads))
+        return quads
+
+    def summary(self):
+        """Texto con la reducción total y la de cada pase."""
+        if not self.stats:
+            return "sin pases aplicados"
+        before, after = self.stats[0][1], self.stats[-1][2]
+        percent = (before - after) / before * 100 if before else 0.0
+        lines = [f"cuádruplas: {before} → {after} ({percent:.1f}% menos)"]
+        if self.temps is not None:
+            lines.append(f"temporales: {self.temps[0]} → {self.temps[1]}")
+        for name, pass_before, pass_after in self.stats:
+            lines.append(f"  - {name}: {pass_before} → {pass_after}")
+        return "\n".join(lines)
@@ -4,66 +4,153 @@
 # Desarrollado por: Ing. Jonathan Torres, Ph.D.
 # -------------------------------------------------------------
 
-
-# Variable global para la última línea procesada
-last_token_line = None
+from collections.abc import Sequence
+
+from ast_nodes import Declaration, Assignment, If, BinaryOp, Literal, Name
+
+# Hojas distintas que se comparten como máximo en un análisis; al llenarse la
+# tabla se vacía, para que el análisis por flujo siga usando memoria acotada
+MAX_SHARED_LEAVES = 4096
+
+# Flujo de tokens con cursor de índice.
+# Consumir un token solo avanza el cursor (O(1)), en lugar de desplazar toda la
+# lista como hacía tokens.pop(0); la lista original nunca se modifica.
+# El token actual se guarda en caché, así que consultarlo varias veces no vuelve
+# a indexar la secuencia (importante con secuencias como TokenStore).
+# Cada análisis usa su propio flujo, que también guarda la última línea procesada
+# y la tabla de hojas compartidas (ver _shared_leaf), así que varios análisis
+# pueden ejecutarse a la vez sin estado global compartido.
+class TokenStream:
+    def __init__(self, tokens):
+        self.tokens = tokens  # Secuencia de tokens (tipo, valor, línea, columna)
+        self.pos = 0  # Índice del token actual
+        self.current = tokens[0] if len(tokens) else None  # Token actual (None al final)
+        # Última línea procesada, para los errores al final de la entrada
+        self.last_line = tokens[-1][2] if len(tokens) else None
+        self.leaves = {}  # (clase, valor...) → hoja ya construida
+
+    def __bool__(self):
+        # Verdadero mientras queden tokens por consumir
+        return self.current is not None
+
+    def peek(self):
+        # Retorna el token actual sin consumirlo
+        if self.current is None:
+            raise IndexError("no quedan tokens por consumir")
+        return self.current
+
+    def advance(self):
+        # Consume y retorna el token actual
+        token = self.peek()
+        self.pos += 1
+        self.current = self.tokens[self.pos] if self.pos < len(self.tokens) else None
+        return token
+
+# Flujo de tokens sobre un iterador (por ejemplo, lexer_stream).
+# Mantiene un solo token de anticipación, así que los tokens se consumen a medida
+# que el analizador léxico los produce, sin construir la lista completa.
+class IteratorTokenStream(TokenStream):
+    def __init__(self, tokens):
+        self.tokens = iter(tokens)
+        self.current = next(self.tokens, None)  # Token actual (None al final)
+        # Con un iterador la última línea se conoce a medida que se consumen los tokens
+        self.last_line = None
+        self.leaves = {}
+
+    def advance(self):
+        # Consume y retorna el token actual
+        token = self.peek()
+        self.current = next(self.tokens, None)
+        return token
 
 # Función principal que maneja el análisis sintáctico
 def parser(tokens):
-    global last_token_line  # Acceder a la variable global que guarda la última línea procesada
-
-    tokens = tokens.copy()  # Copiar los tokens para no modificar la lista original
-    ast = []  # Lista donde se almacenará el árbol de sintaxis abstracta (AST)
+    ast = list(parser_stream(tokens))  # Lista donde se almacenará el árbol de sintaxis abstracta (AST)
+    return ast  # Retorna el árbol de sintaxis abstracta (AST)
 
-    # Obtenemos la última línea de los tokens para informar sobre el contexto
-    last_token = tokens[-1]
-    last_token_line = last_token[2]  # Se asume que el tercer elemento de cada token es la línea
+# Versión por flujo del análisis sintáctico: genera las sentencias de nivel superior
+# una a una, en cuanto se terminan de leer sus tokens
+def parser_stream(tokens):
+    if isinstance(tokens, Sequence):
+        tokens = TokenStream(tokens)  # Recorremos los tokens con un cursor, sin copiarlos
+    else:
+        tokens = IteratorTokenStream(tokens)
 
-    # Procesar todos los tokens, agregando la estructura a 'ast'
+    # Procesar todos los tokens, generando cada sentencia del AST
     while tokens:
         try:
-            ast.append(parse_statement(tokens))  # Llamar a la función que parsea las sentencias
+            yield parse_statement(tokens)  # Llamar a la función que parsea las sentencias
         except SyntaxError as e:  # Si ocurre un error de sintaxis, lo propagamos
             raise SyntaxError(str(e))
-    
-    return ast  # Retorna el árbol de sintaxis abstracta (AST)
 
-# Función para procesar una sentencia del código
+# Función para procesar una sentencia del código.
+# Los bloques 'if' anidados no se procesan con recursión: cada 'if' abierto se
+# guarda en una pila explícita junto con su cuerpo, de modo que la profundidad
+# de anidamiento solo está limitada por la memoria.
 def parse_statement(tokens):
+    open_ifs = []  # Pila de bloques 'if' abiertos: (nodo If, línea y columna del '(')
+
+    while True:
+        # Si el primer token es 'if', abrimos un bloque y seguimos con su cuerpo
+        if match_keyword(tokens, 'if'):
+            open_ifs.append(parse_if_header(tokens))
+        else:
+            node = parse_simple_statement(tokens)
+            if not open_ifs:
+                return node
+            open_ifs[-1][0].body.append(node)
+
+        # Cerramos los bloques cuyo cuerpo terminó con '}'
+        while open_ifs:
+            # Quedan sentencias dentro del bloque actual
+            if tokens and not match(tokens, 'RBRACE'):
+                break
+            node, if_line, if_col = open_ifs.pop()
+            # Si no hemos encontrado la llave de cierre 'RBRACE' y ya no quedan tokens, lanzar error
+            if not match(tokens, 'RBRACE'):
+                raise SyntaxError(f"Error en línea {if_line}, columna {if_col}: falta '}}' de cierre en el bloque 'if'")
+            # Consumir la llave de cierre 'RBRACE', donde termina el bloque
+            _, _, node.end_line, end_col = tokens.advance()
+            node.end_col = end_col + 1
+            if not open_ifs:
+                return node
+            open_ifs[-1][0].body.append(node)
+
+# Función para procesar una sentencia sin bloque (declaración o asignación)
+def parse_simple_statement(tokens):
     # Si el primer token es 'int' o 'float', procesamos como declaración
     if match_keyword(tokens, 'int') or match_keyword(tokens, 'float'):
         return parse_declaration(tokens)
 
-    # Si el primer token es 'if', procesamos una estructura condicional
-    elif match_keyword(tokens, 'if'):
-        return parse_if(tokens)
-
     # Si el primer token es un identificador, procesamos una asignación
     elif match(tokens, 'IDENTIFIER'):
         return parse_assignment(tokens)
 
     # Si no es ninguno de los anteriores, es un error de sintaxis
     else:
-        tipo, val, line, col = tokens[0]
+        tipo, val, line, col = tokens.peek()
         raise SyntaxError(f"Error en línea {line}, columna {col}: sentencia inválida, token inesperado '{val}'")
 
 # Función para procesar una declaración (ejemplo: int a = 5;)
 def parse_declaration(tokens):
+    _, _, line, col = tokens.peek()  # Posición de la declaración (token del tipo)
     tipo = parse_type(tokens)  # Procesa el tipo de la declaración (ej. 'int', 'float')
     ident = parse_id(tokens)  # Procesa el identificador (ej. 'a')
 
     # Si el siguiente token es un punto y coma, significa que la declaración está completa
     if match(tokens, 'SEMICOLON'):
-        tokens.pop(0)  # Consumir el token ';'
-        return ('DECLARATION', tipo, ident)  # Retorna la estructura de la declaración
+        _, _, end_line, end_col = tokens.advance()  # Consumir el token ';'
+        return Declaration(tipo, ident, None, line, col, end_line, end_col + 1)  # Retorna la estructura de la declaración
     
     # Si no es un punto y coma, debe ser una asignación
     parse_equals(tokens)  # Procesa el operador de asignación '='
     expr = parse_expression(tokens)  # Procesa la expresión a la derecha del '='
-    parse_semi(tokens)  # Procesa el punto y coma al final
-    return ('DECLARATION', tipo, ident, expr)  # Retorna la declaración con la expresión
+    end_line, end_col = parse_semi(tokens)  # Procesa el punto y coma al final
+    return Declaration(tipo, ident, expr, line, col, end_line, end_col)  # Retorna la declaración con la expresión
 # Función para procesar una asignación, por ejemplo: 'a = 5'
 def parse_assignment(tokens):
+    _, _, line, col = tokens.peek()  # Posición de la asignación (identificador)
+
     # Procesar el identificador (ej. 'a')
     ident = parse_id(tokens)
     
@@ -74,18 +161,22 @@ def parse_assignment(tokens):
     expr = parse_expression(tokens)
     
     # Procesar el punto y coma al final
-    parse_semi(tokens)
+    end_line, end_col = parse_semi(tokens)
     
     # Retornar la estructura de la asignación
-    return ('ASSIGNMENT', ident, expr)
+    return Assignment(ident, expr, line, col, end_line, end_col)
+
+# Función para procesar la cabecera de un 'if' hasta la llave de apertura.
+# Retorna el nodo If con el cuerpo vacío (parse_statement lo llena) y la posición
+# del paréntesis de apertura, que se muestra si falta la llave de cierre.
+def parse_if_header(tokens):
+    _, _, line, col = tokens.peek()  # Posición de la palabra clave 'if'
 
-# Función para procesar una estructura condicional 'if'
-def parse_if(tokens):
     # Verificamos si el primer token es la palabra clave 'if'
     expect_keyword(tokens, 'if')
 
     # Guardamos la información de la línea y columna del 'if' para mostrarla en caso de error
-    if_line, if_col = tokens[0][2], tokens[0][3]
+    if_line, if_col = tokens.peek()[2], tokens.peek()[3]
 
     # Espera el paréntesis de apertura '('
     expect(tokens, 'LPAREN')
@@ -99,123 +190,139 @@ def parse_if(tokens):
     # Espera la llave de apertura '{'
     expect(tokens, 'LBRACE')
 
-    block = []
-    # Procesar sentencias dentro del bloque
-    while tokens and not match(tokens, 'RBRACE'):
-        block.append(parse_statement(tokens))
-
-    # Si no hemos encontrado la llave de cierre 'RBRACE' y ya no quedan tokens, lanzar error
-    if not match(tokens, 'RBRACE'):
-        raise SyntaxError(f"Error en línea {if_line}, columna {if_col}: falta '}}' de cierre en el bloque 'if'")
-
-    # Consumir la llave de cierre 'RBRACE'
-    tokens.pop(0)
-
-    # Retorna la estructura del bloque 'if' con su condición y bloque de sentencias
-    return ('IF', cond, block)
-
-# Función para procesar expresiones, que son comparaciones o operaciones
+    return If(cond, [], line, col), if_line, if_col
+
+# Precedencia de los operadores binarios (todos asociativos por la izquierda).
+# Las comparaciones se reconocen por el tipo del token y los aritméticos por su valor.
+COMPARISON_TOKENS = {'GREATER', 'LESS', 'EQUALS', 'NOTEQUAL'}
+PRECEDENCE = {'>': 1, '<': 1, '==': 1, '!=': 1, '+': 2, '-': 2, '*': 3, '/': 3}
+
+# Marcador de un paréntesis abierto en la pila de operadores
+OPEN_PAREN = None
+
+# Función para procesar expresiones, que son comparaciones o operaciones.
+# Usa precedencia de operadores con dos pilas explícitas (operandos y operadores)
+# en lugar de una función recursiva por nivel, así que los paréntesis anidados
+# no consumen la pila de Python. Cada operando de la pila lleva su extensión
+# (línea y columna inicial y final), que incluye los paréntesis que lo rodean,
+# para dar su posición a las BinaryOp. Construye el mismo árbol que la gramática
+#   comparación → suma (('>' | '<' | '==' | '!=') suma)*
+#   suma        → producto (('+' | '-') producto)*
+#   producto    → primario (('*' | '/') primario)*
+#   primario    → '(' comparación ')' | número | cadena | carácter | identificador
 def parse_expression(tokens):
-    return parse_comparison(tokens)
-
-# Función para procesar expresiones de comparación (ejemplo: 'x > 5', 'y == 3')
-def parse_comparison(tokens):
-    # Primero procesamos las operaciones de adición y sustracción
-    left = parse_add_sub(tokens)
-
-    # Mientras encontremos un operador de comparación ('>', '<', '==')
-    while match(tokens, 'GREATER') or match(tokens, 'LESS') or match(tokens, 'EQUALS') or match(tokens, 'NOTEQUAL'):
-        _, op, _, _ = tokens.pop(0)  # Consumimos el operador de comparación
-        # Procesamos la expresión de la derecha de la comparación
-        right = parse_add_sub(tokens)
-        # Retornamos la comparación estructurada
-        left = (op, left, right)
-
-    return left
-
-# Función para procesar operaciones de adición y sustracción
-def parse_add_sub(tokens):
-    # Primero procesamos las multiplicaciones y divisiones
-    left = parse_mul_div(tokens)
-    # Mientras encontremos un operador de adición o sustracción
-    while match(tokens, 'OPERATOR', '+') or match(tokens, 'OPERATOR', '-'):
-        _, op, _, _ = tokens.pop(0)  # Consumimos el operador
-        # Procesamos la expresión de la derecha
-        right = parse_mul_div(tokens)
-        # Retornamos la expresión con el operador aplicado
-        left = (op, left, right)
-    return left
-
-# Función para procesar operaciones de multiplicación y división
-def parse_mul_div(tokens):
-    # Procesamos el primer operando
-    left = parse_primary(tokens)
-    # Mientras encontremos un operador de multiplicación o división
-    while match(tokens, 'OPERATOR', '*') or match(tokens, 'OPERATOR', '/'):
-        _, op, _, _ = tokens.pop(0)  # Consumimos el operador
-        # Procesamos el operando de la derecha
-        right = parse_primary(tokens)
-        # Retornamos la expresión con el operador aplicado
-        left = (op, left, right)
-
-    return left
-
-# Función para procesar los operandos primarios (números, identificadores o paréntesis)
+    operands = []   # Subexpresiones ya construidas: [nodo, línea, columna, línea final, columna final]
+    operators = []  # (operador, precedencia) u OPEN_PAREN
+    open_parens = []  # Posición de cada paréntesis abierto
+
+    while True:
+        # Se espera un operando: antes pueden abrirse paréntesis
+        while match(tokens, 'LPAREN'):
+            _, _, line, col = tokens.advance()
+            operators.append(OPEN_PAREN)
+            open_parens.append((line, col))
+        token = tokens.current
+        node = parse_primary(tokens)
+        _, val, line, col = token
+        operands.append([node, line, col, line, col + len(val)])
+
+        # Después de un operando: cerrar paréntesis, leer un operador o terminar
+        while True:
+            token = tokens.current
+            op = None
+            if token is not None:
+                tk_type, tk_val = token[0], token[1]
+                if tk_type in COMPARISON_TOKENS or (tk_type == 'OPERATOR' and tk_val in PRECEDENCE):
+                    op = tk_val
+            if op is not None:
+                precedence = PRECEDENCE[op]
+                # Reducimos los operadores de igual o mayor precedencia (asociatividad por la izquierda)
+                while operators and operators[-1] is not OPEN_PAREN and operators[-1][1] >= precedence:
+                    _reduce(operands, operators)
+                tokens.advance()  # Consumimos el operador
+                operators.append((op, precedence))
+                break
+            if open_parens:
+                # Verificamos que haya un paréntesis de cierre correspondiente
+                if not match(tokens, 'RPAREN'):
+                    tipo, val, line, col = tokens.peek()
+                    raise SyntaxError(f"Error en línea {line}, columna {col}: se esperaba RPAREN ')' pero se encontró '{val}'")
+                _, _, line, col = tokens.advance()  # Consumimos 'RPAREN'
+                while operators[-1] is not OPEN_PAREN:
+                    _reduce(operands, operators)
+                operators.pop()
+                # El operando entre paréntesis se extiende hasta ellos
+                operands[-1][1:] = (*open_parens.pop(), line, col + 1)
+                continue
+            # Fin de la expresión
+            while operators:
+                _reduce(operands, operators)
+            return operands[0][0]
+
+# Combina los dos últimos operandos con el operador de la cima de la pila;
+# la operación va del inicio del izquierdo al final del derecho
+def _reduce(operands, operators):
+    op = operators.pop()[0]
+    right = operands.pop()
+    left = operands[-1]
+    left[0] = BinaryOp(op, left[0], right[0], left[1], left[2], right[3], right[4])
+    left[3], left[4] = right[3], right[4]
+
+# Función para procesar los operandos primarios (números, identificadores...).
+# Los paréntesis los procesa parse_expression con su pila de operadores.
 def parse_primary(tokens):
-    # Si encontramos un paréntesis de apertura, procesamos la expresión entre paréntesis
-    if match(tokens, 'LPAREN'):
-        tokens.pop(0)
-        expr = parse_expression(tokens)
-        # Verificamos que haya un paréntesis de cierre correspondiente
-        if not match(tokens, 'RPAREN'):
-            tipo, val, line, col = tokens[0]
-            raise SyntaxError(f"Error en línea {line}, columna {col}: se esperaba RPAREN ')' pero se encontró '{val}'")
-        tokens.pop(0)  # Consumimos 'RPAREN'
-        return expr
-
     # Si encontramos un número, lo procesamos
-    elif match(tokens, 'NUMBER'):
-        return parse_num(tokens)
+    if match(tokens, 'NUMBER'):
+        value = parse_num(tokens)
+        return _shared_leaf(tokens, Literal, value, 'float' if isinstance(value, float) else 'int')
     
         # Si encontramos una cadena, la procesamos
     elif match(tokens, 'STRING'):
-        return parse_string(tokens)
+        return _shared_leaf(tokens, Literal, parse_string(tokens), 'string')
 
     # Si encontramos un carácter, lo procesamos
     elif match(tokens, 'CHAR'):
-        return parse_char(tokens)
+        return _shared_leaf(tokens, Literal, parse_char(tokens), 'char')
 
 
     # Si encontramos un identificador, lo procesamos
     elif match(tokens, 'IDENTIFIER'):
-        return parse_id(tokens)
+        return _shared_leaf(tokens, Name, parse_id(tokens))
 
     # Si encontramos un operador de comparación '==', lanzamos un error
-    elif match(tokens, 'OPERATOR') and tokens[0][1] == '==':
-        _, val, line, col = tokens[0]
+    elif match(tokens, 'OPERATOR') and tokens.peek()[1] == '==':
+        _, val, line, col = tokens.peek()
         raise SyntaxError(f"Error en línea {line}, columna {col}: expresión no puede comenzar con '=='")
 
     # Si no encontramos un token esperado, lanzamos un error
     else:
-        tipo, val, line, col = tokens[0]
+        tipo, val, line, col = tokens.peek()
         raise SyntaxError(f"Error en línea {line}, columna {col}: token inesperado '{val}' en expresión")
 
 
-# === FUNCIONES AUXILIARES ===
+# Las hojas no guardan posición y nunca se modifican, así que todas las
+# apariciones de un mismo literal o variable comparten un solo nodo
+def _shared_leaf(tokens, cls, *args):
+    leaves = tokens.leaves
+    key = (cls, *args)  # El tipo distingue 1 de 1.0
+    leaf = leaves.get(key)
+    if leaf is None:
+        if len(leaves) >= MAX_SHARED_LEAVES:
+            leaves.clear()
+        leaf = leaves[key] = cls(*args)
+    return leaf
+
 
-# Variable global para almacenar la última línea procesada en el analizador.
-last_token_line = None
+# === FUNCIONES AUXILIARES ===
 
 # Función para procesar un tipo de dato (int, float)
 def parse_type(tokens):
-    global last_token_line  # Accede a la variable global para la última línea procesada.
-
     # Si no hay más tokens, lanza un error especificando la última línea conocida.
     if not tokens:
-        raise SyntaxError(f"Error en línea {last_token_line}: se esperaba tipo, pero no se encontró más tokens.")
+        raise SyntaxError(f"Error en línea {tokens.last_line}: se esperaba tipo, pero no se encontró más tokens.")
     
-    tipo, val, line, col = tokens.pop(0)  # Extrae el primer token de la lista.
-    last_token_line = line  # Actualiza la última línea procesada con la línea actual.
+    tipo, val, line, col = tokens.advance()  # Consume el token actual del flujo.
+    tokens.last_line = line  # Actualiza la última línea procesada con la línea actual.
 
     # Verifica si el tipo de token es 'int' o 'float', que son tipos válidos en este contexto.
     if tipo == 'KEYWORD' and val in ('int', 'float'):
@@ -226,14 +333,12 @@ def parse_type(tokens):
 
 # Función para procesar un identificador (como variables o nombres de funciones)
 def parse_id(tokens):
-    global last_token_line  # Accede a la variable global de la última línea procesada.
-
     # Si no hay tokens disponibles, lanza un error especificando la última línea conocida.
     if not tokens:
-        raise SyntaxError(f"Error en línea {last_token_line}: se esperaba identificador, pero no se encontró más tokens.")
+        raise SyntaxError(f"Error en línea {tokens.last_line}: se esperaba identificador, pero no se encontró más tokens.")
     
-    tipo, val, line, col = tokens.pop(0)  # Extrae el primer token de la lista.
-    last_token_line = line  # Actualiza la última línea procesada con la línea actual.
+    tipo, val, line, col = tokens.advance()  # Consume el token actual del flujo.
+    tokens.last_line = line  # Actualiza la última línea procesada con la línea actual.
 
     # Verifica si el token es un identificador válido.
     if tipo == 'IDENTIFIER':
@@ -244,14 +349,12 @@ def parse_id(tokens):
 
 # Función para procesar números (entero o decimal)
 def parse_num(tokens):
-    global last_token_line  # Accede a la variable global de la última línea procesada.
-
     # Si no hay más tokens, lanza un error especificando la última línea conocida.
     if not tokens:
-        raise SyntaxError(f"Error en línea {last_token_line}: se esperaba número, pero no se encontró más tokens.")
+        raise SyntaxError(f"Error en línea {tokens.last_line}: se esperaba número, pero no se encontró más tokens.")
     
-    tipo, val, line, col = tokens.pop(0)  # Extrae el primer token de la lista.
-    last_token_line = line  # Actualiza la última línea procesada con la línea actual.
+    tipo, val, line, col = tokens.advance()  # Consume el token actual del flujo.
+    tokens.last_line = line  # Actualiza la última línea procesada con la línea actual.
 
     # Si el token es un número, lo procesa como entero o decimal según corresponda.
     if tipo == 'NUMBER':
@@ -262,42 +365,40 @@ def parse_num(tokens):
 
 # Función para procesar el operador de asignación '='
 def parse_equals(tokens):
-    global last_token_line  # Accede a la variable global de la última línea procesada.
-
     # Si no hay más tokens, lanza un error especificando la última línea conocida.
     if not tokens:
-        raise SyntaxError(f"Error en línea {last_token_line}: se esperaba '=', pero no se encontró más tokens.")
+        raise SyntaxError(f"Error en línea {tokens.last_line}: se esperaba '=', pero no se encontró más tokens.")
     
-    tipo, val, line, col = tokens[0]  # Obtiene el tipo y valor del primer token.
-    last_token_line = line  # Actualiza la última línea procesada con la línea actual.
+    tipo, val, line, col = tokens.peek()  # Obtiene el tipo y valor del token actual.
+    tokens.last_line = line  # Actualiza la última línea procesada con la línea actual.
 
     # Verifica que el token sea un operador '='.
     if tipo != 'OPERATOR' or val != '=':
         raise SyntaxError(f"Error en línea {line}, columna {col}: se esperaba '=', pero se encontró '{val}'.")
     
-    tokens.pop(0)  # Consume el operador '='.
+    tokens.advance()  # Consume el operador '='.
 
-# Función para procesar el punto y coma ';' al final de las instrucciones
+# Función para procesar el punto y coma ';' al final de las instrucciones.
+# Retorna la posición justo después del punto y coma, donde termina la sentencia.
 def parse_semi(tokens):
-    global last_token_line  # Accede a la variable global de la última línea procesada.
-
     # Si no hay más tokens, lanza un error especificando la última línea conocida.
     if not tokens:
-        raise SyntaxError(f"Error en línea {last_token_line}: se esperaba ';', pero no se encontró más tokens.")
+        raise SyntaxError(f"Error en línea {tokens.last_line}: se esperaba ';', pero no se encontró más tokens.")
     
-    tipo, val, line, col = tokens[0]  # Obtiene el tipo y valor del primer token.
-    last_token_line = line  # Actualiza la última línea procesada con la línea actual.
+    tipo, val, line, col = tokens.peek()  # Obtiene el tipo y valor del token actual.
+    tokens.last_line = line  # Actualiza la última línea procesada con la línea actual.
 
     # Verifica que el token sea un punto y coma ';'.
     if tipo != 'SEMICOLON':
         raise SyntaxError(f"Error en línea {line}, columna {col}: se esperaba ';', pero se encontró '{val}'.")
     
-    tokens.pop(0)  # Consume el punto y coma ';'.
+    tokens.advance()  # Consume el punto y coma ';'.
+    return line, col + 1
 
 
 # Función para procesar cadenas de texto
 def parse_string(tokens):
-    tipo, val, line, col = tokens.pop(0)
+    tipo, val, line, col = tokens.advance()
     # Asegurarse que la cadena esté entre comillas dobles
     if tipo == 'STRING':
         return val  # Retorna el valor de la cadena
@@ -305,7 +406,7 @@ def parse_string(tokens):
 
 # Función para procesar caracteres
 def parse_char(tokens):
-    tipo, val, line, col = tokens.pop(0)
+    tipo, val, line, col = tokens.advance()
     # Asegurarse que el carácter esté entre comillas simples
     if tipo == 'CHAR':
         return val  # Retorna el valor del carácter
@@ -315,33 +416,33 @@ def parse_char(tokens):
 def match(tokens, type_, value=None):
     if not tokens:
         return False
-    tk_type, tk_val, *_ = tokens[0]  # Obtiene el tipo y valor del primer token
+    tk_type, tk_val, *_ = tokens.peek()  # Obtiene el tipo y valor del token actual
     return tk_type == type_ and (value is None or tk_val == value)
 
 # Función para verificar si el token actual es una palabra clave
 def match_keyword(tokens, keyword):
     if not tokens:
         return False
-    tk_type, tk_val, *_ = tokens[0]  # Obtiene el tipo y valor del primer token
+    tk_type, tk_val, *_ = tokens.peek()  # Obtiene el tipo y valor del token actual
     return tk_type == 'KEYWORD' and tk_val == keyword
 
 # Función para esperar un token específico
 def expect(tokens, type_, value=None):
     if not match(tokens, type_, value):
         if tokens:
-            tipo, val, line, col = tokens[0]  # Obtiene el tipo y valor del primer token
+            tipo, val, line, col = tokens.peek()  # Obtiene el tipo y valor del token actual
             raise SyntaxError(f"Error en línea {line}, columna {col}: se esperaba {type_} '{value}' pero se encontró '{val}'")
         else:
             raise SyntaxError(f"Error: se esperaba {type_} '{value}' pero se encontró EOF")
-    tokens.pop(0)  # Consume el token esperado
+    tokens.advance()  # Consume el token esperado
 
 # Función para esperar una palabra clave específica
 def expect_keyword(tokens, keyword):
     if not match_keyword(tokens, keyword):
         if tokens:
-            tipo, val, line, col = tokens[0]  # Obtiene el tipo y valor del primer token
+            tipo, val, line, col = tokens.peek()  # Obtiene el tipo y valor del token actual
             raise SyntaxError(f"Error en línea {line}, columna {col}: se esperaba palabra clave '{keyword}' pero se encontró '{val}'")
         else:
             raise SyntaxError(f"Error: se esperaba palabra clave '{keyword}' pero se encontró EOF")
-    tokens.pop(0)  # Consume la palabra clave esperada
+    tokens.advance()  # Consume la palabra clave esperada
 
@@ -0,0 +1,154 @@
+"""
+Archivo: peephole.py
+
+Optimización de mirilla (peephole) sobre el código objeto de ObjectCodeGenerator.
+
+Recorre las instrucciones con una ventana deslizante y aplica una tabla de
+reglas de patrones. Cada regla mira las últimas instrucciones emitidas y, si
+reconoce el patrón, las sustituye por una secuencia más corta. Después de cada
+sustitución se vuelve a intentar sobre el nuevo final, de modo que las reglas
+se encadenan (por ejemplo, quitar un JUMP puede dejar un STORE/LOAD contiguo).
+
+Reglas incluidas (ver RULES):
+- STORE x; LOAD x   → STORE x         (el acumulador ya contiene x)
+- LOAD x; STORE x   → LOAD x          (x ya contiene ese valor)
+- STORE x; STORE x  → STORE x         (suele quedar tras quitar un LOAD)
+- JUMP L; LABEL L   → LABEL L         (salto a la instrucción siguiente)
+- Cadenas de saltos: un JUMP o JUMP_IF_FALSE a una etiqueta seguida de
+  JUMP M salta directamente a M.
+"""
+
+
+def split_instruction(instr):
+    """Separa una instrucción en (mnemónico, operando); el operando puede contener espacios."""
+    op, _, arg = instr.partition(' ')
+    return op, arg
+
+
+# ========================
+# Reglas de ventana
+# ========================
+# Cada regla recibe la ventana (lista de instrucciones ya separadas en
+# (mnemónico, operando)) y retorna las instrucciones que la reemplazan, o None
+# si el patrón no coincide.
+
+def store_load(window):
+    (op1, arg1), (op2, arg2) = window
+    if op1 == 'STORE' and op2 == 'LOAD' and arg1 == arg2:
+        return [window[0]]
+    return None
+
+def load_store(window):
+    (op1, arg1), (op2, arg2) = window
+    if op1 == 'LOAD' and op2 == 'STORE' and arg1 == arg2:
+        return [window[0]]
+    return None
+
+def store_store(window):
+    (op1, arg1), (op2, arg2) = window
+    if op1 == 'STORE' and op2 == 'STORE' and arg1 == arg2:
+        return [window[0]]
+    return None
+
+def jump_to_next(window):
+    (op1, arg1), (op2, arg2) = window
+    if op1 == 'JUMP' and op2 == 'LABEL' and arg1 == arg2:
+        return [window[1]]
+    return None
+
+
+# Tabla de reglas: nombre → (tamaño de la ventana, función)
+RULES = {
+    'STORE x; LOAD x': (2, store_load),
+    'LOAD x; STORE x': (2, load_store),
+    'STORE x; STORE x': (2, store_store),
+    'JUMP L; LABEL L': (2, jump_to_next),
+}
+
+# Nombre con el que se informan los saltos reencaminados
+JUMP_CHAIN = 'cadena de saltos'
+
+
+class PeepholeOptimizer:
+    """
+    Aplica las reglas de mirilla y cuenta cuántas veces se aplicó cada una.
+
+    Parámetros:
+    - rules: nombres de las reglas de RULES a aplicar (por defecto, todas).
+    - jump_chains: si se reencaminan las cadenas de saltos.
+    """
+
+    def __init__(self, rules=None, jump_chains=True):
+        names = RULES if rules is None else rules
+        self.rules = [(name,) + RULES[name] for name in names]
+        self.jump_chains = jump_chains
+        self.hits = {}
+        self.before = self.after = 0
+
+    def optimize(self, instructions):
+        """Retorna una nueva lista de instrucciones optimizada."""
+        self.hits = {name: 0 for name, _, _ in self.rules}
+        self.before = len(instructions)
+        code = [split_instruction(instr) for instr in instructions]
+        if self.jump_chains:
+            self.hits[JUMP_CHAIN] = 0
+            code = self._retarget_jumps(code)
+        code = self._apply_rules(code)
+        self.after = len(code)
+        return [f"{op} {arg}" if arg else op for op, arg in code]
+
+    def _apply_rules(self, code):
+        out = []
+        for instr in code:
+            out.append(instr)
+            matched = True
+            while matched:
+                matched = False
+                for name, size, rule in self.rules:
+                    if len(out) < size:
+                        continue
+                    replacement = rule(out[-size:])
+                    if replacement is not None:
+                        out[-size:] = replacement
+                        self.hits[name] += 1
+                        matched = True
+                        break
+        return out
+
+    def _retarget_jumps(self, code):
+        """Hace que cada salto a una etiqueta seguida de JUMP M salte directamente a M."""
+        # Etiqueta → destino final si lo primero que se ejecuta tras ella es un JUMP
+        forwards = {}
+        for i, (op, arg) in enumerate(code):
+            if op != 'LABEL':
+                continue
+            j = i + 1
+            while j < len(code) and code[j][0] == 'LABEL':
+                j += 1
+            if j < len(code) and code[j][0] == 'JUMP':
+                forwards[arg] = code[j][1]
+
+        def final_target(label):
+            seen = {label}
+            while label in forwards and forwards[label] not in seen:
+                label = forwards[label]
+                seen.add(label)
+            return label
+
+        retargeted = []
+        for op, arg in code:
+            if op in ('JUMP', 'JUMP_IF_FALSE') and arg in forwards:
+                target = final_target(arg)
+                if target != arg:
+                    self.hits[JUMP_CHAIN] += 1
+                    arg = target
+            retargeted.append((op, arg))
+        return retargeted
+
+    def summary(self):
+        """Texto con la reducción total y las aplicaciones de cada regla."""
+        percent = (self.before - self.after) / self.before * 100 if self.before else 0.0
+        lines = [f"instrucciones: {self.before} → {self.after} ({percent:.1f}% menos)"]
+        for name, count in self.hits.items():
+            lines.append(f"  - {name}: {count}")
+        return "\n".join(lines)
@@ -0,0 +1,128 @@
+"""
+Archivo: profiler.py
+
+Medición por fases de una compilación (opción --perfil de compilador.py).
+
+Para cada fase se registra el tiempo real (perf_counter), el tiempo de CPU
+(process_time), el pico de memoria reservada durante la fase (tracemalloc,
+medido sobre la memoria que ya estaba en uso al empezarla) y el número de
+elementos producidos: tokens, nodos del AST, cuádruplas o instrucciones.
+
+Uso programático:
+
+    perfil = PhaseProfiler(hooks=[lambda registro: print(registro.name, registro.wall)])
+    compilar_programa(codigo, perfil=perfil)
+    print(perfil.table())
+    datos = perfil.to_json()
+
+Los hooks se llaman con cada PhaseRecord al terminar su fase. Si una fase se
+mide varias veces (por ejemplo, en varias compilaciones con el mismo perfil),
+sus valores se acumulan en un único registro.
+
+tracemalloc es global al proceso, así que la memoria de un perfil solo es
+fiable si no hay otras compilaciones ejecutándose a la vez en otros hilos.
+"""
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+
+class PhaseRecord:
+    """Mediciones acumuladas de una fase."""
+    __slots__ = ('name', 'unit', 'wall', 'cpu', 'peak_memory', 'items', 'calls')
+
+    def __init__(self, name, unit=""):
+        self.name = name
+        self.unit = unit          # Qué cuenta `items` ('tokens', 'nodos', ...)
+        self.wall = 0.0           # Tiempo real en segundos
+        self.cpu = 0.0            # Tiempo de CPU en segundos
+        self.peak_memory = 0      # Pico de memoria reservada durante la fase (bytes)
+        self.items = 0            # Elementos producidos por la fase
+        self.calls = 0            # Veces que se midió la fase
+
+    def as_dict(self):
+        """Registro como diccionario serializable a JSON."""
+        return {field: getattr(self, field) for field in self.__slots__}
+
+
+class PhaseProfiler:
+    """
+    Acumula PhaseRecord por nombre de fase, en el orden en que se midieron por primera vez.
+
+    Con trace_memory=False no se usa tracemalloc (mucho más rápido) y el pico de
+    memoria queda en 0.
+    """
+
+    def __init__(self, hooks=(), trace_memory=True):
+        self.hooks = list(hooks)
+        self.trace_memory = trace_memory
+        self.records = {}  # nombre → PhaseRecord
+
+    def add_hook(self, hook):
+        """Registra una función que recibe cada PhaseRecord al terminar su fase."""
+        self.hooks.append(hook)
+
+    @contextmanager
+    def phase(self, name, count=None, unit=""):
+        """
+        Mide el bloque `with` como la fase `name`. `count` es una función opcional
+        que retorna el número de elementos producidos; se evalúa al terminar la
+        fase, fuera del tiempo medido.
+        """
+        record = self.records.get(name)
+        if record is None:
+            record = self.records[name] = PhaseRecord(name, unit)
+
+        started_tracing = False
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                started_tracing = True
+            tracemalloc.reset_peak()
+            base_memory = tracemalloc.get_traced_memory()[0]
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield record
+        finally:
+            record.wall += time.perf_counter() - wall_start
+            record.cpu += time.process_time() - cpu_start
+            if self.trace_memory:
+                peak = tracemalloc.get_traced_memory()[1] - base_memory
+                record.peak_memory = max(record.peak_memory, peak)
+                if started_tracing:
+                    tracemalloc.stop()
+            record.calls += 1
+        # Solo se cuentan los elementos y se avisa a los hooks si la fase terminó bien
+        if count is not None:
+            record.items += count()
+        for hook in self.hooks:
+            hook(record)
+
+    def total(self):
+        """Tiempo real y de CPU sumados de todas las fases."""
+        return (sum(r.wall for r in self.records.values()),
+                sum(r.cpu for r in self.records.values()))
+
+    def table(self):
+        """Tabla de texto con una fila por fase y una fila de totales."""
+        lines = [f"{'fase':<14} {'real (ms)':>10} {'CPU (ms)':>10} {'pico (KiB)':>11} {'elementos':>18}"]
+        for r in self.records.values():
+            items = f"{r.items} {r.unit}".strip()
+            lines.append(f"{r.name:<14} {r.wall * 1000:>10.3f} {r.cpu * 1000:>10.3f} "
+                         f"{r.peak_memory / 1024:>11.1f} {items:>18}")
+        wall, cpu = self.total()
+        lines.append(f"{'total':<14} {wall * 1000:>10.3f} {cpu * 1000:>10.3f}")
+        return "\n".join(lines)
+
+    def to_json(self, **extra):
+        """
+        Documento JSON con la lista de fases y los totales; `extra` añade campos
+        al nivel superior (por ejemplo, el archivo compilado).
+        """
+        wall, cpu = self.total()
+        data = dict(extra)
+        data["phases"] = [r.as_dict() for r in self.records.values()]
+        data["total"] = {"wall": wall, "cpu": cpu}
+        return json.dumps(data, ensure_ascii=False)
@@ -0,0 +1,288 @@
+"""
+Archivo: pycodegen.py
+
+Backend que traduce las cuádruplas a código fuente Python, lo compila una sola
+vez con compile() y lo ejecuta como una función: cada variable y temporal del
+programa es una variable local de esa función, de modo que CPython ejecuta el
+programa sin el bucle de interpretación instrucción por instrucción de vm.py.
+
+Traducción:
+- las variables se renombran con el prefijo `v_` (no chocan con palabras clave
+  de Python ni con los nombres auxiliares, que empiezan por `_`) y empiezan en 0,
+  como en la memoria inicial de la máquina virtual;
+- los literales se interpretan igual que en vm.parse_operand;
+- la semántica es la de vm.py: las comparaciones producen 1 o 0 y la división
+  pasa por vm._div (trunca hacia cero entre enteros y detecta la división por cero);
+- las cuádruplas tipadas (--tipado) se traducen directamente: f+ f- f* como
+  operaciones de Python, f/ por vm._fdiv e itof como float();
+- un temporal que se escribe y se lee una sola vez no se guarda en una variable:
+  su expresión se sustituye en el punto de uso, de modo que cada sentencia del
+  programa queda como una única expresión de Python. Antes de escribir una
+  variable se materializan las expresiones pendientes que la leen, y en cada
+  salto o etiqueta todas.
+
+Control de flujo:
+- si cada GOTOF salta hacia delante a una etiqueta que cierra un bloque bien
+  anidado (lo que produce IntermediateCodeGenerator para los `if`), se genera
+  un `if` de Python por cada GOTOF;
+- si el programa no está estructurado (GOTO, saltos hacia atrás o etiquetas
+  cruzadas) o el anidamiento supera MAX_NESTING (Python limita los niveles de
+  indentación), se recurre a un bucle de despacho sobre los bloques básicos.
+"""
+import time
+
+from cfg import split_blocks
+from intermediate import TEMP_PREFIX
+from optimizer import is_temp, quad_def, quad_uses
+from vm import VMError, _div, _fdiv, parse_operand
+
+# Anidamiento máximo de `if` en la traducción estructurada
+MAX_NESTING = 50
+
+# Profundidad máxima de una expresión formada al sustituir temporales
+MAX_INLINE_DEPTH = 30
+
+_COMPARISONS = {'<', '>', '==', '!='}
+
+
+def _name(variable):
+    """Nombre local de Python: v_x para la variable x y t_1 para el temporal %t1."""
+    if is_temp(variable):
+        return f"t_{variable[len(TEMP_PREFIX):]}"
+    return f"v_{variable}"
+
+
+class PythonCodeGenerator:
+    """
+    Traduce una lista de cuádruplas al código fuente de una función Python
+    `_programa()` que retorna el diccionario variable → valor final.
+
+    Tras generate():
+    - structured: True si se usó la traducción con `if` anidados, False si
+      se usó el bucle de despacho.
+    """
+
+    def __init__(self, max_nesting=MAX_NESTING):
+        self.max_nesting = max_nesting
+        self.lines = []
+        self.variables = {}  # Variable → nombre local, en orden de aparición
+        self.inlinable = set()  # Temporales con una sola escritura y una sola lectura
+        self.pending = {}  # Temporal → (expresión, nombres que lee, profundidad) aún sin escribir
+        self.structured = True
+
+    def generate(self, quads):
+        """Retorna el código fuente Python del programa."""
+        self.lines = ["def _programa():"]
+        self.variables = {}
+        self.pending = {}
+        self.inlinable = self._single_use_temps(quads)
+        body = []
+        self.structured = self._is_structured(quads)
+        if self.structured:
+            self._generate_structured(quads, body)
+        else:
+            self._generate_dispatch(quads, body)
+
+        # Las variables se conocen al terminar de traducir el cuerpo
+        for local in self.variables.values():
+            self.lines.append(f"    {local} = 0")
+        self.lines.extend(body)
+        visible = ", ".join(f"{variable!r}: {local}" for variable, local in self.variables.items()
+                            if not is_temp(variable))
+        self.lines.append(f"    return {{{visible}}}")
+        return "\n".join(self.lines) + "\n"
+
+    # ========================
+    # Análisis previo
+    # ========================
+
+    @staticmethod
+    def _single_use_temps(quads):
+        defs, uses = {}, {}
+        for quad in quads:
+            dest = quad_def(quad)
+            if is_temp(dest):
+                defs[dest] = defs.get(dest, 0) + 1
+            for operand in quad_uses(quad):
+                if is_temp(operand):
+                    uses[operand] = uses.get(operand, 0) + 1
+        return {temp for temp, count in defs.items() if count == 1 and uses.get(temp) == 1}
+
+    def _is_structured(self, quads):
+        """Verifica que los saltos formen `if` bien anidados y no demasiado profundos."""
+        open_labels = []
+        for quad in quads:
+            head = quad[0]
+            if head == 'GOTO':
+                return False
+            if head == 'GOTOF':
+                open_labels.append(quad[2])
+                if len(open_labels) > self.max_nesting:
+                    return False
+            elif head == 'LABEL':
+                label = quad[1]
+                if label in open_labels and open_labels[-1] != label:
+                    return False  # Cierra un bloque exterior con otro interior abierto
+                while open_labels and open_labels[-1] == label:
+                    open_labels.pop()
+        # Un GOTOF sin su etiqueta posterior salta hacia atrás o fuera del programa
+        return not open_labels
+
+    # ========================
+    # Traducción
+    # ========================
+
+    def _operand(self, operand):
+        if not isinstance(operand, str):
+            return repr(operand)
+        is_constant, value = parse_operand(operand)
+        if is_constant:
+            return repr(value)
+        local = self.variables.get(operand)
+        if local is None:
+            local = self.variables[operand] = _name(operand)
+        return local
+
+    def _read(self, operand, wrap=True):
+        """
+        Retorna (expresión, nombres que lee, profundidad) de un operando. Una
+        expresión pendiente se retorna entre paréntesis salvo con wrap=False.
+        """
+        pending = self.pending.pop(operand, None)
+        if pending is not None:
+            expr, reads, depth = pending
+            return (f"({expr})" if wrap and depth else expr), reads, depth
+        text = self._operand(operand)
+        return text, ({operand} if isinstance(operand, str) and text != repr(operand) else set()), 0
+
+    def _condition(self, operand):
+        """Condición de un salto; una comparación pendiente se usa sin convertirla a 1 o 0."""
+        expr = self._read(operand, wrap=False)[0]
+        if expr.startswith("1 if ") and expr.endswith(" else 0"):
+            return expr[len("1 if "):-len(" else 0")]
+        return expr
+
+    def _assign(self, quad, out, indent):
+        """Traduce una cuádrupla de asignación u operación (o la deja pendiente)."""
+        dest, op, left, right = quad
+        if op == '=':
+            value, reads, depth = self._read(left, wrap=False)
+        elif op == 'itof':
+            value, reads, depth = self._read(left, wrap=False)
+            value, depth = f"float({value})", depth + 1
+        else:
+            a, reads_a, depth_a = self._read(left)
+            b, reads_b, depth_b = self._read(right)
+            reads, depth = reads_a | reads_b, max(depth_a, depth_b) + 1
+            if op == '/':
+                value = f"_div({a}, {b})"
+            elif op == 'f/':
+                value = f"_fdiv({a}, {b})"
+            elif op[0] == 'f':
+                value = f"{a} {op[1:]} {b}"
+            elif op in _COMPARISONS:
+                value = f"1 if {a} {op} {b} else 0"
+            else:
+                value = f"{a} {op} {b}"
+        if dest in self.inlinable and depth < MAX_INLINE_DEPTH:
+            self.pending[dest] = (value, reads, depth)
+            return
+        # Las expresiones pendientes que leen `dest` se evalúan antes de escribirlo
+        self._flush(out, indent, dest)
+        out.append(f"{indent}{self._operand(dest)} = {value}")
+
+    def _flush(self, out, indent, written=None):
+        """Escribe las expresiones pendientes (solo las que leen `written`, si se indica)."""
+        for temp, (value, reads, _) in list(self.pending.items()):
+            if written is None or written in reads:
+                del self.pending[temp]
+                out.append(f"{indent}{self._operand(temp)} = {value}")
+
+    def _generate_structured(self, quads, out):
+        open_labels = []
+        for quad in quads:
+            head = quad[0]
+            indent = "    " * (len(open_labels) + 1)
+            if head == 'GOTOF':
+                condition = self._condition(quad[1])
+                self._flush(out, indent)
+                out.append(f"{indent}if {condition}:")
+                open_labels.append(quad[2])
+            elif head == 'LABEL':
+                self._flush(out, indent)
+                while open_labels and open_labels[-1] == quad[1]:
+                    if out[-1].endswith(":"):
+                        out.append(f"{indent}pass")  # El bloque del `if` quedó vacío
+                    open_labels.pop()
+                    indent = indent[4:]
+            else:
+                self._assign(quad, out, indent)
+        self._flush(out, "    ")
+
+    def _generate_dispatch(self, quads, out):
+        """
+        Bucle de despacho: `_siguiente` es el índice del próximo bloque básico.
+        Los bloques se prueban en orden dentro de una misma vuelta, así que los
+        saltos hacia delante no vuelven al principio del bucle; solo un salto
+        hacia atrás necesita otra vuelta.
+        """
+        blocks = split_blocks(quads)
+        labels = {block[0][1]: i for i, block in enumerate(blocks) if block[0][0] == 'LABEL'}
+
+        def target(label):
+            if label not in labels:
+                raise VMError(f"Error de traducción: la etiqueta '{label}' no está definida.")
+            return labels[label]
+
+        out.append("    _siguiente = 0")
+        out.append(f"    while _siguiente < {len(blocks)}:")
+        for i, block in enumerate(blocks):
+            indent = "            "
+            out.append(f"        if _siguiente == {i}:")
+            for quad in block:
+                if quad[0] not in ('GOTO', 'GOTOF', 'LABEL'):
+                    self._assign(quad, out, indent)
+            last = block[-1]
+            if last[0] == 'GOTO':
+                self._flush(out, indent)
+                out.append(f"{indent}_siguiente = {target(last[1])}")
+            elif last[0] == 'GOTOF':
+                condition = self._condition(last[1])
+                self._flush(out, indent)
+                out.append(f"{indent}_siguiente = {i + 1} if {condition} else {target(last[2])}")
+            else:
+                self._flush(out, indent)
+                out.append(f"{indent}_siguiente = {i + 1}")
+
+
+class CompiledProgram:
+    """
+    Programa traducido a Python y compilado una vez.
+
+    Tras run():
+    - elapsed: segundos de ejecución.
+    """
+
+    def __init__(self, quads, max_nesting=MAX_NESTING):
+        generator = PythonCodeGenerator(max_nesting)
+        self.source = generator.generate(quads)
+        self.structured = generator.structured
+        namespace = {'_div': _div, '_fdiv': _fdiv}
+        exec(compile(self.source, "<programa>", "exec"), namespace)
+        self.function = namespace['_programa']
+        self.elapsed = 0.0
+
+    def run(self):
+        """Ejecuta el programa y retorna el diccionario variable → valor final (sin temporales)."""
+        start = time.perf_counter()
+        try:
+            return self.function()
+        except TypeError:
+            raise VMError("Error de ejecución: operandos incompatibles.") from None
+        finally:
+            self.elapsed = time.perf_counter() - start
+
+    def summary(self):
+        """Texto con la forma de la traducción y el tiempo de ejecución."""
+        form = "if anidados" if self.structured else "bucle de despacho"
+        return f"Python compilado ({form}) en {self.elapsed:.6f} s"
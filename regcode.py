@@ -0,0 +1,175 @@
+"""
+Archivo: regcode.py
+
+Generador de código objeto para una máquina de registros (instrucciones de
+tres direcciones), alternativo al de acumulador de objectcode.py.
+
+Instrucciones:
+- LOADI r, c           r ← literal c
+- LOAD r, x            r ← memoria[x]
+- STORE x, r           memoria[x] ← r
+- MOVE rd, rs          rd ← rs
+- ADD rd, ra, rb       rd ← ra + rb   (también SUB, MUL, DIV, CMP_LT, CMP_GT, CMP_EQ, CMP_NE
+                       y, entre float, FADD, FSUB, FMUL, FDIV)
+- ITOF rd, rs          rd ← rs convertido a float
+- JUMP_IF_FALSE r, L   salta a L si r es falso
+- JUMP L / LABEL L
+
+Las variables del programa viven en memoria. Los temporales se asignan a los
+registros r2..r(N-1) con asignación por barrido lineal sobre sus intervalos de
+vida (optimizer.temp_intervals); cuando no quedan registros libres se derrama
+(spill) a memoria el temporal que más tarde termina, usando su propio nombre
+como posición. r0 y r1 quedan reservados para cargar operandos que están en
+memoria (variables, literales y temporales derramados).
+"""
+import heapq
+
+from optimizer import ARITHMETIC_OPS, COMPARISON_OPS, FLOAT_OPS, is_constant, temp_intervals
+
+MNEMONICS = {
+    '+': 'ADD', '-': 'SUB', '*': 'MUL', '/': 'DIV',
+    '<': 'CMP_LT', '>': 'CMP_GT', '==': 'CMP_EQ', '!=': 'CMP_NE',
+    'f+': 'FADD', 'f-': 'FSUB', 'f*': 'FMUL', 'f/': 'FDIV',
+}
+
+# Registros reservados para operandos en memoria
+SCRATCH = ('r0', 'r1')
+
+
+class RegisterCodeGenerator:
+    """
+    Traduce cuádruplas a instrucciones de tres direcciones sobre `num_registers`
+    registros (dos de ellos reservados, ver SCRATCH).
+    """
+
+    def __init__(self, num_registers=8):
+        if num_registers < len(SCRATCH) + 1:
+            raise ValueError(f"Se necesitan al menos {len(SCRATCH) + 1} registros.")
+        self.num_registers = num_registers
+        self.instructions = []
+        self.registers = {}   # Temporal → registro asignado
+        self.spilled = set()  # Temporales derramados a memoria
+
+    # ========================
+    # Asignación de registros
+    # ========================
+
+    def allocate(self, quads):
+        """
+        Asigna registros a los temporales por barrido lineal (Poletto y Sarkar):
+        los intervalos se recorren por orden de inicio y, si no hay registro
+        libre, se derrama el intervalo activo que termina más tarde (o el nuevo,
+        si es el que termina más tarde).
+        """
+        self.registers = {}
+        self.spilled = set()
+        free = list(range(len(SCRATCH), self.num_registers))  # Montículo de registros libres
+        active = []  # Montículo de (fin, temporal) con registro asignado
+        intervals = temp_intervals(quads)
+        for temp, (start, end) in sorted(intervals.items(), key=lambda item: item[1][0]):
+            # Un intervalo que termina donde empieza el nuevo libera su registro:
+            # los operandos se leen antes de escribir el resultado
+            while active and active[0][0] <= start:
+                _, expired = heapq.heappop(active)
+                heapq.heappush(free, int(self.registers[expired][1:]))
+            if free:
+                self.registers[temp] = f"r{heapq.heappop(free)}"
+                heapq.heappush(active, (end, temp))
+                continue
+            # Sin registros libres: se derrama el que termina más tarde
+            furthest_end, furthest = max(active)
+            if furthest_end > end:
+                active.remove((furthest_end, furthest))
+                heapq.heapify(active)
+                self.registers[temp] = self.registers.pop(furthest)
+                self.spilled.add(furthest)
+                heapq.heappush(active, (end, temp))
+            else:
+                self.spilled.add(temp)
+        return self.registers
+
+    # ========================
+    # Generación
+    # ========================
+
+    def generate(self, quads):
+        """
+        Traduce una lista de cuádruplas a instrucciones de tres direcciones.
+
+        Retorna:
+        - Lista de instrucciones (cadenas).
+        """
+        self.instructions = []
+        self.allocate(quads)
+
+        for quad in quads:
+            head, op = quad[0], quad[1]
+
+            if head == 'GOTOF':
+                register = self._read(op, SCRATCH[0])
+                self._emit(f"JUMP_IF_FALSE {register}, {quad[2]}")
+
+            elif head == 'GOTO':
+                self._emit(f"JUMP {op}")
+
+            elif head == 'LABEL':
+                self._emit(f"LABEL {op}")
+
+            elif op == '=':
+                self._generate_copy(head, quad[2])
+
+            elif op in ARITHMETIC_OPS or op in COMPARISON_OPS or op in FLOAT_OPS:
+                left = self._read(quad[2], SCRATCH[0])
+                right = self._read(quad[3], SCRATCH[1])
+                dest = self.registers.get(head, SCRATCH[0])
+                self._emit(f"{MNEMONICS[op]} {dest}, {left}, {right}")
+                if head not in self.registers:
+                    self._emit(f"STORE {head}, {dest}")
+
+            elif op == 'itof':
+                source = self._read(quad[2], SCRATCH[0])
+                dest = self.registers.get(head, SCRATCH[0])
+                self._emit(f"ITOF {dest}, {source}")
+                if head not in self.registers:
+                    self._emit(f"STORE {head}, {dest}")
+
+            else:
+                raise ValueError(f"Cuádrupla no soportada: {quad}")
+
+        return self.instructions
+
+    def _generate_copy(self, dest, src):
+        # dest = src, con dest y src en registro o en memoria
+        register = self.registers.get(dest)
+        if register is None:
+            self._emit(f"STORE {dest}, {self._read(src, SCRATCH[0])}")
+        elif is_constant(src):
+            self._emit(f"LOADI {register}, {src}")
+        elif src in self.registers:
+            if self.registers[src] != register:
+                self._emit(f"MOVE {register}, {self.registers[src]}")
+        else:
+            self._emit(f"LOAD {register}, {src}")
+
+    def _read(self, operand, scratch):
+        """
+        Retorna el registro que contiene `operand`; si está en memoria o es un
+        literal, primero lo carga en el registro reservado `scratch`.
+        """
+        register = self.registers.get(operand)
+        if register is not None:
+            return register
+        if is_constant(operand):
+            self._emit(f"LOADI {scratch}, {operand}")
+        else:
+            self._emit(f"LOAD {scratch}, {operand}")
+        return scratch
+
+    def _emit(self, instr):
+        self.instructions.append(instr)
+
+    def summary(self):
+        """Texto con los registros usados y los temporales derramados."""
+        used = len(set(self.registers.values()))
+        return (f"registros: {used} de {self.num_registers - len(SCRATCH)} asignables, "
+                f"temporales derramados: {len(self.spilled)}")
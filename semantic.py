@@ -11,228 +11,306 @@ Este analizador cumple con los literales a–i, y además:
 - Declara y verifica funciones con sus argumentos y tipos de retorno
 - Maneja scopes anidados mediante una pila
 - Detecta y advierte shadowing de variables (variables con el mismo nombre en diferentes scopes) 
-"""
-# Tabla global de funciones (nombre → parámetros y tipo de retorno)
-functions = {}
-
-# Pila de scopes anidados (cada uno es un diccionario variable → tipo)
-scope_stack = []
-
-# ========================
-# Manejo de scopes
-# ========================
-
-def enter_scope():
-    """Crea un nuevo ámbito local (nuevo diccionario en la pila)."""
-    scope_stack.append({})
-
-def exit_scope():
-    """Elimina el ámbito actual (último diccionario en la pila)."""
-    scope_stack.pop()
-
-def current_scope():
-    """Obtiene el scope actual (el más interno)."""
-    return scope_stack[-1] if scope_stack else {}
-
-def is_declared(name):
-    """Verifica si una variable ha sido declarada en algún scope."""
-    for scope in reversed(scope_stack):
-        if name in scope:
-            return True
-    return False
-
-def get_declared_type(name):
-    """Obtiene el tipo de una variable ya declarada en cualquier scope."""
-    for scope in reversed(scope_stack):
-        if name in scope:
-            return scope[name]
-    raise Exception(f"Error semántico: la variable '{name}' no ha sido declarada.")
-
-def declare_variable(name, var_type):
-    """
-    Declara una nueva variable en el scope actual.
-    Valida duplicación local (literal a) y advierte si hace shadowing (oculta otra variable externa).
-    """
-    if name in current_scope():
-        raise Exception(f"Error semántico: la variable '{name}' ya fue declarada en este ámbito.")
-    for outer_scope in scope_stack[:-1]:
-        if name in outer_scope:
-            print(f"Advertencia: la variable local '{name}' oculta una variable del ámbito externo (shadowing).")
-            break
-    current_scope()[name] = var_type
-
-# ========================
-# Manejo de funciones
-# ========================
-
-def declare_function(name, param_list, return_type):
-    """
-    Registra una nueva función en la tabla global de funciones.
-    Valida duplicación de nombre.
-    """
-    if name in functions:
-        raise Exception(f"Error semántico: la función '{name}' ya fue declarada.")
-    functions[name] = {"params": param_list, "return": return_type}
 
-def check_function_call(name, arg_types):
-    """
-    Verifica la existencia de la función, la aridad y los tipos de los argumentos.
-    """
-    if name not in functions:
-        raise Exception(f"Error semántico: la función '{name}' no ha sido declarada.")
-    expected = functions[name]["params"]
-    if len(expected) != len(arg_types):
-        raise Exception(f"Error semántico: la función '{name}' esperaba {len(expected)} argumentos, se recibieron {len(arg_types)}.")
-    for i, ((expected_type, _), actual_type) in enumerate(zip(expected, arg_types)):
-        if not are_types_compatible(expected_type, actual_type):
-            raise Exception(f"Error semántico: argumento {i+1} de '{name}' debe ser '{expected_type}', se recibió '{actual_type}'.")
+Todo el estado (tabla de funciones, pila de scopes, variables usadas) vive en una
+instancia de SemanticAnalyzer, por lo que varias compilaciones pueden ejecutarse
+a la vez en el mismo proceso sin interferir entre sí.
+"""
+from ast_nodes import Declaration, Assignment, If, FunctionDeclaration, FunctionCall, BinaryOp, Literal, Name
 
-# ========================
-# Análisis semántico general
-# ========================
 
-def semantic_analyze(ast):
+class SemanticAnalyzer:
     """
-    Función principal del analizador semántico.
-    Recorre el AST generado por el parser y realiza validaciones semánticas.
-
-    Args:
-        ast (list): Lista de nodos del árbol de sintaxis abstracta (AST).
-
-    Raises:
-        Exception: Si se detecta algún error semántico.
+    Contexto de un análisis semántico: cada compilación usa su propia instancia.
     """
-    enter_scope()
-    used_variables = set()
-
-    for node in ast:
-        _analyze_node(node, used_variables)
-    # Validación de variables no usadas (literal h)
-    unused = [var for var in current_scope() if var not in used_variables]
-    if unused:
-        print(f"Advertencia: las siguientes variables no se usaron: {', '.join(unused)}")
-    
-    exit_scope()
 
-# ========================
-# Evaluación de nodos del AST
-# ========================
-
-def _analyze_node(node, used_variables):
-    node_type = node[0]
-
-    if node_type == "DECLARATION":
+    def __init__(self, echo_warnings=True):
+        # Tabla de funciones (nombre → parámetros y tipo de retorno)
+        self.functions = {}
+        # Pila de scopes anidados (cada uno es un diccionario variable → tipo)
+        self.scope_stack = []
+        # Variables usadas (leídas o asignadas) durante el análisis
+        self.used_variables = set()
+        # Variables cuyo valor se lee en alguna expresión (para eliminar asignaciones muertas)
+        self.read_variables = set()
+        # Advertencias emitidas, en orden
+        self.warnings = []
+        # Si es verdadero, las advertencias también se imprimen
+        self.echo_warnings = echo_warnings
+
+    def warn(self, message):
+        """Registra una advertencia (y la imprime si echo_warnings está activo)."""
+        self.warnings.append(message)
+        if self.echo_warnings:
+            print(message)
+
+    # ========================
+    # Manejo de scopes
+    # ========================
+
+    def enter_scope(self):
+        """Crea un nuevo ámbito local (nuevo diccionario en la pila)."""
+        self.scope_stack.append({})
+
+    def exit_scope(self):
+        """Elimina el ámbito actual (último diccionario en la pila)."""
+        self.scope_stack.pop()
+
+    def current_scope(self):
+        """Obtiene el scope actual (el más interno)."""
+        return self.scope_stack[-1] if self.scope_stack else {}
+
+    def is_declared(self, name):
+        """Verifica si una variable ha sido declarada en algún scope."""
+        for scope in reversed(self.scope_stack):
+            if name in scope:
+                return True
+        return False
+
+    def get_declared_type(self, name):
+        """Obtiene el tipo de una variable ya declarada en cualquier scope."""
+        for scope in reversed(self.scope_stack):
+            if name in scope:
+                return scope[name]
+        raise Exception(f"Error semántico: la variable '{name}' no ha sido declarada.")
+
+    def declare_variable(self, name, var_type):
+        """
+        Declara una nueva variable en el scope actual.
+        Valida duplicación local (literal a) y advierte si hace shadowing (oculta otra variable externa).
+        """
+        if name in self.current_scope():
+            raise Exception(f"Error semántico: la variable '{name}' ya fue declarada en este ámbito.")
+        for outer_scope in self.scope_stack[:-1]:
+            if name in outer_scope:
+                self.warn(f"Advertencia: la variable local '{name}' oculta una variable del ámbito externo (shadowing).")
+                break
+        self.current_scope()[name] = var_type
+
+    # ========================
+    # Manejo de funciones
+    # ========================
+
+    def declare_function(self, name, param_list, return_type):
+        """
+        Registra una nueva función en la tabla de funciones.
+        Valida duplicación de nombre.
+        """
+        if name in self.functions:
+            raise Exception(f"Error semántico: la función '{name}' ya fue declarada.")
+        self.functions[name] = {"params": param_list, "return": return_type}
+
+    def check_function_call(self, name, arg_types):
+        """
+        Verifica la existencia de la función, la aridad y los tipos de los argumentos.
+        """
+        if name not in self.functions:
+            raise Exception(f"Error semántico: la función '{name}' no ha sido declarada.")
+        expected = self.functions[name]["params"]
+        if len(expected) != len(arg_types):
+            raise Exception(f"Error semántico: la función '{name}' esperaba {len(expected)} argumentos, se recibieron {len(arg_types)}.")
+        for i, ((expected_type, _), actual_type) in enumerate(zip(expected, arg_types)):
+            if not are_types_compatible(expected_type, actual_type):
+                raise Exception(f"Error semántico: argumento {i+1} de '{name}' debe ser '{expected_type}', se recibió '{actual_type}'.")
+
+    # ========================
+    # Análisis semántico general
+    # ========================
+
+    def analyze(self, ast):
+        """
+        Recorre el AST generado por el parser y realiza validaciones semánticas.
+
+        Args:
+            ast (list): Lista de nodos del árbol de sintaxis abstracta (AST).
+
+        Raises:
+            Exception: Si se detecta algún error semántico.
+        """
+        for _ in self.analyze_stream(ast):
+            pass
+
+    def analyze_stream(self, ast):
+        """
+        Versión por flujo del análisis.
+        Valida las sentencias de nivel superior a medida que llegan y genera cada una
+        después de validarla, de modo que las fases siguientes pueden procesarla sin
+        esperar al resto del programa. El ámbito global se conserva entre sentencias.
+
+        Args:
+            ast (iterable): Nodos del AST, por ejemplo los generados por parser_stream.
+
+        Yields:
+            Node: Cada nodo ya validado.
+
+        Raises:
+            Exception: Si se detecta algún error semántico.
+        """
+        self.enter_scope()
+
+        for node in ast:
+            self._analyze_node(node)
+            yield node
+        # Validación de variables no usadas (literal h)
+        unused = [var for var in self.current_scope() if var not in self.used_variables]
+        if unused:
+            self.warn(f"Advertencia: las siguientes variables no se usaron: {', '.join(unused)}")
+
+        self.exit_scope()
+
+    # ========================
+    # Evaluación de nodos del AST
+    # ========================
+
+    def _analyze_node(self, node):
+        """
+        Analiza una sentencia y, sin recursión, todas las que contiene.
+        El analizador de un bloque (if, función) abre su ámbito y retorna las
+        sentencias del cuerpo; se apilan y, al agotarlas, se cierra el ámbito.
+        """
+        blocks = []  # Pila de iteradores sobre los cuerpos abiertos
+        while True:
+            analyzer = self._NODE_ANALYZERS.get(type(node))
+            if analyzer is None:
+                raise Exception(f"Error semántico: tipo de nodo no reconocido '{type(node).__name__}'")
+            body = analyzer(self, node)
+            if body is not None:
+                blocks.append(iter(body))
+            node = None
+            while blocks:
+                node = next(blocks[-1], None)
+                if node is not None:
+                    break
+                blocks.pop()
+                self.exit_scope()
+            if node is None:
+                return
+
+    def _analyze_declaration(self, node):
         # Validación de declaración previa de variables (literal a)
-        var_type = node[1]
-        var_name = node[2]
-        value = node[3] if len(node) == 4 else None
+        var_type = node.var_type
+        var_name = node.name
+        value = node.value
 
-        declare_variable(var_name, var_type)
+        self.declare_variable(var_name, var_type)
         if value is not None:
-            val_type = evaluate_expression(value, used_variables)
+            val_type = self.evaluate_expression(value)
             if not are_types_compatible(var_type, val_type):
                 raise Exception(f"Error semántico: tipo incompatible, se esperaba '{var_type}', se recibió '{val_type}'.")
 
+    def _analyze_assignment(self, node):
+        var_name = node.name
+        expr = node.value
 
-
-    elif node_type == "ASSIGNMENT":
-        var_name = node[1]
-        expr = node[2]
-
-        if not is_declared(var_name):
+        if not self.is_declared(var_name):
             raise Exception(f"Error semántico: la variable '{var_name}' no ha sido declarada.")
 
-        val_type = evaluate_expression(expr, used_variables)
-        expected_type = get_declared_type(var_name)
+        val_type = self.evaluate_expression(expr)
+        expected_type = self.get_declared_type(var_name)
 
         if not are_types_compatible(expected_type, val_type):
             raise Exception(f"Error semántico: tipo incompatible. No se puede asignar '{val_type}' a '{expected_type}'.")
 
-        used_variables.add(var_name)
-
-    elif node_type == "IF":
-        condition = node[1]
-        block = node[2]
+        self.used_variables.add(var_name)
 
-        cond_type = evaluate_expression(condition, used_variables)
+    def _analyze_if(self, node):
+        cond_type = self.evaluate_expression(node.condition)
         if cond_type != "bool":
             raise Exception("Error semántico: la condición del 'if' debe ser booleana.")
 
-        enter_scope()
-        for stmt in block:
-            _analyze_node(stmt, used_variables)
-        exit_scope()
+        self.enter_scope()
+        return node.body  # _analyze_node analiza el cuerpo y cierra el ámbito
 
-    elif node_type == "FUNCTION_DECLARATION":
+    def _analyze_function_declaration(self, node):
         # Declaración de función con nuevo scope (param_list: [(tipo, nombre)])
-        name = node[1]
-        params = node[2]
-        return_type = node[3]
-        block = node[4]
+        self.declare_function(node.name, node.params, node.return_type)
 
-        declare_function(name, params, return_type)
+        self.enter_scope()
+        for param_type, param_name in node.params:
+            self.declare_variable(param_name, param_type)
+        return node.body  # _analyze_node analiza el cuerpo y cierra el ámbito
 
-        enter_scope()
-        for param_type, param_name in params:
-            declare_variable(param_name, param_type)
-        for stmt in block:
-            _analyze_node(stmt, used_variables)
-        exit_scope()
-
-    elif node_type == "FUNCTION_CALL":
+    def _analyze_function_call(self, node):
         # Validación de llamada a función: existencia, aridad, tipos
-        name = node[1]
-        args = node[2]
-        arg_types = [evaluate_expression(arg, used_variables) for arg in args]
-        check_function_call(name, arg_types)
-
-    else:
-        raise Exception(f"Error semántico: tipo de nodo no reconocido '{node_type}'")
-
-# ========================
-# Evaluación de expresiones
-# ========================
-
-def evaluate_expression(expr, used_variables):
-    """
-    Evalúa el tipo de una expresión en el AST.
-    Admite literales, variables, operaciones y comparaciones.
-
-    Args:
-        expr: La expresión a evaluar.
-        used_variables (set): Conjunto de variables utilizadas.
-
-    Returns:
-        str: Tipo inferido de la expresión ('int', 'float', 'string', 'char', 'bool').
-
-    Raises:
-        Exception: Si se encuentra una variable no declarada o una operación inválida.
-    """
-    if isinstance(expr, int):
-        return "int"
-    elif isinstance(expr, float):
-        return "float"
-    elif isinstance(expr, str):
-        if expr.startswith('"') and expr.endswith('"'):
-            return "string"
-        elif expr.startswith("'") and expr.endswith("'"):
-            return "char"
-        elif expr == "true" or expr == "false":
-            return "bool"
-        elif is_declared(expr):
-            used_variables.add(expr)
-            return get_declared_type(expr)
-        else:
-            raise Exception(f"Error semántico: la variable '{expr}' no ha sido declarada.")      
-    elif isinstance(expr, tuple):
-        op, left, right = expr
-        lt = evaluate_expression(left, used_variables)
-        rt = evaluate_expression(right, used_variables)
+        arg_types = [self.evaluate_expression(arg) for arg in node.args]
+        self.check_function_call(node.name, arg_types)
+
+    # Tabla de despacho: clase del nodo → método que lo analiza
+    # (los de bloques retornan el cuerpo, con su ámbito ya abierto)
+    _NODE_ANALYZERS = {
+        Declaration: _analyze_declaration,
+        Assignment: _analyze_assignment,
+        If: _analyze_if,
+        FunctionDeclaration: _analyze_function_declaration,
+        FunctionCall: _analyze_function_call,
+    }
+
+    # ========================
+    # Evaluación de expresiones
+    # ========================
+
+    def evaluate_expression(self, expr):
+        """
+        Evalúa el tipo de una expresión en el AST.
+        Admite literales, variables, operaciones y comparaciones.
+
+        Args:
+            expr: La expresión a evaluar (Literal, Name o BinaryOp).
+
+        Returns:
+            str: Tipo inferido de la expresión ('int', 'float', 'string', 'char', 'bool').
+
+        Raises:
+            Exception: Si se encuentra una variable no declarada o una operación inválida.
+
+        Las operaciones se recorren en postorden con una pila explícita (primero el
+        operando izquierdo, luego el derecho), así que la profundidad de la
+        expresión no está limitada por la pila de Python.
+        """
+        if type(expr) is not BinaryOp:
+            return self._evaluate_leaf(expr)
+        types = []              # Tipos de las subexpresiones ya evaluadas
+        stack = [expr]          # Nodos por visitar; tras una operación expandida va _OPERANDS_DONE
+        pop = stack.pop
+        while stack:
+            node = pop()
+            kind = type(node)
+            if kind is BinaryOp:
+                stack += (node, _OPERANDS_DONE, node.right, node.left)
+            elif kind is Literal:
+                types.append(node.type)  # El parser ya resolvió el tipo del literal
+            elif node is _OPERANDS_DONE:
+                rt = types.pop()
+                types[-1] = self._evaluate_binary_op(pop(), types[-1], rt)
+            else:
+                types.append(self._evaluate_leaf(node))
+        return types[0]
+
+    def _evaluate_leaf(self, expr):
+        evaluator = self._EXPRESSION_EVALUATORS.get(type(expr))
+        if evaluator is None:
+            raise Exception(f"Error semántico: expresión no válida: {expr}")
+        return evaluator(self, expr)
+
+    def _evaluate_literal(self, expr):
+        # El parser ya resolvió el tipo del literal
+        return expr.type
+
+    def _evaluate_name(self, expr):
+        if self.is_declared(expr.id):
+            self.used_variables.add(expr.id)
+            self.read_variables.add(expr.id)
+            return self.get_declared_type(expr.id)
+        raise Exception(f"Error semántico: la variable '{expr.id}' no ha sido declarada.")
+
+    def _evaluate_binary_op(self, expr, lt, rt):
+        # Tipo de una operación cuyos operandos ya tienen tipo (lt, rt)
+        op, right = expr.op, expr.right
 
         # Validación de operadores (d), tipo booleano (e), división por cero (f)
         if op in {"+", "-", "*", "/"}:
             if lt == rt and lt in {"int", "float"}:
-                if op == "/" and isinstance(right, (int, float)) and right == 0:
+                if op == "/" and isinstance(right, Literal) and right.value == 0:
                     raise Exception("Error semántico: división por cero.")
                 return "float" if "float" in (lt, rt) else "int"
             else:
@@ -244,8 +322,45 @@ def evaluate_expression(expr, used_variables):
         else:
             raise Exception(f"Error semántico: operador desconocido '{op}'.")
 
-    else:
-        raise Exception(f"Error semántico: expresión no válida: {expr}")
+    # Tabla de despacho: clase de la hoja → método que calcula su tipo
+    # (las operaciones binarias las recorre evaluate_expression)
+    _EXPRESSION_EVALUATORS = {
+        Literal: _evaluate_literal,
+        Name: _evaluate_name,
+    }
+
+
+# Marca en la pila de evaluate_expression: los operandos de la operación de debajo ya tienen tipo
+_OPERANDS_DONE = object()
+
+# ========================
+# Funciones de conveniencia
+# ========================
+
+def semantic_analyze(ast):
+    """
+    Función principal del analizador semántico.
+    Analiza el AST con un SemanticAnalyzer nuevo y lo retorna.
+
+    Args:
+        ast (list): Lista de nodos del árbol de sintaxis abstracta (AST).
+
+    Returns:
+        SemanticAnalyzer: El contexto del análisis (advertencias, variables usadas...).
+
+    Raises:
+        Exception: Si se detecta algún error semántico.
+    """
+    analyzer = SemanticAnalyzer()
+    analyzer.analyze(ast)
+    return analyzer
+
+def semantic_analyze_stream(ast):
+    """
+    Versión por flujo de semantic_analyze: genera cada nodo de nivel superior
+    después de validarlo (ver SemanticAnalyzer.analyze_stream).
+    """
+    return SemanticAnalyzer().analyze_stream(ast)
 
 # ========================
 # Compatibilidad de tipos
@@ -256,4 +371,4 @@ def are_types_compatible(expected, actual):
     Literal c: Verifica si un tipo puede ser asignado implícitamente al otro.
     Permite int → float, pero no al revés (para evitar pérdida de precisión).
     """
-    return expected == actual or (expected == "float" and actual == "int")
\ No newline at end of file
+    return expected == actual or (expected == "float" and actual == "int")
@@ -3,6 +3,11 @@ from parser import parser
 from semantic import semantic_analyze
 from intermediate import IntermediateCodeGenerator
 from objectcode import ObjectCodeGenerator
+from compilador import compilar_programa
+from concurrent.futures import ThreadPoolExecutor
+from cache import CompilationCache
+import sys
+import tempfile
 
 def ejecutar_prueba(codigo, descripcion, debe_funcionar=True):
     print("=" * 100)
@@ -141,6 +146,538 @@ def pruebas_adicionales():
     for codigo, desc, valido in casos:
         ejecutar_prueba(codigo, desc, valido)
 
+def resultado_o_error(codigo):
+    """Compila sin imprimir y retorna el código objeto, o el mensaje de error."""
+    try:
+        resultado = compilar_programa(codigo)
+        return resultado.instrucciones, resultado.advertencias
+    except Exception as e:
+        return f"{type(e).__name__}: {e}"
+
+def pruebas_concurrencia(hilos=16, repeticiones=50):
+    print("\n\n================ PRUEBA DE ESTRÉS CONCURRENTE ===================\n")
+    programas = [
+        "int a = 5; int b = 3; int c = a + b;",
+        "int x = 1; if (x < 5) { if (x > 0) { int y = 2; x = x + y; } }",
+        "int a = b + 1;",
+        "int a = 1; int a = 2;",
+        "float f = 2; if (f == 2.0) { int z = 7; f = f * 1.5; }",
+        "int k = 4; if (1 < 2) { int k = 3; k = k / 1; }",
+        "int y = ((2 + 3) * (4 - 1));",
+        "int q = 1 + ;",
+    ]
+    # Programas más largos, con muchos ámbitos anidados, para forzar el entrelazado
+    for n in (20, 60):
+        anidado = "int v = 0; " + "if (v < 10) { int w = v; v = w + 1; " * n + "}" * n
+        programas.append(anidado)
+
+    esperados = [resultado_o_error(p) for p in programas]
+    trabajos = programas * repeticiones
+    # Un intervalo de cambio de hilo muy corto hace que las compilaciones se entrelacen
+    intervalo = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        with ThreadPoolExecutor(max_workers=hilos) as pool:
+            obtenidos = list(pool.map(resultado_o_error, trabajos))
+    finally:
+        sys.setswitchinterval(intervalo)
+
+    fallos = sum(1 for i, r in enumerate(obtenidos) if r != esperados[i % len(programas)])
+    print(f"[PRUEBA] {len(trabajos)} compilaciones en {hilos} hilos")
+    if fallos == 0:
+        print("\n✅ PRUEBA EXITOSA: todos los resultados coinciden con la compilación secuencial")
+    else:
+        print(f"\n❌ ERROR: {fallos} resultados difieren de la compilación secuencial")
+
+def posiciones(ast):
+    """Extensión (línea, columna, línea final, columna final) de cada nodo con posición."""
+    from ast_nodes import Located, walk
+    return [(n.line, n.col, n.end_line, n.end_col) for n in walk(ast) if isinstance(n, Located)]
+
+def pruebas_posiciones():
+    """Verifica la extensión en el código fuente de las sentencias y las operaciones."""
+    print("\n\n================ PRUEBAS DE POSICIONES DEL AST ===================\n")
+    codigo = "int a = 1;\nint b = (a + 2) * 3;\nif (a < b) {\n  a = a - 1;\n}\n"
+    esperado = [(1, 1, 1, 11), (2, 1, 2, 21), (2, 9, 2, 20), (2, 10, 2, 15),
+                (3, 1, 5, 2), (3, 5, 3, 10), (4, 3, 4, 13), (4, 7, 4, 12)]
+    obtenido = posiciones(parser(lexer(codigo)))
+    print(f"[PRUEBA] Extensiones de las sentencias y operaciones: {obtenido}")
+    print("✅ PRUEBA EXITOSA" if obtenido == esperado else f"❌ ERROR: se esperaba {esperado}")
+
+def pruebas_cache():
+    print("\n\n================ PRUEBA DE LA CACHÉ DE COMPILACIÓN ===================\n")
+    codigo = "int a = 2; int b = 3; if (a < b) { a = a + 1; }"
+    with tempfile.TemporaryDirectory() as directorio:
+        cache = CompilationCache(directorio, max_bytes=4096)
+        primero = compilar_programa(codigo, cache=cache)
+        segundo = compilar_programa(codigo, cache=cache)
+        mismo = segundo.instrucciones == primero.instrucciones and segundo.cuadruplas == primero.cuadruplas
+        print(f"[PRUEBA] Acierto tras la primera compilación: {cache.stats()}")
+        print("✅ PRUEBA EXITOSA" if cache.hits == 1 and cache.misses == 1 and mismo
+              else "❌ ERROR: la caché no devolvió el resultado guardado")
+        mismo_ast = (repr(segundo.ast) == repr(primero.ast) and segundo.tokens == primero.tokens
+                     and posiciones(segundo.ast) == posiciones(primero.ast))
+        print(f"[PRUEBA] AST y tokens recuperados de la caché: {segundo.ast}")
+        print("✅ PRUEBA EXITOSA" if mismo_ast else f"❌ ERROR: se esperaba {primero.ast}")
+
+        # Una entrada que no es JSON (por ejemplo, un pickle malicioso) se descarta sin ejecutarse
+        import os
+        import pickle
+        import zlib
+        marca = os.path.join(directorio, "ejecutado")
+
+        class Carga:
+            def __reduce__(self):
+                return (open, (marca, "w"))
+
+        otro = "int z = 1;"
+        with open(cache._path(cache.key(otro)), "wb") as f:
+            f.write(zlib.compress(pickle.dumps(Carga())))
+        descartada = cache.get(otro) is None and not os.path.exists(marca)
+        print("[PRUEBA] Entrada con un pickle en lugar de datos")
+        print("✅ PRUEBA EXITOSA" if descartada else "❌ ERROR: la entrada se cargó o se ejecutó")
+
+        # Sobrescribir una entrada no cuenta su tamaño dos veces
+        for _ in range(3):
+            cache.put(otro, [], [], [], ["HALT"])
+        print(f"[PRUEBA] Tamaño tras sobrescribir una entrada: {cache._size} bytes")
+        print("✅ PRUEBA EXITOSA" if cache._size == cache._scan_size()
+              else f"❌ ERROR: se esperaban {cache._scan_size()} bytes")
+
+        # compilar_programa guarda el informe de optimización que muestra un acierto en compilar
+        compilar_programa(codigo, cache=cache, optimizar=True, mirilla=True)
+        informe = cache.get(codigo, "OM")["informe"] or ""
+        print("[PRUEBA] Informe guardado por compilar_programa con -O")
+        print("✅ PRUEBA EXITOSA" if "[OPTIMIZACIÓN]" in informe and "[OPTIMIZACIÓN DE MIRILLA]" in informe
+              else f"❌ ERROR: se obtuvo {informe!r}")
+
+        # Muchos programas distintos deben desalojar entradas para respetar el tamaño máximo
+        for i in range(40):
+            compilar_programa(f"int v{i} = {i} * 2;", cache=cache)
+        print(f"[PRUEBA] Desalojo LRU con tamaño máximo de 4 KiB: {cache.stats()}")
+        print("✅ PRUEBA EXITOSA" if cache.evictions > 0 and cache._scan_size() <= 4096
+              else "❌ ERROR: la caché superó su tamaño máximo")
+
+def pruebas_optimizacion():
+    """Verifica que -O pliegue constantes y simplifique identidades sin cambiar el significado."""
+    from optimizer import QuadOptimizer, reuse_temps, count_temps
+    print("\n========== PRUEBAS DE OPTIMIZACIÓN ==========")
+    casos = [
+        ("int y = ((2 + 3) * (4 - 1));", [('y', '=', 15, '')]),
+        ("int a = 7 / 2; int b = 0 - 7 / 2;", [('a', '=', 3, ''), ('b', '=', -3, '')]),
+        ("int x = 4; int y = x * 1 + 0;", [('x', '=', 4, ''), ('y', '=', 'x', '')]),
+        ("int x = 4; int y = x * 0;", [('x', '=', 4, ''), ('y', '=', 0, '')]),
+    ]
+    for codigo, esperado in casos:
+        cuads = QuadOptimizer().optimize(compilar_programa(codigo).cuadruplas)
+        print(f"[PRUEBA] {codigo}")
+        print("✅ PRUEBA EXITOSA" if cuads == esperado else f"❌ ERROR: se obtuvo {cuads}")
+
+    # Con -O se eliminan además las asignaciones que nunca se leen y los if con condición falsa
+    casos_codigo_muerto = [
+        ("int x = 2; int y = 3; int z = x + y * 4;", [('x', '=', 2, ''), ('y', '=', 3, '')]),
+        ("int x = 1; if (2 < 1) { x = x + 1; } int y = x;", [('x', '=', 1, '')]),
+        ("int x = 1; if (1 < 2) { x = x + 1; } int y = x;", [('x', '=', 1, ''), ('x', '+', 'x', 1)]),
+        # x = 1 y x = 5 se sobrescriben antes de leerse
+        ("int x = 1; x = 2; int y = x; y = y + x;", [('x', '=', 2, ''), ('y', '=', 'x', ''), ('y', '+', 'y', 'x')]),
+        ("int x = 1; if (x > 0) { x = 5; } x = 7; int y = x; y = y * 2;",
+         [('x', '=', 1, ''), ('%t1', '>', 'x', 0), ('GOTOF', '%t1', 'L1', ''), ('LABEL', 'L1', '', ''),
+          ('x', '=', 7, ''), ('y', '=', 'x', ''), ('y', '*', 'y', 2)]),
+    ]
+    for codigo, esperado in casos_codigo_muerto:
+        cuads = compilar_programa(codigo, optimizar=True).cuadruplas
+        print(f"[PRUEBA] {codigo}")
+        print("✅ PRUEBA EXITOSA" if cuads == esperado else f"❌ ERROR: se obtuvo {cuads}")
+
+    # x * 0.0 se pliega a un cero float: con -O la variable conserva su tipo
+    from vm import VirtualMachine
+    codigo = "float x = 3.5; float y = x * 0.0; int z = 0; if (y != 0.0) { z = 1; }"
+    resultado = compilar_programa(codigo, optimizar=True, mirilla=True)
+    memoria = VirtualMachine(resultado.instrucciones).run()
+    print(f"[PRUEBA] {codigo} (-O) → {memoria}")
+    print("✅ PRUEBA EXITOSA" if type(memoria['y']) is float and memoria.get('z', 0) == 0
+          else f"❌ ERROR: se obtuvo {resultado.cuadruplas}")
+
+    # Una variable llamada como un temporal (t1) sigue siendo una variable del programa
+    codigo = "int t1 = 5; int t2 = t1 * 2; if (t2 > 1) { t1 = t2 + 1; }"
+    for optimizar in (False, True):
+        memoria = VirtualMachine(compilar_programa(codigo, optimizar=optimizar, mirilla=optimizar).instrucciones).run()
+        print(f"[PRUEBA] {codigo}{' (-O)' if optimizar else ''} → {memoria}")
+        print("✅ PRUEBA EXITOSA" if memoria.get('t1') == 11 else "❌ ERROR: se perdió la variable t1")
+
+    # Una variable float puede contener un entero: x * 1.0 no es una copia de x
+    from objectcode import ObjectCodeGenerator
+    codigo = "float c = 7; float g = 2; float e = c * 1.0; float h = e / g;"
+    cuads = compilar_programa(codigo).cuadruplas
+    memorias = [VirtualMachine(ObjectCodeGenerator().generate(q)).run() for q in (cuads, QuadOptimizer().optimize(cuads))]
+    print(f"[PRUEBA] {codigo} (-O) → {memorias[1]}")
+    print("✅ PRUEBA EXITOSA" if memorias[0] == memorias[1] and memorias[1]['h'] == 3.5
+          else f"❌ ERROR: sin -O {memorias[0]}, con -O {memorias[1]}")
+
+    # --flujo -O usa las mismas opciones del generador: x*y se calcula una vez por sentencia
+    import io
+    from compilador import compilar_flujo
+    codigo = "int x = 2; int y = 3; int a = x * y + y * x; if (a > 1) { a = x * y - y * x + a; }"
+    salida = io.StringIO()
+    compilar_flujo(codigo, salida=salida, optimizar=True, mirilla=True)
+    instrucciones = salida.getvalue().splitlines()
+    memoria = VirtualMachine(instrucciones).run()
+    multiplicaciones = sum(instr.startswith("MUL") for instr in instrucciones)
+    print(f"[PRUEBA] {codigo} (--flujo -O) → {memoria}, {multiplicaciones} multiplicaciones")
+    print("✅ PRUEBA EXITOSA" if memoria == {'x': 2, 'y': 3, 'a': 12} and multiplicaciones == 2
+          else f"❌ ERROR: se obtuvo {instrucciones}")
+
+    # Subexpresiones comunes: x*y se calcula una vez hasta que x cambia
+    from intermediate import IntermediateCodeGenerator
+    from parser import parser
+    from lexer import lexer
+    ast = parser(lexer("int x = 2; int y = 3; int a = x * y + y * x; x = a; int b = x * y;"))
+    generador = IntermediateCodeGenerator(cse=True)
+    cuads = generador.generate(ast)
+    multiplicaciones = [q for q in cuads if q[1] == '*']
+    print(f"[PRUEBA] Numeración de valores: {len(multiplicaciones)} multiplicaciones, {generador.cse_hits} reutilizadas")
+    print("✅ PRUEBA EXITOSA" if len(multiplicaciones) == 2 and generador.cse_hits == 1
+          else f"❌ ERROR: se obtuvo {cuads}")
+
+    # Sethi-Ullman: en 1 + (2 + (a * 3)) se evalúa primero el operando derecho,
+    # así nunca hay más de dos temporales vivos
+    ast = parser(lexer("int a = 1; int y = 1 + (2 + (a * 3));"))
+    temporales = [count_temps(reuse_temps(IntermediateCodeGenerator(sethi_ullman=orden).generate(ast)))
+                  for orden in (False, True)]
+    print(f"[PRUEBA] Orden de Sethi-Ullman: temporales {temporales[0]} → {temporales[1]}")
+    print("✅ PRUEBA EXITOSA" if temporales == [3, 2] else "❌ ERROR: no se redujeron los temporales")
+
+    # Los temporales muertos se reutilizan: solo hacen falta tantos como valores vivos a la vez
+    cuads = compilar_programa("int a = 1; int b = (a + 2) * (a - 3) + (a * 4) / (a + 5);").cuadruplas
+    renombradas = reuse_temps(cuads)
+    print(f"[PRUEBA] Reutilización de temporales: {count_temps(cuads)} → {count_temps(renombradas)}")
+    print("✅ PRUEBA EXITOSA" if count_temps(renombradas) == 3 and len(renombradas) == len(cuads)
+          else f"❌ ERROR: se obtuvo {renombradas}")
+
+def pruebas_grafo_flujo():
+    """Verifica los bloques básicos, los dominadores y la linealización del CFG."""
+    from cfg import build_cfg
+    print("\n========== PRUEBAS DEL GRAFO DE FLUJO ==========")
+    codigo = "int x = 1; if (x < 5) { if (x > 0) { x = x + 2; } }"
+    cuads = compilar_programa(codigo).cuadruplas
+    grafo = build_cfg(cuads)
+    sucesores = [[b.index for b in bloque.succ] for bloque in grafo.blocks]
+    print(f"[PRUEBA] Bloques de if anidado: {grafo.blocks}")
+    print("✅ PRUEBA EXITOSA" if sucesores == [[1, 4], [2, 3], [3], [4], []] and grafo.linearize() == cuads
+          else "❌ ERROR: bloques o linealización incorrectos")
+    print("[PRUEBA] El bloque del if interno está dominado por el del externo")
+    print("✅ PRUEBA EXITOSA" if grafo.dominates(1, 2) and not grafo.dominates(2, 3)
+          and grafo.immediate_dominators()[4] == 0 else "❌ ERROR: dominadores incorrectos")
+
+    # El código tras un salto incondicional no es alcanzable
+    grafo = build_cfg([('GOTO', 'L1', '', ''), ('x', '=', 1, ''), ('LABEL', 'L1', '', '')])
+    print("[PRUEBA] Bloque inalcanzable tras GOTO")
+    print("✅ PRUEBA EXITOSA" if grafo.reachable() == {0, 2}
+          and ('x', '=', 1, '') not in grafo.linearize(only_reachable=True)
+          else "❌ ERROR: alcanzabilidad incorrecta")
+
+def pruebas_mirilla():
+    """Verifica cada regla de la optimización de mirilla sobre el código objeto."""
+    from peephole import PeepholeOptimizer, JUMP_CHAIN
+    print("\n========== PRUEBAS DE MIRILLA ==========")
+    codigo = ["LOAD 1", "STORE t1", "LOAD t1", "STORE t1", "JUMP_IF_FALSE L1", "LOAD t1", "JUMP L2",
+              "LABEL L2", "STORE y", "LABEL L1", "JUMP L3", "LOAD x", "LABEL L3", 'LOAD "a b"']
+    esperado = ["LOAD 1", "STORE t1", "JUMP_IF_FALSE L3", "LOAD t1", "LABEL L2", "STORE y", "LABEL L1",
+                "JUMP L3", "LOAD x", "LABEL L3", 'LOAD "a b"']
+    mirilla = PeepholeOptimizer()
+    resultado = mirilla.optimize(codigo)
+    print(f"[PRUEBA] Reglas aplicadas: {mirilla.hits}")
+    print("✅ PRUEBA EXITOSA" if resultado == esperado and all(mirilla.hits[regla] == 1 for regla in
+                                  ("STORE x; LOAD x", "STORE x; STORE x", "JUMP L; LABEL L", JUMP_CHAIN))
+          else f"❌ ERROR: se obtuvo {resultado}")
+
+    # El generador que sigue el contenido del acumulador no emite esos LOAD
+    from objectcode import ObjectCodeGenerator
+    cuads = [('%t1', '=', 1, ''), ('x', '+', '%t1', 'y'), ('z', '*', 'x', 2), ('GOTOF', 'z', 'L1', ''),
+             ('w', '=', 'z', ''), ('LABEL', 'L1', '', ''), ('v', '=', 'z', '')]
+    generador = ObjectCodeGenerator(track_accumulator=True)
+    instrucciones = generador.generate(cuads)
+    print(f"[PRUEBA] Seguimiento del acumulador: {generador.loads_skipped} cargas evitadas")
+    print("✅ PRUEBA EXITOSA" if instrucciones == ["LOAD 1", "STORE %t1", "ADD y", "STORE x", "MUL 2", "STORE z",
+                                                  "JUMP_IF_FALSE L1", "STORE w", "LABEL L1", "LOAD z", "STORE v"]
+          else f"❌ ERROR: se obtuvo {instrucciones}")
+
+    # Solo las reglas elegidas
+    mirilla = PeepholeOptimizer(rules=["JUMP L; LABEL L"], jump_chains=False)
+    resultado = mirilla.optimize(["STORE x", "LOAD x", "JUMP L1", "LABEL L1"])
+    print("[PRUEBA] Tabla de reglas configurable")
+    print("✅ PRUEBA EXITOSA" if resultado == ["STORE x", "LOAD x", "LABEL L1"]
+          else f"❌ ERROR: se obtuvo {resultado}")
+
+def pruebas_maquina_virtual():
+    """Ejecuta programas en la máquina virtual y comprueba la memoria final."""
+    from vm import VirtualMachine, VMError
+    print("\n========== PRUEBAS DE LA MÁQUINA VIRTUAL ==========")
+    casos = [
+        ("int a = 0 - 7; int b = a / 2; int c = 7 / 2; float f = 7.0 / 2.0;", {'a': -7, 'b': -3, 'c': 3, 'f': 3.5}),
+        ("int x = 1; if (x < 5) { if (x > 0) { x = x + 2; } } if (x > 10) { x = 0; }", {'x': 3}),
+        ("int x; int y = x + 1; if (x == 0) { if (y != 1) { y = 5; } x = 4; }", {'x': 4, 'y': 1}),
+    ]
+    for codigo, esperado in casos:
+        for optimizar in (False, True):
+            resultado = compilar_programa(codigo, optimizar=optimizar, mirilla=optimizar)
+            memoria = VirtualMachine(resultado.instrucciones).run()
+            # Con -O desaparecen las variables que nunca se leen
+            correcto = all(memoria[k] == v for k, v in esperado.items() if k in memoria)
+            if not optimizar:
+                correcto = correcto and memoria == esperado
+            print(f"[PRUEBA] {codigo}{' (-O)' if optimizar else ''} → {memoria}")
+            print("✅ PRUEBA EXITOSA" if correcto else f"❌ ERROR: se esperaba {esperado}")
+
+    # El programa escrito en binario y cargado con mmap produce la misma memoria
+    import os
+    import tempfile
+    import bincode
+    from vm import assemble
+    codigo = 'int a = 7; float f = 2.5; if (a > 3) { a = a / 2; f = f * 2.0; } int b = a;'
+    instrucciones = compilar_programa(codigo).instrucciones
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, "programa.bin")
+        bincode.dump(assemble(instrucciones), ruta)
+        with bincode.load(ruta) as programa:
+            memoria = VirtualMachine(programa).run()
+            sin_copia = isinstance(programa.operands, memoryview)
+    print(f"[PRUEBA] Programa binario cargado con mmap → {memoria}")
+    print("✅ PRUEBA EXITOSA" if memoria == VirtualMachine(instrucciones).run() == {'a': 3, 'f': 5.0, 'b': 3}
+          and sin_copia else "❌ ERROR: el programa binario no coincide con el original")
+
+    # La división entre cero se detecta al ejecutar
+    try:
+        VirtualMachine(["LOAD 1", "DIV x", "STORE y"]).run()
+        print("❌ ERROR: la división entre cero no se detectó")
+    except VMError as e:
+        print(f"[PRUEBA] División entre cero en ejecución\n✅ ERROR DETECTADO COMO SE ESPERABA: {e}")
+
+def pruebas_registros():
+    """Genera código para la máquina de registros y comprueba la asignación y el derrame."""
+    import re
+    from regcode import RegisterCodeGenerator
+    print("\n========== PRUEBAS DE LA MÁQUINA DE REGISTROS ==========")
+    codigo = 'int a = 2; int b = (a + 1) * (a - 1) + a * a;'
+    cuads = compilar_programa(codigo).cuadruplas
+
+    esperado = [
+        'LOADI r2, 2', 'STORE a, r2',
+        'LOADI r2, 1', 'LOAD r0, a', 'ADD r2, r0, r2',
+        'LOADI r3, 1', 'LOAD r0, a', 'SUB r3, r0, r3',
+        'MUL r2, r2, r3',
+        'LOAD r0, a', 'LOAD r1, a', 'MUL r3, r0, r1',
+        'ADD r2, r2, r3', 'STORE b, r2',
+    ]
+    generador = RegisterCodeGenerator(8)
+    instrucciones = generador.generate(cuads)
+    print(f"[PRUEBA] {codigo} con 8 registros → {len(instrucciones)} instrucciones")
+    print("✅ PRUEBA EXITOSA" if instrucciones == esperado and not generador.spilled
+          else f"❌ ERROR: se obtuvo {instrucciones}")
+
+    # Con 3 registros solo r2 es asignable: los temporales que viven a la vez se derraman
+    generador = RegisterCodeGenerator(3)
+    instrucciones = generador.generate(cuads)
+    usados = {r for instr in instrucciones for r in re.findall(r"\br\d+\b", instr)}
+    print(f"[PRUEBA] {codigo} con 3 registros → derramados {sorted(generador.spilled)}")
+    print("✅ PRUEBA EXITOSA" if generador.spilled == {'%t3', '%t7'} and usados <= {'r0', 'r1', 'r2'}
+          and 'STORE %t3, r0' in instrucciones else f"❌ ERROR: se obtuvo {instrucciones}")
+
+    # La mirilla reconoce patrones del código de acumulador: con registros se rechaza
+    try:
+        compilar_programa(codigo, mirilla=True, registros=8)
+        print("❌ ERROR: se aceptó la mirilla con registros")
+    except ValueError as e:
+        print(f"[PRUEBA] Mirilla con registros → {e}")
+        print("✅ PRUEBA EXITOSA")
+
+
+def pruebas_python():
+    """Ejecuta programas traducidos a Python y compara la memoria final con la máquina virtual."""
+    from pycodegen import CompiledProgram
+    from vm import VirtualMachine, VMError
+    print("\n========== PRUEBAS DEL BACKEND DE PYTHON ==========")
+    casos = [
+        "int a = 0 - 7; int b = a / 2; int c = (a + 1) * (a - 1) / 3; float f = 7.0 / 2.0;",
+        "int x = 1; if (x < 5) { if (x > 0) { x = x + 2; } x = x * 10; } if (x > 100) { x = 0; }",
+        "int x; int y = x + 1; if (x == 0) { if (y != 1) { y = 5; } x = 4; } if (y == 1) { int z; }",
+    ]
+    for codigo in casos:
+        for optimizar in (False, True):
+            resultado = compilar_programa(codigo, optimizar=optimizar, mirilla=optimizar)
+            esperado = VirtualMachine(resultado.instrucciones).run()
+            # Traducción con `if` anidados y con el bucle de despacho
+            estructurado = CompiledProgram(resultado.cuadruplas)
+            despacho = CompiledProgram(resultado.cuadruplas, max_nesting=0)
+            memoria = estructurado.run()
+            correcto = memoria == despacho.run() == esperado
+            if "if" in codigo:
+                correcto = correcto and estructurado.structured and not despacho.structured
+            print(f"[PRUEBA] {codigo}{' (-O)' if optimizar else ''} → {memoria}")
+            print("✅ PRUEBA EXITOSA" if correcto else f"❌ ERROR: se esperaba {esperado}")
+
+    # La división entre cero se detecta igual que en la máquina virtual
+    try:
+        CompiledProgram([('x', '=', 0, ''), ('%t1', '/', 1, 'x'), ('y', '=', '%t1', '')]).run()
+        print("❌ ERROR: la división entre cero no se detectó")
+    except VMError as e:
+        print(f"[PRUEBA] División entre cero en Python → {e}")
+        print("✅ PRUEBA EXITOSA")
+
+
+def pruebas_perfil():
+    """Comprueba que el perfil por fases cuenta los elementos de cada fase y avisa a los hooks."""
+    import json
+    from profiler import PhaseProfiler
+    print("\n========== PRUEBAS DEL PERFIL POR FASES ==========")
+    codigo = "int x = 1; if (x < 5) { x = x + 2; }"
+    avisadas = []
+    perfil = PhaseProfiler(hooks=[lambda registro: avisadas.append(registro.name)])
+    resultado = compilar_programa(codigo, optimizar=True, perfil=perfil)
+    elementos = {r.name: r.items for r in perfil.records.values()}
+    esperado = {"léxico": len(resultado.tokens), "objeto": len(resultado.instrucciones),
+                "optimización": len(resultado.cuadruplas)}
+    correcto = (avisadas == ["léxico", "sintáctico", "semántico", "intermedio", "optimización", "objeto"]
+                and all(elementos[fase] == n for fase, n in esperado.items())
+                and elementos["sintáctico"] == 10
+                and all(r.wall >= 0 and r.peak_memory > 0 for r in perfil.records.values()))
+    print(f"[PRUEBA] Perfil de {codigo} → {elementos}")
+    print("✅ PRUEBA EXITOSA" if correcto else f"❌ ERROR: fases avisadas {avisadas}")
+
+    # Una segunda compilación con el mismo perfil acumula sus mediciones
+    compilar_programa(codigo, perfil=perfil)
+    datos = json.loads(perfil.to_json(archivo="prueba"))
+    fases = {f["name"]: f for f in datos["phases"]}
+    correcto = (datos["archivo"] == "prueba" and fases["léxico"]["calls"] == 2
+                and fases["léxico"]["items"] == 2 * len(resultado.tokens) and fases["optimización"]["calls"] == 1)
+    print(f"[PRUEBA] Perfil acumulado en JSON → {len(datos['phases'])} fases")
+    print("✅ PRUEBA EXITOSA" if correcto else f"❌ ERROR: se obtuvo {datos}")
+
+    # Con caché, un acierto omite las fases y el perfil mide solo la consulta
+    with tempfile.TemporaryDirectory() as directorio:
+        cache = CompilationCache(directorio)
+        compilar_programa(codigo, cache=cache)
+        perfil = PhaseProfiler(trace_memory=False)
+        compilar_programa(codigo, cache=cache, perfil=perfil)
+    fases = {r.name: r.items for r in perfil.records.values()}
+    print(f"[PRUEBA] Perfil de un acierto de caché → {fases}")
+    print("✅ PRUEBA EXITOSA" if fases == {"caché": 1} else "❌ ERROR: se esperaba solo la fase caché")
+
+
+def pruebas_anidamiento_profundo(profundidad=3000):
+    """Compila expresiones y bloques if anidados más allá del límite de recursión de Python."""
+    import sys
+    from vm import VirtualMachine
+    print("\n========== PRUEBAS DE ANIDAMIENTO PROFUNDO ==========")
+    profundidad = max(profundidad, sys.getrecursionlimit() + 1000)
+    casos = [
+        ("paréntesis", "int x = " + "(" * profundidad + "1" + " + 1)" * profundidad + ";",
+         {'x': profundidad + 1}),
+        ("operando derecho", "int a = 2; int x = " + "a - (" * profundidad + "1" + ")" * profundidad + ";",
+         {'a': 2, 'x': 1}),
+        ("if", "int x = 0; " + "if (x < 1) { " * profundidad + "x = x + 1; " + "} " * profundidad,
+         {'x': 1}),
+    ]
+    for nombre, codigo, esperado in casos:
+        for optimizar in (False, True):
+            try:
+                resultado = compilar_programa(codigo, optimizar=optimizar, mirilla=optimizar)
+                memoria = VirtualMachine(resultado.instrucciones).run()
+                correcto = all(memoria.get(k, v) == v for k, v in esperado.items())
+                print(f"[PRUEBA] {profundidad} niveles de {nombre}{' (-O)' if optimizar else ''} → {memoria}")
+                print("✅ PRUEBA EXITOSA" if correcto else f"❌ ERROR: se esperaba {esperado}")
+            except RecursionError:
+                print(f"❌ ERROR: {profundidad} niveles de {nombre} superan el límite de recursión")
+
+    # Con caché, el programa compila igual que sin ella y el AST recuperado es el
+    # mismo; --ast (repr) y to_tuple tampoco dependen de la profundidad
+    from ast_nodes import to_tuple
+    for nombre, codigo, esperado in casos:
+        with tempfile.TemporaryDirectory() as directorio:
+            try:
+                cache = CompilationCache(directorio)
+                resultado = compilar_programa(codigo, cache=cache)
+                recuperado = compilar_programa(codigo, cache=cache)
+                memoria = VirtualMachine(recuperado.instrucciones).run()
+                to_tuple(recuperado.ast)  # Las tuplas anidadas no se comparan: == también es recursivo
+                correcto = cache.hits == 1 and memoria == esperado and repr(recuperado.ast) == repr(resultado.ast)
+                print(f"[PRUEBA] {profundidad} niveles de {nombre} con caché → {memoria}")
+                print("✅ PRUEBA EXITOSA" if correcto else f"❌ ERROR: se esperaba {esperado} y un acierto")
+            except RecursionError:
+                print(f"❌ ERROR: {profundidad} niveles de {nombre} con caché superan el límite de recursión")
+
+
+
+def pruebas_tipado():
+    """Compara el recorrido único con cuádruplas tipadas (--tipado) con las fases separadas."""
+    from pycodegen import CompiledProgram
+    from vm import VirtualMachine
+    print("\n========== PRUEBAS DEL CÓDIGO TIPADO ==========")
+    # Sin float, las cuádruplas y las advertencias son las mismas que con las fases separadas
+    casos = [
+        "int a = 0 - 7; int b = a / 2; int c = (a + 1) * (a - 1) / 3;",
+        "int x = 1; if (x < 5) { if (x > 0) { x = x + 2; } x = x * 10; } if (x > 100) { x = 0; }",
+        "int x; int y = x + 1; if (x == 0) { if (y != 1) { y = 5; } x = 4; } if (y == 1) { int z; }",
+    ]
+    for codigo in casos:
+        for optimizar in (False, True):
+            separado = compilar_programa(codigo, optimizar=optimizar)
+            tipado = compilar_programa(codigo, optimizar=optimizar, tipado=True)
+            correcto = (tipado.cuadruplas == separado.cuadruplas
+                        and tipado.advertencias == separado.advertencias)
+            print(f"[PRUEBA] {codigo}{' (-O)' if optimizar else ''} → {len(tipado.cuadruplas)} cuádruplas")
+            print("✅ PRUEBA EXITOSA" if correcto else f"❌ ERROR: se obtuvo {tipado.cuadruplas}")
+
+    # Las variables float siempre contienen un float: la división no trunca
+    codigo = "float a = 7; float b = 2; float c = a / b; float d; d = d + c * 2.0;"
+    esperado = {'a': 7.0, 'b': 2.0, 'c': 3.5, 'd': 7.0}
+    for optimizar in (False, True):
+        resultado = compilar_programa(codigo, optimizar=optimizar, mirilla=optimizar, tipado=True)
+        memoria = VirtualMachine(resultado.instrucciones).run()
+        python = CompiledProgram(resultado.cuadruplas).run()
+        ops = {q[1] for q in resultado.cuadruplas}
+        correcto = (memoria == python == esperado and all(type(v) is float for v in memoria.values())
+                    and {'f/', 'f*', 'f+'} <= ops and ('itof' in ops) != optimizar)
+        print(f"[PRUEBA] {codigo}{' (-O)' if optimizar else ''} → {memoria}")
+        print("✅ PRUEBA EXITOSA" if correcto else f"❌ ERROR: se esperaba {esperado}, cuádruplas {resultado.cuadruplas}")
+
+    # Los backends emiten instrucciones especializadas
+    codigo = "int i = 3; float f = 1.5; f = i; f = f / 2.0;"
+    acumulador = compilar_programa(codigo, tipado=True).instrucciones
+    registros = compilar_programa(codigo, registros=4, tipado=True).instrucciones
+    correcto = (any(i.startswith("ITOF i") for i in acumulador) and any(i.startswith("FDIV") for i in acumulador)
+                and any(i.startswith("ITOF r") for i in registros) and any(i.startswith("FDIV r") for i in registros))
+    print(f"[PRUEBA] Instrucciones tipadas de {codigo} → {acumulador}")
+    print("✅ PRUEBA EXITOSA" if correcto else f"❌ ERROR: registros {registros}")
+
+    # Los errores son los del análisis semántico
+    errores = ["int x = 1.5;", "int x = y;", "int a = 1; float b = a + 1.0;", "if (1 + 2) { int x; }",
+               "int x; int x;", "int x = 1; if (x > 0) { int y = 2; } y = 3;"]
+    for codigo in errores:
+        mensajes = []
+        for tipado in (False, True):
+            try:
+                compilar_programa(codigo, tipado=tipado)
+                mensajes.append(None)
+            except Exception as e:
+                mensajes.append(str(e))
+        correcto = mensajes[0] is not None and mensajes[0] == mensajes[1]
+        print(f"[PRUEBA] Error con --tipado en {codigo} → {mensajes[1]}")
+        print("✅ PRUEBA EXITOSA" if correcto else f"❌ ERROR: sin --tipado: {mensajes[0]}")
+
+
 if __name__ == "__main__":
     pruebas_de_la_guia()
     pruebas_adicionales()
+    pruebas_concurrencia()
+    pruebas_posiciones()
+    pruebas_cache()
+    pruebas_optimizacion()
+    pruebas_grafo_flujo()
+    pruebas_mirilla()
+    pruebas_maquina_virtual()
+    pruebas_registros()
+    pruebas_python()
+    pruebas_perfil()
+    pruebas_anidamiento_profundo()
+    pruebas_tipado()
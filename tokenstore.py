@@ -0,0 +1,92 @@
+"""
+Archivo: tokenstore.py
+
+Almacén compacto de tokens en columnas.
+
+En lugar de una lista de tuplas (tipo, valor, línea, columna), cada token ocupa
+una posición en varios arreglos de tipo primitivo:
+- types:  código del tipo de token (array('B'), 1 byte)
+- lines:  línea (array('I'), 4 bytes)
+- cols:   columna (array('I'), 4 bytes)
+- starts / ends: desplazamientos del valor dentro del código fuente (array('I'))
+
+El valor de cada token no se guarda como cadena: se obtiene del código fuente
+al consultarlo. El almacén se comporta como una secuencia de tuplas, así que
+el parser y la opción --tokens lo usan igual que la lista de tokens de `lexer`.
+"""
+from array import array
+from collections.abc import Sequence
+
+from lexer import scan, ignored_tokens, token_definitions
+
+# Tabla de tipos de token: el índice en la tupla es el código almacenado
+TOKEN_TYPES = tuple(ttype for ttype, _ in token_definitions if ttype not in ignored_tokens) + ('KEYWORD',)
+
+# Código numérico de cada tipo de token
+TOKEN_CODES = {ttype: code for code, ttype in enumerate(TOKEN_TYPES)}
+
+
+class TokenStore(Sequence):
+    """
+    Secuencia compacta de tokens respaldada por arreglos y por el código fuente.
+    Indexarla retorna la misma tupla (tipo, valor, línea, columna) que produce `lexer`.
+    """
+
+    def __init__(self, source_code):
+        self.source = source_code  # Código fuente del que se extraen los valores
+        self.types = array('B')
+        self.lines = array('I')
+        self.cols = array('I')
+        self.starts = array('I')
+        self.ends = array('I')
+
+    @classmethod
+    def from_source(cls, source_code):
+        """
+        Llena el almacén con el recorrido del analizador léxico (lexer.scan).
+        Produce los mismos tokens y errores que `lexer`.
+        """
+        store = cls(source_code)
+        add_type = store.types.append
+        add_line = store.lines.append
+        add_col = store.cols.append
+        add_start = store.starts.append
+        add_end = store.ends.append
+        codes = TOKEN_CODES
+        for token_type, start, end, line, col in scan(source_code):
+            add_type(codes[token_type])
+            add_line(line)
+            add_col(col)
+            add_start(start)
+            add_end(end)
+        return store
+
+    def __len__(self):
+        return len(self.types)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        return (
+            TOKEN_TYPES[self.types[index]],
+            self.source[self.starts[index]:self.ends[index]],
+            self.lines[index],
+            self.cols[index],
+        )
+
+    def __iter__(self):
+        source = self.source
+        names = TOKEN_TYPES
+        for code, line, col, start, end in zip(self.types, self.lines, self.cols, self.starts, self.ends):
+            yield (names[code], source[start:end], line, col)
+
+    def nbytes(self):
+        """Retorna los bytes ocupados por los arreglos (sin contar el código fuente)."""
+        return sum(col.itemsize * len(col) for col in (self.types, self.lines, self.cols, self.starts, self.ends))
+
+
+def lexer_compact(source_code):
+    """
+    Variante del analizador léxico que retorna un TokenStore en lugar de una lista de tuplas.
+    """
+    return TokenStore.from_source(source_code)
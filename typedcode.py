@@ -0,0 +1,225 @@
+"""
+Archivo: typedcode.py
+
+Análisis semántico y generación de cuádruplas en un solo recorrido del AST,
+con cuádruplas tipadas (opción --tipado de compilador.py).
+
+TypedCodeGenerator es a la vez un SemanticAnalyzer y un
+IntermediateCodeGenerator: cada sentencia se valida y se traduce en la misma
+visita, y cada expresión se recorre una sola vez calculando su tipo y
+emitiendo sus cuádruplas. Los errores y advertencias son los del análisis
+semántico (con Sethi-Ullman, el primer error de una expresión puede venir del
+operando que se genera primero).
+
+Las cuádruplas conservan la forma de IntermediateCodeGenerator, con el tipo
+explícito donde cambia la semántica:
+- las operaciones aritméticas entre float usan 'f+', 'f-', 'f*' y 'f/' (sin
+  prefijo son operaciones entre enteros, y la división trunca);
+- el ensanchamiento int → float que permite are_types_compatible en una
+  declaración o asignación se emite como (t, 'itof', origen, '');
+- una variable float declarada sin valor se inicializa con 0.0.
+
+Así los backends pueden emitir instrucciones especializadas (FADD, FDIV, ITOF...)
+y una variable float siempre contiene un float: `float a = 7; float b = 2;`
+divide 7.0 / 2.0 en lugar de truncar.
+"""
+from ast_nodes import Declaration, Assignment, If, FunctionDeclaration, FunctionCall, BinaryOp, Literal, Name
+from intermediate import IntermediateCodeGenerator
+from optimizer import ARITHMETIC_OPS, is_temp
+from semantic import SemanticAnalyzer, are_types_compatible
+
+# Operación aritmética → su versión entre float
+FLOAT_VARIANTS = {op: 'f' + op for op in ARITHMETIC_OPS}
+
+
+class TypedCodeGenerator(SemanticAnalyzer, IntermediateCodeGenerator):
+    """
+    Valida el AST y genera cuádruplas tipadas en un solo recorrido.
+
+    Tras generate():
+    - code: las cuádruplas;
+    - warnings, read_variables...: como en SemanticAnalyzer;
+    - conversions: ensanchamientos int → float emitidos.
+    """
+
+    def __init__(self, echo_warnings=True, cse=False, sethi_ullman=False):
+        SemanticAnalyzer.__init__(self, echo_warnings)
+        IntermediateCodeGenerator.__init__(self, cse, sethi_ullman)
+        self.conversions = 0
+
+    def generate(self, ast):
+        """
+        Valida y traduce una lista de nodos del AST; retorna las cuádruplas.
+
+        Raises:
+            Exception: Si se detecta algún error semántico.
+        """
+        self.code = []
+        self.forget_values()
+        self.analyze(ast)
+        self.labels.clear()
+        return self.code
+
+    # ========================
+    # Sentencias
+    # ========================
+
+    def _analyze_node(self, node):
+        """
+        Valida y traduce una sentencia y, sin recursión, todas las que contiene:
+        los cuerpos de los if se apilan y, al agotar uno, se cierra su ámbito y
+        se emite su etiqueta de salida.
+        """
+        blocks = []  # Pila de (iterador sobre el cuerpo, etiqueta de salida)
+        while True:
+            handler = self._TYPED_HANDLERS.get(type(node))
+            if handler is None:
+                raise Exception(f"Error semántico: tipo de nodo no reconocido '{type(node).__name__}'")
+            block = handler(self, node)
+            if block is not None:
+                body, end_label = block
+                blocks.append((iter(body), end_label))
+            node = None
+            while blocks:
+                node = next(blocks[-1][0], None)
+                if node is not None:
+                    break
+                self.exit_scope()
+                self._end_if(blocks.pop()[1])
+            if node is None:
+                return
+
+    def _typed_declaration(self, node):
+        var_type = node.var_type
+        self.declare_variable(node.name, var_type)
+        if node.value is None:
+            if var_type == "float":
+                self._store(node.name, 0.0)
+            return
+        result, val_type = self.typed_expression(node.value)
+        if not are_types_compatible(var_type, val_type):
+            raise Exception(f"Error semántico: tipo incompatible, se esperaba '{var_type}', se recibió '{val_type}'.")
+        self._store(node.name, self._widen(result, val_type, var_type))
+
+    def _typed_assignment(self, node):
+        var_name = node.name
+        if not self.is_declared(var_name):
+            raise Exception(f"Error semántico: la variable '{var_name}' no ha sido declarada.")
+
+        result, val_type = self.typed_expression(node.value)
+        expected_type = self.get_declared_type(var_name)
+        if not are_types_compatible(expected_type, val_type):
+            raise Exception(f"Error semántico: tipo incompatible. No se puede asignar '{val_type}' a '{expected_type}'.")
+
+        self.used_variables.add(var_name)
+        self._store(var_name, self._widen(result, val_type, expected_type))
+
+    def _typed_if(self, node):
+        cond_result, cond_type = self.typed_expression(node.condition)
+        if cond_type != "bool":
+            raise Exception("Error semántico: la condición del 'if' debe ser booleana.")
+
+        self.enter_scope()
+        false_label = self.new_label()
+        self.code.append(('GOTOF', cond_result, false_label, ''))
+        if self.cse:
+            self.forget_values()
+        return node.body, false_label  # _analyze_node recorre el cuerpo
+
+    def _unsupported(self, node):
+        raise ValueError(f"Sentencia no válida: {node}")
+
+    # Tabla de despacho: clase del nodo → método que lo valida y traduce
+    # (el de if retorna su cuerpo y su etiqueta de salida)
+    _TYPED_HANDLERS = {
+        Declaration: _typed_declaration,
+        Assignment: _typed_assignment,
+        If: _typed_if,
+        FunctionDeclaration: _unsupported,
+        FunctionCall: _unsupported,
+    }
+
+    def _store(self, name, value):
+        self.code.append((name, '=', value, ''))
+        if self.cse:
+            self.invalidate(name)
+
+    def _widen(self, result, from_type, to_type):
+        """Convierte `result` a float si se asigna un int a un float; retorna el operando resultante."""
+        if from_type == to_type:
+            return result
+        self.conversions += 1
+        if self.cse:
+            key = ('itof', result, '')
+            temp = self.values.get(key)
+            if temp is not None:
+                self.cse_hits += 1
+                return temp
+        temp = self.new_temp()
+        self.code.append((temp, 'itof', result, ''))
+        if self.cse:
+            self._remember(key, temp, [] if is_temp(result) else [result])
+        return temp
+
+    # ========================
+    # Expresiones
+    # ========================
+
+    def typed_expression(self, expr):
+        """
+        Valida una expresión y genera sus cuádruplas en un solo recorrido en
+        postorden (con pila explícita). Retorna (operando con el resultado, tipo).
+        """
+        if type(expr) is not BinaryOp:
+            return self._typed_leaf(expr)
+        sethi_ullman = self.sethi_ullman
+        if sethi_ullman:
+            self.need(expr)
+        results = []  # (operando, tipo) de las subexpresiones ya generadas
+        stack = [expr]
+        pop = stack.pop
+        while stack:
+            node = pop()
+            if type(node) is BinaryOp:
+                if sethi_ullman and self._right_first(node):
+                    stack += (node, _SWAPPED_DONE, node.left, node.right)
+                else:
+                    stack += (node, _OPERANDS_DONE, node.right, node.left)
+            elif node is _OPERANDS_DONE:
+                right = results.pop()
+                results[-1] = self._typed_binary_op(pop(), results[-1], right)
+            elif node is _SWAPPED_DONE:
+                left = results.pop()
+                results[-1] = self._typed_binary_op(pop(), left, results[-1])
+            else:
+                results.append(self._typed_leaf(node))
+        return results[0]
+
+    def _typed_leaf(self, expr):
+        kind = type(expr)
+        if kind is Literal:
+            return self._generate_leaf(expr), expr.type
+        if kind is Name:
+            return expr.id, self._evaluate_name(expr)
+        raise Exception(f"Error semántico: expresión no válida: {expr}")
+
+    def _typed_binary_op(self, expr, left, right):
+        (left, lt), (right, rt) = left, right
+        result_type = self._evaluate_binary_op(expr, lt, rt)
+        op = expr.op
+        if result_type == "float":
+            op = FLOAT_VARIANTS[op]
+        return self._generate_binary_op(expr, left, right, op), result_type
+
+
+# Marcas en la pila de typed_expression: los operandos de la operación de debajo ya
+# están generados, en orden (izquierdo, derecho) o invertido por Sethi-Ullman
+_OPERANDS_DONE = object()
+_SWAPPED_DONE = object()
+
+
+def typed_generate(ast, cse=False, sethi_ullman=False):
+    """Atajo: valida y traduce `ast` con un TypedCodeGenerator nuevo; retorna el generador."""
+    generator = TypedCodeGenerator(cse=cse, sethi_ullman=sethi_ullman)
+    generator.generate(ast)
+    return generator
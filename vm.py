@@ -0,0 +1,260 @@
+"""
+Archivo: vm.py
+
+Máquina virtual para el código objeto de acumulador de ObjectCodeGenerator.
+
+Antes de ejecutar, `assemble` traduce las instrucciones de texto a un Program:
+- cada mnemónico a un código de operación entero (OPCODES, compartido con el
+  formato binario);
+- cada operando a una posición de memoria: primero las variables y temporales
+  (inicializados en 0) y después los literales, agrupados en un único slot por
+  valor distinto;
+- cada etiqueta al índice de la instrucción que la sigue, de modo que las
+  instrucciones LABEL desaparecen del código ejecutado.
+
+La ejecución no vuelve a analizar texto: el bucle lee (código, operando) como
+enteros y despacha las operaciones aritméticas y de comparación por una tabla
+indexada por código de operación.
+
+Semántica:
+- la división entre enteros trunca hacia cero (como optimizer.fold_binary);
+- FADD, FSUB, FMUL y FDIV (cuádruplas tipadas, --tipado) operan entre float e
+  ITOF carga en el acumulador su operando convertido a float;
+- las comparaciones producen 1 o 0;
+- JUMP_IF_FALSE salta si el acumulador es falso (0, 0.0 o cadena vacía).
+"""
+import ast
+import time
+
+from optimizer import is_temp
+
+# Códigos de operación. El orden es parte del formato binario (bincode): no reordenar.
+OPCODE_NAMES = (
+    'LOAD', 'STORE', 'JUMP', 'JUMP_IF_FALSE',
+    'ADD', 'SUB', 'MUL', 'DIV',
+    'CMP_LT', 'CMP_GT', 'CMP_EQ', 'CMP_NE',
+    'FADD', 'FSUB', 'FMUL', 'FDIV', 'ITOF',
+)
+OPCODES = {name: code for code, name in enumerate(OPCODE_NAMES)}
+
+LOAD, STORE, JUMP, JUMP_IF_FALSE = (OPCODES[name] for name in ('LOAD', 'STORE', 'JUMP', 'JUMP_IF_FALSE'))
+JUMP_OPCODES = {JUMP, JUMP_IF_FALSE}
+
+
+class VMError(Exception):
+    """Error durante el ensamblado o la ejecución de un programa."""
+
+
+# ========================
+# Operaciones del acumulador
+# ========================
+
+def _div(a, b):
+    if b == 0:
+        raise VMError("Error de ejecución: división por cero.")
+    if isinstance(a, int) and isinstance(b, int):
+        quotient = abs(a) // abs(b)
+        return quotient if (a < 0) == (b < 0) else -quotient
+    return a / b
+
+def _fdiv(a, b):
+    if b == 0:
+        raise VMError("Error de ejecución: división por cero.")
+    return a / b
+
+# Tabla de despacho: código de operación → función (acumulador, operando) → nuevo acumulador
+BINARY_HANDLERS = [None] * len(OPCODE_NAMES)
+BINARY_HANDLERS[OPCODES['ADD']] = lambda a, b: a + b
+BINARY_HANDLERS[OPCODES['SUB']] = lambda a, b: a - b
+BINARY_HANDLERS[OPCODES['MUL']] = lambda a, b: a * b
+BINARY_HANDLERS[OPCODES['DIV']] = _div
+BINARY_HANDLERS[OPCODES['CMP_LT']] = lambda a, b: 1 if a < b else 0
+BINARY_HANDLERS[OPCODES['CMP_GT']] = lambda a, b: 1 if a > b else 0
+BINARY_HANDLERS[OPCODES['CMP_EQ']] = lambda a, b: 1 if a == b else 0
+BINARY_HANDLERS[OPCODES['CMP_NE']] = lambda a, b: 1 if a != b else 0
+BINARY_HANDLERS[OPCODES['FADD']] = lambda a, b: a + b
+BINARY_HANDLERS[OPCODES['FSUB']] = lambda a, b: a - b
+BINARY_HANDLERS[OPCODES['FMUL']] = lambda a, b: a * b
+BINARY_HANDLERS[OPCODES['FDIV']] = _fdiv
+BINARY_HANDLERS[OPCODES['ITOF']] = lambda a, b: float(b)
+
+
+# ========================
+# Ensamblado
+# ========================
+
+def parse_operand(text):
+    """
+    Interpreta el operando de una instrucción: retorna (True, valor) si es un
+    literal (número, cadena o carácter) o (False, nombre) si es una variable.
+    """
+    first = text[:1]
+    if first.isdigit() or (first == '-' and text[1:2].isdigit()):
+        try:
+            return True, int(text)
+        except ValueError:
+            return True, float(text)
+    if first in ('"', "'"):
+        try:
+            return True, ast.literal_eval(text)
+        except (ValueError, SyntaxError):
+            return True, text
+    return False, text
+
+
+class Program:
+    """
+    Programa ensamblado: dos secuencias paralelas de enteros (códigos de
+    operación y operandos) y las tablas de símbolos y constantes.
+
+    - Para LOAD, STORE y las operaciones, el operando es una posición de memoria:
+      [0, len(symbols)) son variables y [len(symbols), ...) constantes.
+    - Para JUMP y JUMP_IF_FALSE, el operando es el índice de la instrucción destino.
+    """
+
+    def __init__(self, opcodes, operands, symbols, constants):
+        self.opcodes = opcodes
+        self.operands = operands
+        self.symbols = symbols
+        self.constants = constants
+
+    def __len__(self):
+        return len(self.opcodes)
+
+    def initial_memory(self):
+        """Memoria inicial: variables en 0 seguidas de las constantes."""
+        return [0] * len(self.symbols) + list(self.constants)
+
+
+def assemble(instructions):
+    """Traduce instrucciones de texto ("LOAD x", "LABEL L1"...) a un Program."""
+    decoded = []  # (código, operando de texto) sin las etiquetas
+    labels = {}
+    for instr in instructions:
+        mnemonic, _, operand = instr.partition(' ')
+        if mnemonic == 'LABEL':
+            labels[operand] = len(decoded)
+            continue
+        code = OPCODES.get(mnemonic)
+        if code is None:
+            raise VMError(f"Error de ensamblado: instrucción no reconocida '{instr}'.")
+        decoded.append((code, operand))
+
+    # Texto del operando → slot provisional: las variables ocupan 0, 1, 2... y
+    # la constante k se marca como -1 - k hasta saber cuántas variables hay
+    slots = {}
+    symbols = []
+    constants, constant_slots = [], {}
+    opcodes, operands = [], []
+    for code, operand in decoded:
+        opcodes.append(code)
+        if code in JUMP_OPCODES:
+            if operand not in labels:
+                raise VMError(f"Error de ensamblado: la etiqueta '{operand}' no está definida.")
+            operands.append(labels[operand])
+            continue
+        slot = slots.get(operand)
+        if slot is None:
+            is_constant, value = parse_operand(operand)
+            if is_constant:
+                key = (type(value), value)  # 1 y 1.0 ocupan slots distintos
+                if key not in constant_slots:
+                    constant_slots[key] = len(constants)
+                    constants.append(value)
+                slot = -1 - constant_slots[key]
+            else:
+                slot = len(symbols)
+                symbols.append(value)
+            slots[operand] = slot
+        operands.append(slot)
+
+    base = len(symbols)
+    operands = [slot if slot >= 0 else base - 1 - slot for slot in operands]
+    return Program(opcodes, operands, symbols, constants)
+
+
+# ========================
+# Ejecución
+# ========================
+
+class VirtualMachine:
+    """
+    Ejecuta un Program (o una lista de instrucciones de texto, que se ensambla).
+
+    Tras run():
+    - memory: lista con el valor de cada slot;
+    - executed: instrucciones ejecutadas;
+    - elapsed: segundos de ejecución.
+    """
+
+    def __init__(self, program):
+        self.program = program if isinstance(program, Program) else assemble(program)
+        self.memory = self.program.initial_memory()
+        self.accumulator = 0
+        self.executed = 0
+        self.elapsed = 0.0
+
+    def run(self, max_steps=None):
+        """
+        Ejecuta el programa hasta el final y retorna el estado final de las
+        variables (ver state). Con max_steps se detiene con VMError si se supera
+        ese número de instrucciones.
+        """
+        opcodes = self.program.opcodes
+        operands = self.program.operands
+        memory = self.memory
+        handlers = BINARY_HANDLERS
+        end = len(opcodes)
+        limit = max_steps if max_steps is not None else float('inf')
+        acc = self.accumulator
+        pc = 0
+        executed = 0
+
+        start = time.perf_counter()
+        try:
+            while pc < end:
+                op = opcodes[pc]
+                arg = operands[pc]
+                pc += 1
+                executed += 1
+                if op == LOAD:
+                    acc = memory[arg]
+                elif op == STORE:
+                    memory[arg] = acc
+                elif op == JUMP_IF_FALSE:
+                    if not acc:
+                        pc = arg
+                elif op == JUMP:
+                    pc = arg
+                    if executed > limit:  # Solo un salto puede hacer que el programa no termine
+                        raise VMError(f"Error de ejecución: se superó el límite de {max_steps} instrucciones.")
+                else:
+                    acc = handlers[op](acc, memory[arg])
+        except TypeError:
+            raise VMError(f"Error de ejecución: operandos incompatibles en la instrucción {pc - 1}.") from None
+        finally:
+            self.elapsed = time.perf_counter() - start
+            self.executed = executed
+            self.accumulator = acc
+        return self.state()
+
+    def state(self, include_temps=False):
+        """Diccionario variable → valor de la memoria (sin temporales, salvo include_temps)."""
+        return {name: self.memory[slot] for slot, name in enumerate(self.program.symbols)
+                if include_temps or not is_temp(name)}
+
+    @property
+    def instructions_per_second(self):
+        return self.executed / self.elapsed if self.elapsed else 0.0
+
+    def summary(self):
+        """Texto con las instrucciones ejecutadas y la velocidad."""
+        return (f"{self.executed} instrucciones en {self.elapsed:.6f} s "
+                f"({self.instructions_per_second:,.0f} instr/s)")
+
+
+def run_instructions(instructions):
+    """Ensambla y ejecuta una lista de instrucciones; retorna la VirtualMachine ya ejecutada."""
+    machine = VirtualMachine(instructions)
+    machine.run()
+    return machine